@@ -1,7 +1,10 @@
 # AI 분석 API 라우터
-from fastapi import APIRouter, HTTPException, Path, Request
+from fastapi import APIRouter, HTTPException, Path, Query, Request
 from service.ai.pipeline import pipeline
-from service.market.indicators import summary
+from service.infra.ttl_cache import TTLCache
+from service.market.candle_store import store
+from service.market.daily_store import settled
+from service.market.indicators import series, summary
 from service.kis import kis
 from api.limiter import limiter
 
@@ -10,6 +13,12 @@ router = APIRouter(prefix="/api/ai")
 # 종목코드 경로 파라미터 (6자리 숫자만 허용)
 _CODE = Path(pattern=r"^\d{6}$")
 
+# 지표 시계열 캐시 — 키에 마지막 확정 봉 시각 포함 (새 봉이 확정될 때만 재계산)
+_series_cache = TTLCache()
+_SERIES_TTL = 24 * 3600
+# KIS 일봉 조회 1회 최대 행 수
+_DAILY_MAX = 100
+
 
 # 기술지표 + 뉴스 종합 AI 시그널 분석
 @router.get("/signal/{code}")
@@ -52,3 +61,35 @@ async def ind(request: Request, code: str = _CODE):
         return summary(candles)
     except Exception:
         raise HTTPException(502, "기술 지표 계산 실패")
+
+
+# 차트 오버레이용 전체 지표 시계열 — interval 0 은 일봉(확정 봉만, 최대 _DAILY_MAX), 15/60 은 분봉 저장소(저장 세션 + 당일 확정 봉)
+@router.get("/indicators/{code}/series")
+@limiter.limit("60/minute")
+async def indseries(
+    request: Request,
+    code: str = _CODE,
+    interval: int = Query(0),
+    count: int = Query(120, ge=1, le=1000),
+):
+    if interval not in (0, 15, 60):
+        raise HTTPException(422, "interval 은 0(일봉), 15, 60 만 허용")
+    try:
+        if interval:
+            candles = store.history(code, interval, days=max(1, count // (390 // interval) + 1))[-count:]
+        else:
+            # 장중 형성 중인 당일봉 제외
+            day = settled().isoformat()
+            candles = [c for c in await kis.daily(code, min(count, _DAILY_MAX)) if c["date"] <= day]
+    except Exception:
+        raise HTTPException(502, "캔들 조회 실패")
+    if not candles:
+        raise HTTPException(404, "캔들 데이터 없음")
+    last = candles[-1].get("time") or candles[-1].get("date")
+    key = f"indseries:{code}:{interval}:{len(candles)}:{last}"
+    cached = _series_cache.get(key)
+    if cached is not None:
+        return cached
+    result = {"code": code, "interval": interval} | series(candles)
+    _series_cache.set(key, result, _SERIES_TTL)
+    return result
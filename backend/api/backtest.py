@@ -1,23 +1,31 @@
 # 백테스트 API 라우터
-import datetime
+import json
 import logging
 from dataclasses import asdict
+from typing import Literal
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from service.trading.backtest import BacktestConfig, bt, grid, wf
+from service.trading import btcache, btjobs
+from service.trading.backtest import BacktestConfig, bt, grids, spans
+from service.trading.btpool import agrids, asearch, awf
+from service.trading.btsearch import SPACE, Halving, sample
+from service.trading.montecarlo import mc
+from service.trading.portfolio import pbt, prow
+from service.trading.watchlist import symbols
 from service.trading.research import wftab
 from service.market.candle_store import store
+from service.market.daily_store import daily_store
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/backtest")
 
 
-# 백테스트 요청 파라미터
-class BacktestRequest(BaseModel):
-    code: str
+# 전략/비용 파라미터 (단일·포트폴리오 공통)
+class StrategyParams(BaseModel):
     days: int = Field(default=365, ge=7, le=730)
     take_profit_pct: float = Field(default=5.0, ge=0.1, le=50.0)
     max_hold_bars: int = Field(default=20, ge=1, le=100)
@@ -27,46 +35,44 @@ class BacktestRequest(BaseModel):
     sell_tax_bps: float = Field(default=23.0, ge=0.0, le=100.0)
     slippage_bps: float = Field(default=5.0, ge=0.0, le=100.0)
     spread_bps: float = Field(default=4.0, ge=0.0, le=100.0)
+
+
+# 백테스트 요청 파라미터
+class BacktestRequest(StrategyParams):
+    code: str
     include_validation: bool = True
+    wf_windows: int = Field(default=6, ge=1, le=50)
+    wf_mode: Literal["rolling", "anchored"] = "rolling"
+    mc_paths: int = Field(default=1000, ge=0, le=5000)
+    mc_mode: Literal["bootstrap", "permute"] = "bootstrap"
+    mc_cost_shock_bps: float = Field(default=5.0, ge=0.0, le=100.0)
 
 
-@router.post("")
-async def btapi(req: BacktestRequest):
-    code = req.code.zfill(6)
+# 포트폴리오 백테스트 요청 — codes 생략 시 현재 워치리스트, 자금배분 생략 시 봇 설정값
+class PortfolioRequest(StrategyParams):
+    codes: list[str] | None = Field(default=None, max_length=50)
+    cash: float = Field(default=10_000_000, gt=0)
+    buy_percent: float | None = Field(default=None, gt=0.0, le=1.0)
+    target_buy_count: int | None = Field(default=None, ge=1, le=50)
+    intraday: bool = True
 
-    # 15분봉 — CandleStore CSV에서 로드
-    candles_15m = store.span(code, interval=15, days=req.days)
-    if len(candles_15m) < 50:
-        raise HTTPException(
-            400,
-            f"15분봉 데이터 부족 ({len(candles_15m)}개). "
-            "CandleStore에 데이터가 축적된 후 사용 가능합니다.",
-        )
 
-    # 일봉 — FDR로 수집 (KIS API 호출 없음)
-    try:
-        import FinanceDataReader as fdr
-        end = datetime.date.today()
-        start = end - datetime.timedelta(days=req.days + 90)
-        df = fdr.DataReader(code, start.isoformat(), end.isoformat())
-        daily = []
-        for dt, row in df.iterrows():
-            daily.append({
-                "date":   str(dt)[:10],
-                "open":   int(row["Open"]),
-                "high":   int(row["High"]),
-                "low":    int(row["Low"]),
-                "close":  int(row["Close"]),
-                "volume": int(row["Volume"]),
-            })
-    except Exception:
-        raise HTTPException(502, "일봉 데이터 수집 실패")
+# 파라미터 탐색 요청 — 탐색 공간 생략 시 기본 공간, 연속 반감 단계/탈락 비율 지정
+class SearchRequest(StrategyParams):
+    code: str
+    configs: int = Field(default=500, ge=1, le=5000)
+    eta: int = Field(default=4, ge=2, le=10)
+    rungs: int = Field(default=4, ge=1, le=8)
+    seed: int = 0
+    buy_thresholds: list[float] | None = Field(default=None, min_length=1)
+    take_profit_pcts: list[float] | None = Field(default=None, min_length=1)
+    stop_pcts: list[float] | None = Field(default=None, min_length=1)
+    max_hold_bars_list: list[int] | None = Field(default=None, min_length=1)
 
-    if len(daily) < 35:
-        raise HTTPException(400, f"일봉 데이터 부족 ({len(daily)}개, 최소 35개 필요)")
 
-    # 설정 적용 후 백테스트 실행
-    cfg = BacktestConfig(
+# 요청 → 백테스트 설정
+def config(req: StrategyParams) -> BacktestConfig:
+    return BacktestConfig(
         take_profit_pct=req.take_profit_pct,
         max_hold_bars=req.max_hold_bars,
         fallback_stop_pct=req.fallback_stop_pct,
@@ -76,29 +82,101 @@ async def btapi(req: BacktestRequest):
         slippage_bps=req.slippage_bps,
         spread_bps=req.spread_bps,
     )
-    result = bt(code, candles_15m, daily, cfg)
+
+
+# 검증 격자 축 — 요청 파라미터 ±1 스텝
+def axes(req: BacktestRequest) -> dict[str, list[float]]:
+    return {
+        "buy_thresholds": [req.buy_threshold - 5, req.buy_threshold, req.buy_threshold + 5],
+        "take_profit_pcts": [
+            max(0.1, req.take_profit_pct - 1),
+            req.take_profit_pct,
+            req.take_profit_pct + 1,
+        ],
+        "stop_pcts": [
+            max(0.1, req.fallback_stop_pct - 1),
+            req.fallback_stop_pct,
+            req.fallback_stop_pct + 1,
+        ],
+    }
+
+
+# 백테스트 작업 본체 — 데이터 로드/bt 는 작업 스레드, 격자·walk-forward 는 프로세스 풀
+async def run(req: BacktestRequest, job: btjobs.Job) -> dict:
+    code = job.code
+
+    # 15분봉 입력 지문 (파일명/수정시각/크기) — 결과 캐시 키
+    sig = await btjobs.offload(store.sig, code, 15, req.days)
+    if not sig:
+        raise HTTPException(
+            400,
+            "15분봉 데이터 부족 (0개). "
+            "CandleStore에 데이터가 축적된 후 사용 가능합니다.",
+        )
+
+    # 일봉 — 영속 저장소 경유 (빠진 날짜만 원격 수집, KIS API 호출 없음)
+    try:
+        daily = await btjobs.offload(daily_store.recent, code, req.days + 90)
+    except Exception:
+        raise HTTPException(502, "일봉 데이터 수집 실패")
+
+    # 같은 입력·파라미터면 저장된 결과 즉시 반환
+    dsig = btcache.digest(daily)
+    ckey = btcache.key("api", code, sig, dsig, req=req.model_dump())
+    hit = btcache.get(ckey)
+    if hit is not None:
+        job.total = job.bars = 1
+        return {**hit, "cached": True}
+
+    # 15분봉 — CandleStore CSV에서 로드
+    candles_15m = await btjobs.offload(store.span, code, interval=15, days=req.days)
+    if len(candles_15m) < 50:
+        raise HTTPException(
+            400,
+            f"15분봉 데이터 부족 ({len(candles_15m)}개). "
+            "CandleStore에 데이터가 축적된 후 사용 가능합니다.",
+        )
+
+    if len(daily) < 35:
+        raise HTTPException(400, f"일봉 데이터 부족 ({len(daily)}개, 최소 35개 필요)")
+
+    # 설정 적용 후 백테스트 실행 — 검증 격자/walk-forward 는 설정 단위 캐시 재사용
+    cfg = config(req)
+    n = len(candles_15m)
+    job.total = n - 1
+    if req.include_validation:
+        cfgs = grids(cfg, **axes(req))
+        gkeys = [btcache.key("grid", code, sig, dsig, cfg=c) for c in cfgs]
+        rows = [btcache.get(k) for k in gkeys]
+        miss = [j for j, row in enumerate(rows) if row is None]
+        wkey = btcache.key("wf", code, sig, dsig, cfg=cfg, windows=req.wf_windows, mode=req.wf_mode)
+        walk = btcache.get(wkey)
+        job.total += n * len(miss)
+        if walk is None:
+            job.total += sum(b - a for a, b in spans(n, req.wf_windows, req.wf_mode))
+
+    result = await btjobs.offload(bt, code, candles_15m, daily, cfg, tick=job.tick)
     validation = None
     validation_log_count = None
     if req.include_validation:
+        if miss:
+            fresh = await agrids(code, candles_15m, daily, [cfgs[j] for j in miss], progress=job.step)
+            for j, row in zip(miss, fresh):
+                rows[j] = row
+                btcache.put(gkeys[j], row)
+        if walk is None:
+            walk = await awf(
+                code, candles_15m, daily, cfg,
+                windows=req.wf_windows, mode=req.wf_mode, progress=job.step,
+            )
+            btcache.put(wkey, walk)
         validation = {
-            "parameter_stability": grid(
-                code,
-                candles_15m,
-                daily,
-                cfg,
-                buy_thresholds=[req.buy_threshold - 5, req.buy_threshold, req.buy_threshold + 5],
-                take_profit_pcts=[
-                    max(0.1, req.take_profit_pct - 1),
-                    req.take_profit_pct,
-                    req.take_profit_pct + 1,
-                ],
-                stop_pcts=[
-                    max(0.1, req.fallback_stop_pct - 1),
-                    req.fallback_stop_pct,
-                    req.fallback_stop_pct + 1,
-                ],
+            "parameter_stability": rows,
+            "walk_forward": walk,
+            # 경로 × 거래 행렬 연산 — 이벤트 루프 밖에서 실행
+            "monte_carlo": await btjobs.offload(
+                mc, result.trades, paths=req.mc_paths, mode=req.mc_mode, cost_shock_bps=req.mc_cost_shock_bps,
             ),
-            "walk_forward": wf(code, candles_15m, daily, cfg),
         }
         try:
             validation_log_count = wftab(code, {
@@ -107,13 +185,14 @@ async def btapi(req: BacktestRequest):
                 "total_trades": result.total_trades,
                 "cum_return_pct": result.cum_return_pct,
                 "excess_return_pct": result.excess_return_pct,
+                "wf_mode": req.wf_mode,
                 "walk_forward": validation["walk_forward"],
             })
         except Exception as exc:
             logger.warning("walk-forward 기록 저장 실패: %s", exc)
 
     # 결과 직렬화
-    return {
+    payload = {
         "code":            result.code,
         "total_bars":      result.total_bars,
         "total_trades":    result.total_trades,
@@ -136,3 +215,158 @@ async def btapi(req: BacktestRequest):
         },
         "trades":          [asdict(t) for t in result.trades],
     }
+    btcache.put(ckey, payload)
+    return {**payload, "cached": False}
+
+
+# 포트폴리오 작업 본체 — 종목별 15분봉/일봉 로드 후 공용 시계 시뮬레이션
+async def prun(req: PortfolioRequest, job: btjobs.Job) -> dict:
+    codes = [c.zfill(6) for c in (req.codes or symbols())]
+    candles: dict[str, list[dict]] = {}
+    daily: dict[str, list[dict]] = {}
+    skipped: list[str] = []
+    for code in dict.fromkeys(codes):
+        rows = await btjobs.offload(store.span, code, interval=15, days=req.days)
+        if len(rows) < 50:
+            skipped.append(code)
+            continue
+        try:
+            days = await btjobs.offload(daily_store.recent, code, req.days + 90)
+        except Exception as exc:
+            logger.warning("포트폴리오 일봉 수집 실패 %s: %s", code, exc)
+            skipped.append(code)
+            continue
+        candles[code], daily[code] = rows, days
+    if not candles:
+        raise HTTPException(400, "15분봉/일봉 데이터가 있는 종목이 없습니다.")
+
+    job.total = len({c["time"] for rows in candles.values() for c in rows})
+    result = await btjobs.offload(
+        pbt, candles, daily, config(req),
+        cash=req.cash,
+        buy_percent=req.buy_percent,
+        target_buy_count=req.target_buy_count,
+        intraday=req.intraday,
+        tick=job.tick,
+    )
+    return {**prow(result), "skipped_codes": skipped}
+
+
+# 파라미터 탐색 작업 본체 — 연속 반감 평가는 프로세스 풀, 같은 입력·요청이면 캐시 반환
+async def srun(req: SearchRequest, job: btjobs.Job) -> dict:
+    code = job.code
+    sig = await btjobs.offload(store.sig, code, 15, req.days)
+    try:
+        daily = await btjobs.offload(daily_store.recent, code, req.days + 90)
+    except Exception:
+        raise HTTPException(502, "일봉 데이터 수집 실패")
+    ckey = btcache.key("search", code, sig, btcache.digest(daily), req=req.model_dump())
+    hit = btcache.get(ckey)
+    if hit is not None:
+        job.total = job.bars = 1
+        return {**hit, "cached": True}
+
+    candles_15m = await btjobs.offload(store.span, code, interval=15, days=req.days)
+    if len(candles_15m) < 50:
+        raise HTTPException(400, f"15분봉 데이터 부족 ({len(candles_15m)}개).")
+    if len(daily) < 35:
+        raise HTTPException(400, f"일봉 데이터 부족 ({len(daily)}개, 최소 35개 필요)")
+
+    space = {
+        "buy_thresholds": req.buy_thresholds or SPACE["buy_thresholds"],
+        "take_profit_pcts": req.take_profit_pcts or SPACE["take_profit_pcts"],
+        "stop_pcts": req.stop_pcts or SPACE["stop_pcts"],
+        "max_hold_bars": req.max_hold_bars_list or SPACE["max_hold_bars"],
+    }
+    cfg = config(req)
+    job.total = Halving(sample(cfg, space, req.configs, req.seed), len(candles_15m), req.eta, req.rungs).budget()
+    report = await asearch(
+        code, candles_15m, daily, cfg,
+        space=space, configs=req.configs, eta=req.eta, rungs=req.rungs, seed=req.seed,
+        progress=job.step,
+    )
+    payload = {"code": code, "total_bars": len(candles_15m), **report}
+    btcache.put(ckey, payload)
+    return {**payload, "cached": False}
+
+
+# 작업 제출 (대기열 초과 시 429)
+def enqueue(req: BacktestRequest) -> btjobs.Job:
+    return submit(req.code.zfill(6), lambda job: run(req, job))
+
+
+# 작업 큐 등록 — 대기열 초과 시 429
+def submit(label: str, work) -> btjobs.Job:
+    try:
+        return btjobs.submit(label, work)
+    except btjobs.JobsFull as exc:
+        raise HTTPException(429, str(exc))
+
+
+# 작업 조회 (없으면 404)
+def lookup(job_id: str) -> btjobs.Job:
+    job = btjobs.get(job_id)
+    if job is None:
+        raise HTTPException(404, "백테스트 작업 없음")
+    return job
+
+
+# 동기 호환 경로 — 작업 큐 경유 후 완료까지 대기
+@router.post("")
+async def btapi(req: BacktestRequest):
+    job = await btjobs.wait(enqueue(req))
+    if job.exc is not None:
+        raise job.exc
+    if job.status != "done":
+        raise HTTPException(409, f"백테스트 작업 {job.status}")
+    return job.result
+
+
+# 작업 제출 → 작업 ID
+@router.post("/jobs", status_code=202)
+async def btsubmit(req: BacktestRequest):
+    return enqueue(req).view()
+
+
+# 포트폴리오 백테스트 작업 제출 → 작업 ID (진행률/결과는 /jobs/{id})
+@router.post("/portfolio", status_code=202)
+async def btportfolio(req: PortfolioRequest):
+    return submit("portfolio", lambda job: prun(req, job)).view()
+
+
+# 파라미터 탐색 작업 제출 → 작업 ID (평가 기록/비용은 결과에 포함)
+@router.post("/search", status_code=202)
+async def btsearch(req: SearchRequest):
+    return submit(req.code.zfill(6), lambda job: srun(req, job)).view()
+
+
+# 작업 목록 (결과 제외)
+@router.get("/jobs")
+async def btjoblist():
+    return {"jobs": [j.view(result=False) for j in btjobs.jobs()]}
+
+
+# 작업 상태/진행률 폴링 (완료 시 결과 포함)
+@router.get("/jobs/{job_id}")
+async def btjob(job_id: str):
+    return lookup(job_id).view()
+
+
+# 진행률 SSE 스트림 — 종료 이벤트에 결과 포함
+@router.get("/jobs/{job_id}/events")
+async def btevents(job_id: str):
+    job = lookup(job_id)
+
+    async def stream():
+        async for data in btjobs.events(job):
+            kind = "progress" if data["status"] in ("queued", "running") else data["status"]
+            yield f"event: {kind}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+# 작업 취소
+@router.delete("/jobs/{job_id}")
+async def btcancel(job_id: str):
+    lookup(job_id)
+    return btjobs.cancel(job_id).view(result=False)
@@ -4,7 +4,7 @@ import time
 import logging
 from fastapi import APIRouter, HTTPException
 from service.kis import kis
-from service.trading.strategy import evaluate
+from service.trading.strategy import evaluate, scorer
 from service.ai.predict import predict_stock, predictor
 from service.market.stock_universe import ALL_STOCKS, CODES, NAMES, search
 
@@ -117,31 +117,24 @@ async def screen() -> dict:
     global _stage1_cache, _stage2_cache, _generation, _stage1_job
     task = asyncio.current_task()
     try:
-        sem = asyncio.Semaphore(10)
-
-        # 1단계 스크리닝 작업
-        async def slot(code: str):
-            async with sem:
-                try:
-                    cached_pred = predictor.cached(code)
-                    result = await evaluate(code, prediction=cached_pred, fast=True)
-                    return {
-                        "code":       code,
-                        "name":       NAMES.get(code, code),
-                        "signal":     result["signal"],
-                        "score":      result["score"],
-                        "price":      result["price"],
-                        "summary":    result["summary"],
-                        "factors":    result["factors"],
-                        "prediction": brief(result["price"], cached_pred),
-                    }
-                except Exception as e:
-                    logger.debug(f"Recommend eval skip {code}: {e}")
-                    return None
-
-        results = await asyncio.gather(*[slot(code) for code in _SCAN_CODES])
-
-        valid = [r for r in results if r is not None and r["score"] != 0]
+        # 1단계 일괄 평가 — 입력 조회 동시 10건, 일봉 지표는 종목 행렬 1회 연산
+        preds = {code: predictor.cached(code) for code in _SCAN_CODES}
+        evals = await scorer.evaluate_many(_SCAN_CODES, fast=True, predictions=preds, concurrency=10)
+        results = [
+            {
+                "code":       code,
+                "name":       NAMES.get(code, code),
+                "signal":     result["signal"],
+                "score":      result["score"],
+                "price":      result["price"],
+                "summary":    result["summary"],
+                "factors":    result["factors"],
+                "prediction": brief(result["price"], preds[code]),
+            }
+            for code, result in evals.items()
+        ]
+
+        valid = [r for r in results if r["score"] != 0]
         valid.sort(key=lambda x: x["score"], reverse=True)
         top10 = valid[:10]
 
@@ -8,6 +8,7 @@ from api.security import originok
 from config import settings
 from service.kis import kis
 from service.market import holidays
+from service.market.candle_store import store
 from service.market.price_sync import price_sync
 from service.infra.metrics import ws_clients
 
@@ -145,6 +146,8 @@ async def loop():
                     "type":    "price_update",
                     "stocks":  stocks,
                     "indices": idx,
+                    # 스트리밍 지표 (15분봉, 형성 중 봉 잠정 반영) — 히스토리 재계산 없이 상태 조회만
+                    "indicators": {code: view for code in codes if (view := store.live(code))},
                 })
 
             if not market_open and active_session_date:
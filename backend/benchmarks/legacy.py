@@ -0,0 +1,93 @@
+# 벤치마크 기준 구현 — 벡터화 이전 봉 루프 swing/obz (결과 동일, 속도 비교 전용)
+from service.market.frame import col
+from service.market.smc import label, ohlc, sessions
+
+
+# 스윙 고저 탐지 — 전후 swing_length 캔들 대비 극값, 연속 중복 제거
+def swing(candles: list[dict], swing_length: int = 5) -> list[dict]:
+    n     = len(candles)
+    highs = col(candles, "high")
+    lows  = col(candles, "low")
+
+    raw: list[dict] = []
+    for i in range(swing_length, n - swing_length):
+        win_h = highs[i - swing_length: i + swing_length + 1]
+        win_l = lows [i - swing_length: i + swing_length + 1]
+        if highs[i] == win_h.max():
+            raw.append({"index": i, "kind": "high", "level": float(highs[i])})
+        elif lows[i] == win_l.min():
+            raw.append({"index": i, "kind": "low",  "level": float(lows[i])})
+
+    # 연속 같은 방향 -> 더 극단적인 쪽만 유지
+    cleaned: list[dict] = []
+    for item in raw:
+        if cleaned and cleaned[-1]["kind"] == item["kind"]:
+            prev = cleaned[-1]
+            if item["kind"] == "high" and item["level"] >= prev["level"]:
+                cleaned[-1] = item
+            elif item["kind"] == "low" and item["level"] <= prev["level"]:
+                cleaned[-1] = item
+        else:
+            cleaned.append(item)
+
+    return cleaned
+
+# OB 탐지 — 스윙 돌파 직전 최저저가(Bullish)/최고고가(Bearish) 캔들, strength=body_ratio
+def obz(candles: list[dict], swing_length: int = 5) -> list[dict]:
+    swings  = swing(candles, swing_length)
+    n       = len(candles)
+    result: list[dict] = []
+    crossed: set[int]  = set()
+    o, h, l, c = ohlc(candles)
+    days = sessions(candles)
+
+    # 돌파 봉 j 직전 구간(start ~ j-1)에서 OB 캔들 선택 → 구간 추가 (빈 구간이면 j-1 캔들, 인덱스는 start)
+    def add(kind: str, start: int, j: int, pick) -> None:
+        if j > start:
+            src = pick(range(start, j))
+            idx = src
+        else:
+            src, idx = j - 1, start
+        # 분봉: 동일 세션 체크
+        if days is not None and days[src] != days[j]:
+            return
+        rng = h[src] - l[src]
+        result.append({
+            "kind":      kind,
+            "top":       float(h[src]),
+            "bottom":    float(l[src]),
+            "index":     idx,
+            "label":     label(candles, src),
+            "strength":  abs((c[src] - o[src]) / rng) if rng else 0.0,
+            "mitigated": False,
+        })
+
+    # Bullish OB: 스윙 고가 돌파
+    for sh in (s for s in swings if s["kind"] == "high"):
+        hi     = sh["index"]
+        sh_lvl = sh["level"]
+        if hi in crossed:
+            continue
+
+        for j in range(hi + 1, n):
+            if c[j] > sh_lvl:
+                crossed.add(hi)
+                # hi+1 ~ j-1 구간에서 최저 저가 캔들 선택
+                add("bullish", hi + 1, j, lambda r: min(r, key=l.__getitem__))
+                break
+
+    # Bearish OB: 스윙 저가 하향 돌파
+    for sl in (s for s in swings if s["kind"] == "low"):
+        li     = sl["index"]
+        sl_lvl = sl["level"]
+        if li in crossed:
+            continue
+
+        for j in range(li + 1, n):
+            if c[j] < sl_lvl:
+                crossed.add(li)
+                # li+1 ~ j-1 구간에서 최고 고가 캔들 선택
+                add("bearish", li + 1, j, lambda r: max(r, key=h.__getitem__))
+                break
+
+    return result
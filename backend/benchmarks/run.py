@@ -0,0 +1,127 @@
+# 성능 벤치마크 러너 — 합성 시세로 bt/grid/wf/지표/SMC 함수 시간 측정, JSON 출력
+#   python -m benchmarks.run --sizes 1000,10000 --repeat 3 --out bench.json
+#   python -m benchmarks.run --only smc. --sizes 100000
+#   python -m benchmarks.run --only smc.swing,smc.obz --sizes 10000   (벡터화 vs 봉 루프 기준 구현)
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks import legacy
+from benchmarks.synth import dataset
+from service.market import indicators, smc
+from service.trading.backtest import BacktestConfig, bt, grid, wf
+from service.trading.btsearch import search
+
+_AXES = dict(buy_thresholds=[45, 55, 65], take_profit_pcts=[3.0, 5.0], stop_pcts=[2.0, 3.0])
+
+
+# 측정 대상 — 이름 → (15분봉, 일봉) 을 받아 1회 실행하는 함수
+def cases() -> dict[str, Callable[[list[dict], list[dict]], object]]:
+    cfg = BacktestConfig()
+    return {
+        "bt": lambda c15, daily: bt("BENCH", c15, daily, cfg),
+        "grid": lambda c15, daily: grid("BENCH", c15, daily, cfg, **_AXES),
+        "wf": lambda c15, daily: wf("BENCH", c15, daily, cfg, windows=6),
+        "search": lambda c15, daily: search("BENCH", c15, daily, cfg, configs=500),
+        "indicators.summary": lambda c15, daily: indicators.summary(c15),
+        "indicators.summaries": lambda c15, daily: indicators.summaries([c15] * 100),
+        "smc.fvgz": lambda c15, daily: smc.fvgz(c15),
+        "smc.swing": lambda c15, daily: smc.swing(c15),
+        "smc.obz": lambda c15, daily: smc.obz(c15),
+        "smc.swing.loop": lambda c15, daily: legacy.swing(c15),
+        "smc.obz.loop": lambda c15, daily: legacy.obz(c15),
+        "smc.bos": lambda c15, daily: smc.bos(c15),
+        "smc.fvg": lambda c15, daily: smc.fvg(c15, c15[-1]["close"]),
+        "smc.ob": lambda c15, daily: smc.ob(c15, c15[-1]["close"]),
+        "smc.struct": lambda c15, daily: smc.struct(c15),
+        "smc.fvgin": lambda c15, daily: smc.fvgin(c15, c15[-1]["close"]),
+        "smc.stop": lambda c15, daily: smc.stop(c15, c15[-1]["close"]),
+        "smc.scan": lambda c15, daily: smc.scan(c15, c15[-1]["close"]),
+    }
+
+
+# repeat 회 실행 시간 (초)
+def timeit(fn: Callable[[], object], repeat: int) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return runs
+
+
+# 측정 환경 기록 — 회귀 비교 시 같은 조건끼리만 비교
+def meta(repeat: int) -> dict:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).resolve().parent, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        rev = None
+    return {
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_rev": rev,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+    }
+
+
+# 크기별 전체 측정 — only 접두어로 대상 제한
+def bench(sizes: list[int], repeat: int = 3, only: list[str] | None = None) -> dict:
+    table = {
+        name: fn for name, fn in cases().items()
+        if not only or any(name.startswith(p) for p in only)
+    }
+    results = []
+    for n in sizes:
+        c15, daily = dataset(n)
+        for name, fn in table.items():
+            runs = timeit(lambda: fn(c15, daily), repeat)
+            results.append({
+                "name": name,
+                "bars": len(c15),
+                "daily": len(daily),
+                "best_s": round(min(runs), 6),
+                "median_s": round(statistics.median(runs), 6),
+                "mean_s": round(statistics.fmean(runs), 6),
+                "runs": len(runs),
+            })
+            print(f"{name:<20} {len(c15):>7} bars  best {min(runs):.4f}s", file=sys.stderr)
+    return {"meta": meta(repeat), "results": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="backtest/scoring benchmarks")
+    parser.add_argument("--sizes", default="1000,10000", help="15분봉 개수 목록 (쉼표 구분, 1k~100k)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="", help="측정 대상 이름 접두어 (쉼표 구분, 예: bt,smc.)")
+    parser.add_argument("--out", default="", help="JSON 저장 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = [s.strip() for s in args.only.split(",") if s.strip()]
+    report = bench(sizes, max(1, args.repeat), only)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
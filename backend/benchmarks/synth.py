@@ -0,0 +1,75 @@
+# 벤치마크용 합성 시세 — 갭/급등락이 섞인 랜덤워크 15분봉/일봉 (시드 고정, 재현 가능)
+import datetime
+import random
+
+# 세션당 15분봉 수 (09:00~15:15)
+_PER_DAY = 26
+
+
+# 주말 제외 거래일 n개 (start 포함 이후)
+def sessions(start: datetime.date, n: int) -> list[datetime.date]:
+    out, d = [], start
+    while len(out) < n:
+        if d.weekday() < 5:
+            out.append(d)
+        d += datetime.timedelta(days=1)
+    return out
+
+
+# 15분봉 n개 — 가끔 점프해 FVG/오더블록/구조 전환이 생기도록
+def bars(n: int, start: datetime.date = datetime.date(2024, 1, 2), seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    price = 50_000
+    rows = []
+    for day in sessions(start, -(-n // _PER_DAY)):
+        base = datetime.datetime.combine(day, datetime.time(9, 0))
+        for k in range(_PER_DAY):
+            if len(rows) == n:
+                return rows
+            jump = rng.choice([0, 0, 0, 0, 150, -150, 300, -300])
+            o = max(1_000, price + jump)
+            c = max(1_000, o + rng.randint(-120, 120))
+            rows.append({
+                "time": base + datetime.timedelta(minutes=15 * k),
+                "open": o,
+                "high": max(o, c) + rng.randint(0, 60),
+                "low": min(o, c) - rng.randint(0, 60),
+                "close": c,
+                "volume": 1_000 + rng.randint(0, 9_000),
+            })
+            price = c
+    return rows
+
+
+# 일봉 n개 — end 이전(미포함) 거래일로 끝나도록 역산
+def days(n: int, end: datetime.date | None = None, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    end = end or datetime.date(2024, 1, 2) + datetime.timedelta(days=n * 2)
+    dates, d = [], end - datetime.timedelta(days=1)
+    while len(dates) < n:
+        if d.weekday() < 5:
+            dates.append(d)
+        d -= datetime.timedelta(days=1)
+    price = 50_000
+    rows = []
+    for day in reversed(dates):
+        o = max(1_000, price + rng.randint(-600, 600))
+        c = max(1_000, o + rng.randint(-1_200, 1_200))
+        rows.append({
+            "date": day.isoformat(),
+            "open": o,
+            "high": max(o, c) + rng.randint(0, 500),
+            "low": min(o, c) - rng.randint(0, 500),
+            "close": c,
+            "volume": 100_000 + rng.randint(0, 400_000),
+        })
+        price = c
+    return rows
+
+
+# 백테스트 입력 한 벌 — 15분봉 n개 + 첫 세션 이전 warmup 일봉 + 세션 구간 일봉
+def dataset(n: int, warmup: int = 60, seed: int = 11) -> tuple[list[dict], list[dict]]:
+    c15 = bars(n, seed=seed)
+    span = len({c["time"].date() for c in c15})
+    daily = days(warmup + span, end=c15[-1]["time"].date() + datetime.timedelta(days=1), seed=seed + 1)
+    return c15, daily
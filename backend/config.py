@@ -34,6 +34,19 @@ class Settings(BaseSettings):
     use_prediction: bool = False      # Transformer 예측 연동 (느림, 선택)
     bot_restart_on_crash: bool = True # 장중 예외 종료 시 백오프 재시작 (3회 한도)
 
+    # 스코어링 워커 풀 — thread | process | inline(이벤트 루프에서 직접), 워커 수 (0이면 CPU 코어 수, 최대 4)
+    score_pool: str = "thread"
+    score_workers: int = 0
+
+    # 백테스트 프로세스 풀 워커 수 (0이면 CPU 코어 수)
+    backtest_workers: int = 0
+    # 백테스트 작업 동시 실행 수 / 대기 포함 최대 작업 수
+    backtest_jobs: int = 2
+    backtest_job_queue: int = 16
+    # 일봉 저장소 경로 (비우면 data/daily) / 오프라인 모드 — 원격 수집 없이 저장 파일(픽스처)만 사용
+    daily_dir: str = ""
+    daily_offline: bool = False
+
     # 모의투자 여부 — URL_BASE가 모의 도메인이면 자동 True (주문/잔고 TR 코드 분기 기준)
     @property
     def mock(self) -> bool:
@@ -20,7 +20,9 @@ from api.limiter import limiter
 from service.trading.bot import bot
 from service.kis import kis
 from service.trading.strategy import scorer
+from service.trading import btcache, btjobs, btpool, scorepool, strategy
 from service.infra import discord
+from service.market.candle_store import store
 from service.market.price_sync import price_sync
 from service.market.sector import sectors
 from service.market.stock_universe import listing
@@ -53,12 +55,20 @@ async def lifespan(app: FastAPI):
         logger.warning("KIS API 인증 실패 (장외 시간 또는 키 문제) — 서버는 기동합니다: %s", e)
 
     if kis_ok:
+        # 관찰 종목 스트리밍 지표를 저장된 분봉으로 1회 초기화 — 이후 틱 단위 O(1) 갱신
+        for code in settings.symbol_list:
+            for interval in (15, 60):
+                await asyncio.to_thread(store.warm, code, interval)
         await tick_q.start()
 
     # 이벤트 버스 시작 (Redis Pub/Sub 연결)
     if kis.cache.redis is not None:
         bus.bind(kis.cache.redis)
     await bus.start()
+    # 장마감 분봉 저장 시 백테스트 결과 캐시 무효화
+    bus.on("flush", btcache.onflush)
+    # 15분봉 확정 시 해당 종목 평가 캐시 무효화
+    bus.on("bar", strategy.onbar)
 
     # Discord 알림 큐 기동 (주문 경로 비차단)
     await discord.start()
@@ -81,6 +91,9 @@ async def lifespan(app: FastAPI):
     await discord.close()
     await bus.stop()
     await price_sync.eod()
+    btjobs.close()
+    btpool.close()
+    scorepool.close()
     if kis_ok:
         await kis.wclose()
         await tick_q.stop()
@@ -13,6 +13,7 @@ from torch.utils.data import DataLoader, Dataset
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import mean_absolute_error
 from service.infra.ttl_cache import TTLCache
+from service.market.daily_store import daily_store
 from service.market.holidays import mkt
 
 logger = logging.getLogger(__name__)
@@ -89,35 +90,23 @@ class Predictor:
         # 같은 프로세스의 매매 루프와 CPU 경합 방지 — 학습 내부 스레드 제한
         torch.set_num_threads(1)
 
-    # 1년치 주가 데이터 수집 (FDR 우선, YFinance 폴백)
+    # 1년치 주가 데이터 — 일봉 저장소 경유 (빠진 날짜만 FDR/YFinance 수집)
     def raw(self, symbol: str) -> pd.DataFrame:
-        symbol     = symbol.zfill(6)
-        end_date   = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-        # FDR 시도
-        try:
-            import FinanceDataReader as fdr
-            data = fdr.DataReader(symbol, start_date, end_date)
-            if data is not None and not data.empty:
-                data = self.settled(data, symbol)
-                logger.info(f"FDR 데이터 수집 성공: {symbol} ({len(data)}일)")
-                return data
-        except Exception as e:
-            logger.warning(f"FDR 실패 {symbol}: {e}")
-        # YFinance 폴백
-        try:
-            import yfinance as yf
-            for suffix in [".KS", ".KQ"]:
-                ticker = f"{symbol}{suffix}"
-                stock  = yf.Ticker(ticker)
-                data   = stock.history(start=start_date, end=end_date, timeout=10)
-                if not data.empty:
-                    data = self.settled(data, ticker)
-                    logger.info(f"YF 데이터 수집 성공: {ticker} ({len(data)}일)")
-                    return data
-        except Exception as e:
-            logger.warning(f"YFinance 실패 {symbol}: {e}")
-        raise ValueError(f"데이터 수집 실패: {symbol}")
+        symbol = symbol.zfill(6)
+        rows   = daily_store.recent(symbol, 365)
+        if not rows:
+            raise ValueError(f"데이터 수집 실패: {symbol}")
+        data = pd.DataFrame(
+            {
+                "Open":   [r["open"] for r in rows],
+                "High":   [r["high"] for r in rows],
+                "Low":    [r["low"] for r in rows],
+                "Close":  [r["close"] for r in rows],
+                "Volume": [r["volume"] for r in rows],
+            },
+            index=pd.DatetimeIndex([r["date"] for r in rows], name="Date"),
+        )
+        return self.settled(data, symbol)
 
     # 장 마감 전이면 형성 중인 당일봉을 제거 (네이버/야후 일봉은 장중 미완성 봉 포함)
     def settled(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
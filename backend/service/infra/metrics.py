@@ -51,6 +51,22 @@ bot_holdings = Gauge(
     "Current bot holding positions",
 )
 
+# 스코어링 워커 풀 — phase: queue(제출 → 워커 시작) / compute(계산)
+score_pool_seconds = Histogram(
+    "score_pool_seconds",
+    "Scoring pool queue wait and compute time",
+    ["phase"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+)
+
+# 스코어러 — factor: 팩터 이름 / indicators / stop / fetch.daily·price·c15, mode: fast / full
+score_factor_seconds = Histogram(
+    "score_factor_seconds",
+    "Scorer per-factor and input fetch time",
+    ["factor", "mode"],
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+)
+
 # 캐시
 cache_hit = Counter(
     "cache_hit_total",
@@ -5,6 +5,10 @@ import logging
 from pathlib import Path
 from collections import defaultdict
 
+from service.infra.event_bus import bus
+from service.market.frame import CandleFrame
+from service.market.stream import Live
+
 logger = logging.getLogger(__name__)
 
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
@@ -52,11 +56,17 @@ class CandleStore:
             lambda: {15: {}, 60: {}}
         )
         self._lock = asyncio.Lock()
+        # 스트리밍 지표 — code - interval - Live (확정 봉만 반영, 세션 간 유지)
+        self._live: dict[str, dict[int, Live]] = defaultdict(lambda: {15: Live(), 60: Live()})
+        # 형성 중 봉 — (code, interval) - Candle
+        self._open: dict[tuple[str, int], Candle] = {}
 
-    # 틱 데이터를 15분/60분봉 버킷에 반영
+    # 틱 데이터를 15분/60분봉 버킷에 반영 — 새 봉이 열리면 직전 봉을 확정해 스트리밍 지표 전진
+    # 확정 봉은 "bar" 이벤트로 통지 (평가 캐시 무효화)
     async def ingest(self, code: str, price: int, volume: int,
                      ts: datetime.datetime | None = None) -> None:
         ts = ts or datetime.datetime.now()
+        closed: list[dict] = []
         async with self._lock:
             for interval in (15, 60):
                 bk = self.bucket(ts, interval)
@@ -64,17 +74,57 @@ class CandleStore:
                 if bk in bucket:
                     bucket[bk].update(price, volume)
                 else:
-                    bucket[bk] = Candle(price, volume, self.slot(ts, interval))
+                    bucket[bk] = candle = Candle(price, volume, self.slot(ts, interval))
+                    cur = self._open.get((code, interval))
+                    # 지연 도착 틱으로 열린 과거 봉은 지표에 반영하지 않음
+                    if cur is None or candle.ts > cur.ts:
+                        if cur is not None:
+                            self.confirm(code, interval, cur.snapshot())
+                            closed.append({"code": code, "interval": interval, "time": cur.ts})
+                        self._open[(code, interval)] = candle
+                self._live[code][interval].tick(price, volume, ts)
+        for data in closed:
+            await bus.emit("bar", data)
+
+    # 확정 봉 1개 → 스트리밍 지표 전진
+    def confirm(self, code: str, interval: int, c: dict) -> None:
+        self._live[code][interval].push(c)
+
+    # 과거 확정 봉으로 스트리밍 지표 초기화 (기동 시 1회 — 이후 확정 봉마다 증분 갱신)
+    def warm(self, code: str, interval: int = 15, candles: list[dict] | None = None) -> int:
+        rows = self.span(code, interval=interval) if candles is None else candles
+        live = Live()
+        for c in rows:
+            live.push(c)
+        self._live[code][interval] = live
+        return len(rows)
+
+    # 현재 지표 값 — forming=True 면 형성 중 봉을 잠정 반영 (데이터 없으면 None)
+    def live(self, code: str, interval: int = 15, forming: bool = True) -> dict | None:
+        state = self._live.get(code, {}).get(interval)
+        if state is None:
+            return None
+        cur = self._open.get((code, interval)) if forming else None
+        if cur is None and not state.bars:
+            return None
+        return state.view(cur.snapshot() if cur is not None else None)
 
     # 특정 종목의 N분봉 캔들 리스트 반환
     def candles(self, code: str, interval: int = 15) -> list[dict]:
         bucket = self._buf.get(code, {}).get(interval, {})
         return [c.snapshot() for c in sorted(bucket.values(), key=lambda c: c.ts)]
 
-    # 장 마감 후 모든 종목의 캔들을 parquet/csv로 저장
+    # 당일 확정 봉 (형성 중 봉 제외)
+    def closed(self, code: str, interval: int = 15) -> list[dict]:
+        cur = self._open.get((code, interval))
+        bucket = self._buf.get(code, {}).get(interval, {})
+        return [c.snapshot() for c in sorted(bucket.values(), key=lambda c: c.ts) if c is not cur]
+
+    # 장 마감 후 모든 종목의 캔들을 parquet/csv로 저장 — 저장 종목은 "flush" 이벤트로 통지 (결과 캐시 무효화)
     async def flush(self, date_str: str | None = None) -> int:
         date_str = date_str or datetime.date.today().isoformat()
         saved = 0
+        codes: list[str] = []
         async with self._lock:
             for code, intervals in self._buf.items():
                 for interval, bucket in intervals.items():
@@ -85,8 +135,15 @@ class CandleStore:
                     path.parent.mkdir(parents=True, exist_ok=True)
                     self.csvout(path, rows)
                     saved += 1
+                    codes.append(code)
                     logger.info(f"Saved {len(rows)} candles → {path}")
+            # 세션 마지막 봉 확정 → 스트리밍 지표는 다음 세션으로 이어짐
+            for (code, interval), cur in self._open.items():
+                self.confirm(code, interval, cur.snapshot())
+            self._open.clear()
             self._buf.clear()
+        if codes:
+            await bus.emit("flush", {"date": date_str, "codes": sorted(set(codes))})
         return saved
 
     # 저장된 과거 분봉 로드 (csv)
@@ -98,19 +155,39 @@ class CandleStore:
             return []
         return self.csvin(path)
 
-    # 저장된 세션 파일을 날짜 간격과 무관하게 최근 N개까지 병합 로드
-    def span(self, code: str, interval: int = 15, days: int = 365) -> list[dict]:
+    # span 대상 세션 파일 (날짜순, 최근 N개)
+    def files(self, code: str, interval: int = 15, days: int = 365) -> list[Path]:
         root = self._dir / code
         if not root.exists():
             return []
         files = sorted(root.glob(f"*_{interval}m.csv"))
         if days > 0:
             files = files[-days:]
+        return files
+
+    # span 입력 지문 — 파일명/수정시각/크기 (내용 로드 없이 결과 캐시 키 구성)
+    def sig(self, code: str, interval: int = 15, days: int = 365) -> list[tuple[str, int, int]]:
+        out = []
+        for path in self.files(code, interval, days):
+            st = path.stat()
+            out.append((path.name, st.st_mtime_ns, st.st_size))
+        return out
+
+    # 저장된 세션 파일을 날짜 간격과 무관하게 최근 N개까지 병합 로드
+    def span(self, code: str, interval: int = 15, days: int = 365) -> list[dict]:
         rows: list[dict] = []
-        for path in files:
+        for path in self.files(code, interval, days):
             rows.extend(self.csvin(path))
         return sorted(rows, key=lambda row: row["time"])
 
+    # 저장 세션 + 당일 확정 봉 (flush 시 버퍼를 비우므로 중복 없음)
+    def history(self, code: str, interval: int = 15, days: int = 365) -> list[dict]:
+        return self.span(code, interval=interval, days=days) + self.closed(code, interval)
+
+    # 기간 분봉 컬럼형 로드 (지표/SMC/백테스트 입력)
+    def frame(self, code: str, interval: int = 15, days: int = 365) -> CandleFrame:
+        return CandleFrame.of(self.span(code, interval=interval, days=days))
+
     # 시각을 interval 단위 버킷 키로 변환
     def bucket(self, ts: datetime.datetime, interval: int) -> str:
         m = (ts.minute // interval) * interval
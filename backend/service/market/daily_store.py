@@ -0,0 +1,209 @@
+# 일봉 OHLCV 영속 저장소 — 종목별 컬럼 파일(.npy, memmap 읽기) + 수집 구간 기록, 빠진 날짜만 증분 수집
+import datetime
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from config import settings
+from service.market.holidays import mkt
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "daily"
+
+# 열 순서 — 0열은 날짜(epoch 일수), 나머지는 OHLCV (정수)
+_COLS = ("open", "high", "low", "close", "volume")
+
+# 장 마감 시각 — 이전에는 당일봉 미확정
+_CLOSE = datetime.time(15, 30)
+
+
+# 원격 일봉 수집 (FDR 우선, YFinance 폴백) — 종가 확정 여부와 무관하게 받은 그대로 반환
+def remote(code: str, start: datetime.date, end: datetime.date) -> list[dict]:
+    try:
+        import FinanceDataReader as fdr
+        df = fdr.DataReader(code, start.isoformat(), end.isoformat())
+        if df is not None and not df.empty:
+            logger.info(f"FDR 일봉 수집: {code} {start}~{end} ({len(df)}일)")
+            return rows(df)
+    except Exception as e:
+        logger.warning(f"FDR 실패 {code}: {e}")
+    try:
+        import yfinance as yf
+        for suffix in [".KS", ".KQ"]:
+            # yfinance end 는 미포함
+            df = yf.Ticker(f"{code}{suffix}").history(
+                start=start.isoformat(), end=(end + datetime.timedelta(days=1)).isoformat(), timeout=10,
+            )
+            if not df.empty:
+                logger.info(f"YF 일봉 수집: {code}{suffix} {start}~{end} ({len(df)}일)")
+                return rows(df)
+    except Exception as e:
+        logger.warning(f"YFinance 실패 {code}: {e}")
+    raise ValueError(f"데이터 수집 실패: {code}")
+
+
+# DataFrame(Open/High/Low/Close/Volume, 날짜 인덱스) → 일봉 dict 리스트
+def rows(df) -> list[dict]:
+    return [
+        {
+            "date":   str(dt)[:10],
+            "open":   int(round(row["Open"])),
+            "high":   int(round(row["High"])),
+            "low":    int(round(row["Low"])),
+            "close":  int(round(row["Close"])),
+            "volume": int(row["Volume"]),
+        }
+        for dt, row in df.iterrows()
+    ]
+
+
+# 확정된 마지막 일자 — 개장일 장중이면 전일까지
+def settled(now: datetime.datetime | None = None) -> datetime.date:
+    now = now or datetime.datetime.now()
+    if mkt(now.date()) and now.time() < _CLOSE:
+        return now.date() - datetime.timedelta(days=1)
+    return now.date()
+
+
+# [start, end] 안에 개장일이 있는지
+def opened(start: datetime.date, end: datetime.date) -> bool:
+    d = start
+    while d <= end:
+        if mkt(d):
+            return True
+        d += datetime.timedelta(days=1)
+    return False
+
+
+# 종목별 일봉 저장소 — {code}.npy (n×6 int64) + {code}.json (수집 완료 구간)
+class DailyStore:
+    # offline=True 면 원격 수집 없이 저장된 파일(픽스처)만 사용
+    def __init__(
+        self,
+        base_dir: Path | None = None,
+        fetch: Callable[[str, datetime.date, datetime.date], list[dict]] = remote,
+        offline: bool = False,
+    ) -> None:
+        self._dir = base_dir or _DATA_DIR
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._fetch = fetch
+        self.offline = offline
+        self._lock = threading.Lock()
+
+    # 컬럼 파일 경로
+    def path(self, code: str) -> Path:
+        return self._dir / f"{code}.npy"
+
+    # 수집 구간 기록 경로
+    def meta(self, code: str) -> Path:
+        return self._dir / f"{code}.json"
+
+    # 수집 완료 구간 [start, end] (없으면 None)
+    def covered(self, code: str) -> tuple[datetime.date, datetime.date] | None:
+        path = self.meta(code)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        return datetime.date.fromisoformat(data["start"]), datetime.date.fromisoformat(data["end"])
+
+    # 저장 행렬 memmap 읽기 (없으면 빈 행렬)
+    def matrix(self, code: str) -> np.ndarray:
+        path = self.path(code)
+        if not path.exists():
+            return np.empty((0, 1 + len(_COLS)), dtype=np.int64)
+        return np.load(path, mmap_mode="r")
+
+    # 기간 일봉 — 수집 구간 밖이면 빠진 앞/뒤 구간만 원격 수집 후 저장
+    def get(self, code: str, start: datetime.date, end: datetime.date | None = None) -> list[dict]:
+        code = code.zfill(6)
+        end = min(end or datetime.date.today(), settled())
+        if not self.offline:
+            self.fill(code, start, end)
+        return self.read(code, start, end)
+
+    # 최근 N일(달력 기준) 일봉
+    def recent(self, code: str, days: int) -> list[dict]:
+        end = datetime.date.today()
+        return self.get(code, end - datetime.timedelta(days=days), end)
+
+    # 빠진 구간 수집 — 기존 구간과 이어지도록 앞/뒤만 요청, 개장일이 없는 구간(주말·휴장일)은 요청 생략
+    # 수집 구간 끝은 실제로 받은 마지막 날짜까지만 기록 (미공시 일자는 다음 요청에서 재수집)
+    # 저장분이 있는 종목의 뒤 구간 수집 실패/빈 결과는 신규 없음으로 보고 저장분 제공 (장 마감 ~ 공시 사이)
+    def fill(self, code: str, start: datetime.date, end: datetime.date) -> int:
+        if start > end:
+            return 0
+        with self._lock:
+            cov = self.covered(code)
+            gaps = [(start, end)]
+            if cov is not None:
+                gaps = []
+                if start < cov[0]:
+                    gaps.append((start, cov[0] - datetime.timedelta(days=1)))
+                if end > cov[1]:
+                    gaps.append((cov[1] + datetime.timedelta(days=1), end))
+            gaps = [(a, b) for a, b in gaps if opened(a, b)]
+            if not gaps:
+                return 0
+            lo, hi = cov if cov is not None else (None, None)
+            fetched: list[dict] = []
+            for a, b in gaps:
+                try:
+                    got = [r for r in self._fetch(code, a, b) if str(r["date"])[:10] <= end.isoformat()]
+                except Exception as e:
+                    if cov is None or a <= cov[1]:
+                        raise
+                    logger.warning(f"일봉 신규 구간 없음 {code} {a}~{b}: {e}")
+                    continue
+                fetched.extend(got)
+                if lo is None or a < lo:
+                    lo = a
+                last = max((datetime.date.fromisoformat(str(r["date"])[:10]) for r in got), default=None)
+                if last is not None and (hi is None or last > hi):
+                    hi = last
+            if hi is None:
+                return 0
+            self.write(code, fetched, lo, hi)
+            return len(fetched)
+
+    # 행 병합 후 원자적 저장 (같은 날짜는 새 값 우선)
+    def write(self, code: str, new: list[dict], start: datetime.date, end: datetime.date) -> None:
+        old = np.array(self.matrix(code))
+        add = np.array(
+            [[np.datetime64(str(r["date"])[:10], "D").astype(np.int64), *(int(r[k]) for k in _COLS)] for r in new],
+            dtype=np.int64,
+        ).reshape(-1, 1 + len(_COLS))
+        merged = np.concatenate([add, old])
+        _, first = np.unique(merged[:, 0], return_index=True)
+        merged = merged[first]
+        tmp = self.path(code).with_suffix(".tmp.npy")
+        np.save(tmp, merged)
+        os.replace(tmp, self.path(code))
+        self.meta(code).write_text(json.dumps({"start": start.isoformat(), "end": end.isoformat()}))
+
+    # 저장 행렬에서 기간 추출 → dict 리스트 (bt/지표 입력 형태)
+    def read(self, code: str, start: datetime.date, end: datetime.date) -> list[dict]:
+        mat = self.matrix(code)
+        if not len(mat):
+            return []
+        days = mat[:, 0]
+        lo = int(np.searchsorted(days, np.datetime64(start, "D").astype(np.int64), side="left"))
+        hi = int(np.searchsorted(days, np.datetime64(end, "D").astype(np.int64), side="right"))
+        part = np.array(mat[lo:hi])
+        dates = part[:, 0].astype("datetime64[D]").astype(str).tolist()
+        cols = part[:, 1:].T.tolist()
+        return [
+            {"date": dates[i], **{k: cols[j][i] for j, k in enumerate(_COLS)}}
+            for i in range(len(dates))
+        ]
+
+
+daily_store = DailyStore(
+    Path(settings.daily_dir) if settings.daily_dir else None,
+    offline=settings.daily_offline,
+)
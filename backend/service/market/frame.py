@@ -0,0 +1,151 @@
+# 컬럼형 캔들 컨테이너 — OHLC(float64)/거래량(int64)/시각(int64 epoch 초) 연속 배열
+# 슬라이스는 배열 뷰(복사 없음), 정수 인덱스는 기존 dict 형태 1행 반환 — list[dict] 소비자와 호환
+import datetime
+from collections.abc import Sequence
+
+import numpy as np
+
+_PRICES = ("open", "high", "low", "close")
+
+# 1970-01-01 날짜 서수 (epoch 일수 → date.toordinal)
+_EPOCH_ORD = datetime.date(1970, 1, 1).toordinal()
+
+
+class CandleFrame(Sequence):
+    __slots__ = ("open", "high", "low", "close", "volume", "ts", "key", "ints")
+
+    # key: 시각 필드명 ("time" → datetime, "date" → YYYY-MM-DD 문자열, "" → 시각 없음), ints: 원본 시세가 정수
+    def __init__(
+        self,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        ts: np.ndarray,
+        key: str = "time",
+        ints: bool = True,
+    ) -> None:
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.ts = ts
+        self.key = key
+        self.ints = ints
+
+    # dict 리스트 → 프레임 (이미 프레임이면 그대로)
+    @classmethod
+    def of(cls, candles: "Sequence[dict] | CandleFrame") -> "CandleFrame":
+        if isinstance(candles, CandleFrame):
+            return candles
+        first = candles[0] if candles else {}
+        key = "time" if "time" in first else "date" if "date" in first else ""
+        raw = np.array([[c[k] for c in candles] for k in _PRICES]).reshape(len(_PRICES), len(candles))
+        ints = raw.dtype.kind in "iu" or not len(candles)
+        cols = list(raw.astype(np.float64))
+        volume = np.array([c.get("volume", 0) for c in candles], dtype=np.int64)
+        if key == "time":
+            ts = np.array([c["time"] for c in candles], dtype="datetime64[s]").astype(np.int64)
+        elif key == "date":
+            ts = np.array([str(c.get("date", ""))[:10] for c in candles], dtype="datetime64[D]")
+            ts = ts.astype("datetime64[s]").astype(np.int64)
+        else:
+            ts = np.zeros(len(candles), dtype=np.int64)
+        return cls(*cols, volume, ts, key, ints)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return CandleFrame(
+                self.open[i], self.high[i], self.low[i], self.close[i],
+                self.volume[i], self.ts[i], self.key, self.ints,
+            )
+        n = len(self.ts)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("frame index out of range")
+        return self.row(i)
+
+    # 인덱스 배열 순서로 행 선택 (사본)
+    def take(self, idx: np.ndarray) -> "CandleFrame":
+        return CandleFrame(
+            self.open[idx], self.high[idx], self.low[idx], self.close[idx],
+            self.volume[idx], self.ts[idx], self.key, self.ints,
+        )
+
+    # 가격 값 원형 복원 (정수 시세면 int)
+    def px(self, v: float):
+        return int(v) if self.ints else float(v)
+
+    # 시각 필드 값 (datetime 또는 날짜 문자열, 시각 없으면 인덱스)
+    def stamp(self, i: int):
+        if not self.key:
+            return i
+        if self.key == "time":
+            return self.ts[i].astype("datetime64[s]").astype(datetime.datetime)
+        return str(self.ts[i].astype("datetime64[s]").astype("datetime64[D]"))
+
+    # 전체 시각 필드 값 (datetime 또는 날짜 문자열, 시각 없으면 인덱스)
+    def stamps(self) -> list:
+        if not self.key:
+            return list(range(len(self.ts)))
+        stamps = self.ts.astype("datetime64[s]")
+        if self.key == "time":
+            return stamps.astype(datetime.datetime).tolist()
+        return stamps.astype("datetime64[D]").astype(str).tolist()
+
+    # 1행 dict (기존 캔들 형태)
+    def row(self, i: int) -> dict:
+        out = {self.key: self.stamp(i)} if self.key else {}
+        return out | {
+            "open":   self.px(self.open[i]),
+            "high":   self.px(self.high[i]),
+            "low":    self.px(self.low[i]),
+            "close":  self.px(self.close[i]),
+            "volume": int(self.volume[i]),
+        }
+
+    # 전체 dict 리스트 (일괄 변환)
+    def rows(self) -> list[dict]:
+        stamps = self.stamps()
+        head = (lambda i: {self.key: stamps[i]}) if self.key else (lambda i: {})
+        cols = [
+            (col.astype(np.int64) if self.ints else col).tolist()
+            for col in (self.open, self.high, self.low, self.close)
+        ]
+        vols = self.volume.tolist()
+        return [
+            head(i) | {"open": cols[0][i], "high": cols[1][i],
+                       "low": cols[2][i], "close": cols[3][i], "volume": vols[i]}
+            for i in range(len(stamps))
+        ]
+
+    # 컬럼 배열 (open/high/low/close/volume/ts)
+    def col(self, name: str) -> np.ndarray:
+        return getattr(self, name)
+
+    # 봉별 거래일 (epoch 일수) — 세션 경계 판정용
+    def days(self) -> np.ndarray:
+        return self.ts // 86_400
+
+    # 봉별 날짜 서수 (date.toordinal) — 일봉 경계 탐색용
+    def ords(self) -> np.ndarray:
+        return self.days() + _EPOCH_ORD
+
+
+# 캔들 컬럼 — 프레임이면 배열 뷰, dict 리스트면 추출 (float64)
+def col(candles: "Sequence[dict] | CandleFrame", name: str) -> np.ndarray:
+    if isinstance(candles, CandleFrame):
+        values = candles.col(name)
+        return values if values.dtype == np.float64 else values.astype(np.float64)
+    return np.array([c[name] for c in candles], dtype=np.float64)
+
+
+# dict 리스트/프레임 → 프레임
+def frame(candles: "Sequence[dict] | CandleFrame") -> CandleFrame:
+    return CandleFrame.of(candles)
@@ -1,38 +1,157 @@
 # 기술 지표 모듈 (RSI, MACD, 볼린저밴드) — numpy 벡터 연산
+# 배치 함수(emas/rsis/macds/bands/atrs)는 1차원(봉) 또는 2차원(종목 × 봉) 배열을 받아 전체 시계열을 한 번에 계산
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+from service.market.frame import col, frame
+
+
+# 1차 재귀 y[i] = b·x[i] + a·y[i-1] 를 마지막 축으로 일괄 적용 (y0 는 초기 상태)
+# lfilter 는 봉마다 b·x + a·y 순서 그대로 계산 — 파이썬 루프/증분 상태와 비트 단위 동일
+def recur(x: np.ndarray, b: float, a: float, y0: np.ndarray) -> np.ndarray:
+    zi = (np.asarray(y0, dtype=np.float64) * a)[..., None]
+    out, _ = lfilter([b], [1.0, -a], x, axis=-1, zi=zi)
+    return out
+
+
+# EMA 시계열 — 초기값 첫 원소, 이후 지수평활
+def emas(x: np.ndarray, period: int) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    if x.shape[-1] == 0:
+        return x.copy()
+    k = 2.0 / (period + 1)
+    out = np.empty_like(x)
+    out[..., 0] = x[..., 0]
+    out[..., 1:] = recur(x[..., 1:], k, 1 - k, x[..., 0])
+    return out
+
+
+# Wilder RSI 시계열 — 인덱스 period 부터 유효 (앞은 NaN), 평균손실 0 이면 100
+def rsis(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    closes = np.asarray(closes, dtype=np.float64)
+    out = np.full(closes.shape, np.nan)
+    if closes.shape[-1] < period + 1:
+        return out
+    delta = np.diff(closes, axis=-1)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    b, a = 1.0 / period, (period - 1) / period
+    avg_g = np.concatenate([gains[..., :period].mean(axis=-1, keepdims=True),
+                            recur(gains[..., period:], b, a, gains[..., :period].mean(axis=-1))], axis=-1)
+    avg_l = np.concatenate([losses[..., :period].mean(axis=-1, keepdims=True),
+                            recur(losses[..., period:], b, a, losses[..., :period].mean(axis=-1))], axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        val = 100 - 100 / (1 + avg_g / avg_l)
+    out[..., period:] = np.where(avg_l == 0, 100.0, val)
+    return out
+
+
+# MACD 시계열 (선, 시그널, 히스토그램) — 시그널은 인덱스 slow-1 부터 (앞은 NaN)
+def macds(
+    closes: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal_period: int = 9,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    closes = np.asarray(closes, dtype=np.float64)
+    line = emas(closes, fast) - emas(closes, slow)
+    sig = np.full(closes.shape, np.nan)
+    if closes.shape[-1] >= slow:
+        sig[..., slow - 1:] = emas(line[..., slow - 1:], signal_period)
+    return line, sig, line - sig
+
+
+# 볼린저밴드 시계열 (상단, 중심, 하단) — 인덱스 period-1 부터 (앞은 NaN)
+def bands(
+    closes: np.ndarray,
+    period: int = 20,
+    std_dev: float = 2.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    closes = np.asarray(closes, dtype=np.float64)
+    mid = np.full(closes.shape, np.nan)
+    sd = np.full(closes.shape, np.nan)
+    if closes.shape[-1] >= period:
+        win = sliding_window_view(closes, period, axis=-1)
+        mid[..., period - 1:] = win.mean(axis=-1)
+        sd[..., period - 1:] = win.std(axis=-1, ddof=0)
+    return mid + std_dev * sd, mid, mid - std_dev * sd
+
+
+# True Range — 인덱스 1 부터 (길이 n-1)
+def trs(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    high, low, close = (np.asarray(v, dtype=np.float64) for v in (high, low, close))
+    prev = close[..., :-1]
+    return np.maximum(
+        high[..., 1:] - low[..., 1:],
+        np.maximum(np.abs(high[..., 1:] - prev), np.abs(low[..., 1:] - prev)),
+    )
+
+
+# ATR 시계열 (TR 단순평균) — 인덱스 period 부터 (앞은 NaN)
+def atrs(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] < period + 1:
+        return out
+    out[..., period:] = sliding_window_view(trs(high, low, close), period, axis=-1).mean(axis=-1)
+    return out
+
+
+# 캔들 목록들 → (종목 × 봉) 행렬 — 길이가 다르면 최근 n봉(최단 길이)으로 우측 정렬
+def matrix(series: list[list[dict]], key: str = "close", n: int | None = None) -> np.ndarray:
+    n = min((len(s) for s in series), default=0) if n is None else n
+    return np.array([col(s, key)[len(s) - n:] for s in series], dtype=np.float64).reshape(len(series), n)
+
+
+def r2(v: float) -> float:
+    return round(float(v), 2)
+
+
+# 시계열 → 소수 2자리 목록 (미형성 구간 NaN 은 None)
+def r2s(x: np.ndarray) -> list:
+    return np.where(np.isnan(x), None, np.round(x, 2)).tolist()
+
+
+# 차트 오버레이용 전체 지표 시계열 — 봉 축 정렬, 미형성 구간은 None
+def series(candles: list[dict], spans: tuple[int, ...] = (5, 20, 60, 120)) -> dict:
+    f = frame(candles)
+    close, high, low = f.close, f.high, f.low
+    line, sig, hist = macds(close)
+    upper, mid, lower = bands(close)
+    ema = {}
+    for span in spans:
+        values = emas(close, span)
+        values[: span - 1] = np.nan
+        ema[str(span)] = r2s(values)
+    times = [t.isoformat() if hasattr(t, "isoformat") else t for t in f.stamps()]
+    return {
+        "time":      times,
+        "close":     [f.px(v) for v in close.tolist()],
+        "rsi":       r2s(rsis(close)),
+        "macd":      {"macd": r2s(line), "signal": r2s(sig), "histogram": r2s(hist)},
+        "bollinger": {"upper": r2s(upper), "middle": r2s(mid), "lower": r2s(lower)},
+        "atr":       r2s(atrs(high, low, close)),
+        "ema":       ema,
+    }
 
 
 class Indicators:
 
-    # 종가 배열 → numpy float64
-    def arr(self, candles: list[dict]) -> np.ndarray:
-        return np.array([c["close"] for c in candles], dtype=np.float64)
+    # 종가 배열 → numpy float64 (CandleFrame 이면 컬럼 뷰)
+    def arr(self, candles: list[dict], key: str = "close") -> np.ndarray:
+        return col(candles, key)
 
     # EMA — 초기값 첫 원소, 이후 지수평활
     def ema(self, arr: np.ndarray, period: int) -> np.ndarray:
-        k = 2.0 / (period + 1)
-        out = np.empty(len(arr))
-        out[0] = arr[0]
-        for i in range(1, len(arr)):
-            out[i] = arr[i] * k + out[i - 1] * (1 - k)
-        return out
+        return emas(arr, period)
 
     # RSI 계산 (기본 14일) — Wilder smoothing
-    def rsi(self, candles: list[dict], period: int = 14) -> float | None:
-        closes = self.arr(candles)
+    def rsi(self, candles: list[dict], period: int = 14, closes: np.ndarray | None = None) -> float | None:
+        closes = self.arr(candles) if closes is None else closes
         if len(closes) < period + 1:
             return None
-        delta  = np.diff(closes)
-        gains  = np.where(delta > 0, delta, 0.0)
-        losses = np.where(delta < 0, -delta, 0.0)
-        avg_g  = gains[:period].mean()
-        avg_l  = losses[:period].mean()
-        for i in range(period, len(delta)):
-            avg_g = (avg_g * (period - 1) + gains[i])  / period
-            avg_l = (avg_l * (period - 1) + losses[i]) / period
-        if avg_l == 0:
-            return 100.0
-        return round(100 - 100 / (1 + avg_g / avg_l), 2)
+        return r2(rsis(closes, period)[-1])
 
     # MACD 계산 (기본 12/26/9)
     def macd(
@@ -41,15 +160,13 @@ class Indicators:
         fast: int = 12,
         slow: int = 26,
         signal_period: int = 9,
+        closes: np.ndarray | None = None,
     ) -> dict | None:
-        closes = self.arr(candles)
+        closes = self.arr(candles) if closes is None else closes
         if len(closes) < slow + signal_period:
             return None
-        ema_f = self.ema(closes, fast)
-        ema_s = self.ema(closes, slow)
-        line  = ema_f - ema_s
-        sig   = self.ema(line[slow - 1:], signal_period)
-        m, s  = float(line[-1]), float(sig[-1])
+        line, sig, _ = macds(closes, fast, slow, signal_period)
+        m, s = float(line[-1]), float(sig[-1])
         return {
             "macd":      round(m, 2),
             "signal":    round(s, 2),
@@ -62,8 +179,9 @@ class Indicators:
         candles: list[dict],
         period: int = 20,
         std_dev: float = 2.0,
+        closes: np.ndarray | None = None,
     ) -> dict | None:
-        closes = self.arr(candles)
+        closes = self.arr(candles) if closes is None else closes
         if len(closes) < period:
             return None
         window = closes[-period:]
@@ -80,18 +198,9 @@ class Indicators:
     def atr(self, candles: list[dict], period: int = 14) -> float | None:
         if len(candles) < period + 1:
             return None
-        highs  = np.array([c["high"]  for c in candles], dtype=np.float64)
-        lows   = np.array([c["low"]   for c in candles], dtype=np.float64)
-        closes = np.array([c["close"] for c in candles], dtype=np.float64)
-        tr = np.maximum(
-            highs[1:] - lows[1:],
-            np.maximum(
-                np.abs(highs[1:] - closes[:-1]),
-                np.abs(lows[1:] - closes[:-1]),
-            ),
-        )
-        atr_val = tr[-period:].mean()
-        return round(float(atr_val), 2)
+        tail = candles[-(period + 1):]
+        tr = trs(self.arr(tail, "high"), self.arr(tail, "low"), self.arr(tail))
+        return r2(tr.mean())
 
     # 변동성 종합 분석
     def volatility(self, candles: list[dict]) -> dict:
@@ -102,11 +211,11 @@ class Indicators:
         price = float(closes[-1])
         if result["atr"] and price > 0:
             result["atr_pct"] = round(result["atr"] / price * 100, 2)
-        bb = self.bollinger(candles)
+        bb = self.bollinger(candles, closes=closes)
         if bb and price > 0:
             result["bb_width"] = round((bb["upper"] - bb["lower"]) / bb["middle"] * 100, 2)
-        highs = np.array([c["high"] for c in candles[-20:]], dtype=np.float64)
-        lows  = np.array([c["low"]  for c in candles[-20:]], dtype=np.float64)
+        highs = self.arr(candles[-20:], "high")
+        lows  = self.arr(candles[-20:], "low")
         avg_range = float(((highs - lows) / closes[-20:]).mean() * 100)
         result["daily_range_pct"] = round(avg_range, 2)
         atr_pct = result["atr_pct"] or 0
@@ -120,16 +229,54 @@ class Indicators:
             result["volatility_grade"] = "낮음"
         return result
 
-    # 전체 기술 지표 요약
+    # 전체 기술 지표 요약 — 종가 배열은 1회만 추출
     def summary(self, candles: list[dict]) -> dict:
+        closes = self.arr(candles)
         return {
-            "rsi":       self.rsi(candles),
-            "macd":      self.macd(candles),
-            "bollinger": self.bollinger(candles),
+            "rsi":       self.rsi(candles, closes=closes),
+            "macd":      self.macd(candles, closes=closes),
+            "bollinger": self.bollinger(candles, closes=closes),
             "price":     candles[-1]["close"] if candles else None,
             "volume":    candles[-1]["volume"] if candles else None,
         }
 
+    # 여러 종목 summary 일괄 — 같은 길이끼리 (종목 × 봉) 행렬 1회 연산, 결과는 summary 와 동일
+    def summaries(self, series: list[list[dict]]) -> list[dict]:
+        out: list[dict] = [{} for _ in series]
+        groups: dict[int, list[int]] = {}
+        for i, candles in enumerate(series):
+            groups.setdefault(len(candles), []).append(i)
+        for n, idx in groups.items():
+            if n == 0:
+                for i in idx:
+                    out[i] = self.summary([])
+                continue
+            closes = matrix([series[i] for i in idx], n=n)
+            rsi = rsis(closes)[:, -1]
+            line, sig, _ = macds(closes)
+            sd = closes[:, -20:].std(axis=-1, ddof=0) if n >= 20 else None
+            for row, i in enumerate(idx):
+                last = series[i][-1]
+                m, s = float(line[row, -1]), float(sig[row, -1])
+                center = float(closes[row, -20:].mean()) if n >= 20 else 0.0
+                out[i] = {
+                    "rsi": r2(rsi[row]) if n >= 15 else None,
+                    "macd": {
+                        "macd":      round(m, 2),
+                        "signal":    round(s, 2),
+                        "histogram": round(m - s, 2),
+                    } if n >= 35 else None,
+                    "bollinger": {
+                        "upper":         round(center + 2.0 * float(sd[row]), 2),
+                        "middle":        round(center, 2),
+                        "lower":         round(center - 2.0 * float(sd[row]), 2),
+                        "current_price": float(closes[row, -1]),
+                    } if n >= 20 else None,
+                    "price":     last["close"],
+                    "volume":    last["volume"],
+                }
+        return out
+
 
 # 모듈 레벨 인스턴스
 _ind      = Indicators()
@@ -139,3 +286,4 @@ bollinger  = _ind.bollinger
 atr        = _ind.atr
 volatility = _ind.volatility
 summary    = _ind.summary
+summaries  = _ind.summaries
@@ -1,6 +1,12 @@
 # SMC 지표 모듈 — 국장 오버나잇 갭 필터 내장
 import datetime
+import threading
+from collections import OrderedDict
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from service.market.frame import CandleFrame, col
 
 # 한국 장 시간 상수
 _OPEN  = datetime.time(9, 0)
@@ -25,166 +31,226 @@ def body(c: dict) -> float:
         return 0.0
     return (c["close"] - c["open"]) / rng
 
+# OHLC 컬럼 (파이썬 float 리스트) — dict 리스트/CandleFrame 공통, 봉 루프용 1회 추출
+def ohlc(candles) -> tuple[list[float], list[float], list[float], list[float]]:
+    return tuple(col(candles, k).tolist() for k in ("open", "high", "low", "close"))
+
+# 봉별 거래일 키 배열 — 시각 없는 캔들(일봉)이면 None (세션 경계 검사 생략)
+def sessions(candles) -> np.ndarray | None:
+    if isinstance(candles, CandleFrame):
+        return candles.days() if candles.key == "time" else None
+    if not candles or "time" not in candles[0]:
+        return None
+    return np.array([c["time"].toordinal() for c in candles], dtype=np.int64)
+
+# 구간 라벨 — 일봉 date, 분봉 time, 없으면 인덱스
+def label(candles, i: int) -> str:
+    if isinstance(candles, CandleFrame):
+        return str(candles.stamp(i))
+    c = candles[i]
+    return str(c.get("date", c.get("time", i)))
+
+# 여러 봉 라벨 일괄 (프레임은 시각 변환 1회)
+def labels(candles, idx: list[int]) -> list[str]:
+    if isinstance(candles, CandleFrame):
+        if not candles.key:
+            return [str(i) for i in idx]
+        return [str(t) for t in candles.take(idx).stamps()]
+    return [label(candles, i) for i in idx]
+
 # FVG 탐지 — Bullish: prev.high < nxt.low, Bearish: prev.low > nxt.high, 동일 세션만 유효
+# 이웃 봉 비교는 한 칸씩 민 배열로 일괄 판정, 연속 같은 방향 갭은 구간별 reduceat 으로 병합
 def fvgz(candles: list[dict], join_consecutive: bool = True) -> list[dict]:
     n = len(candles)
-    result: list[dict] = []
-
-    for i in range(1, n - 1):
-        prev, mid, nxt = candles[i - 1], candles[i], candles[i + 1]
-
-        # 오버나잇 갭을 FVG로 오인하지 않음
-        if "time" in mid:
-            if not (same(prev["time"], mid["time"]) and
-                    same(mid["time"], nxt["time"])):
-                continue
-
-        is_bull = mid["close"] > mid["open"]
-        is_bear = mid["close"] < mid["open"]
-
-        # 이전 고가 < 다음 저가 
-        if is_bull and prev["high"] < nxt["low"]:
-            result.append({
-                "kind":      "bullish",
-                "top":       float(nxt["low"]),
-                "bottom":    float(prev["high"]),
-                "index":     i,
-                "label":     str(mid.get("date", mid.get("time", i))),
-                "mitigated": False,
-            })
-
-        # 이전 저가 > 다음 고가 
-        elif is_bear and prev["low"] > nxt["high"]:
-            result.append({
-                "kind":      "bearish",
-                "top":       float(prev["low"]),
-                "bottom":    float(nxt["high"]),
-                "index":     i,
-                "label":     str(mid.get("date", mid.get("time", i))),
-                "mitigated": False,
-            })
-
-    # top은 최대 bottom은 최소로 확장
-    if join_consecutive and len(result) >= 2:
-        merged: list[dict] = []
-        cur = dict(result[0])
-        for j in range(1, len(result)):
-            nxt_fvg = result[j]
-            # 연속이고 같은 방향이면 병합
-            if (nxt_fvg["kind"] == cur["kind"] and
-                    nxt_fvg["index"] == cur["index"] + 1):
-                cur["top"]    = max(cur["top"],    nxt_fvg["top"])
-                cur["bottom"] = min(cur["bottom"], nxt_fvg["bottom"])
-            else:
-                merged.append(cur)
-                cur = dict(nxt_fvg)
-        merged.append(cur)
-        result = merged
-
-    return result
+    if n < 3:
+        return []
+    o, h, l, c = (col(candles, k) for k in ("open", "high", "low", "close"))
+
+    # 가운데 봉 i (1 ~ n-2) 기준: 이전 고가 < 다음 저가 / 이전 저가 > 다음 고가
+    bull = (c[1:-1] > o[1:-1]) & (h[:-2] < l[2:])
+    bear = (c[1:-1] < o[1:-1]) & (l[:-2] > h[2:])
+
+    # 오버나잇 갭을 FVG로 오인하지 않음
+    days = sessions(candles)
+    if days is not None:
+        same_day = (days[:-2] == days[1:-1]) & (days[1:-1] == days[2:])
+        bull &= same_day
+        bear &= same_day
+
+    idx = np.flatnonzero(bull | bear) + 1
+    if not len(idx):
+        return []
+    up = bull[idx - 1]
+    top = np.where(up, l[idx + 1], l[idx - 1])
+    bottom = np.where(up, h[idx - 1], h[idx + 1])
+
+    # top은 최대 bottom은 최소로 확장 — 연속이고 같은 방향이면 병합, 대표 인덱스는 첫 갭
+    # 병합 기준이 대표 인덱스 + 1 이라 같은 방향 연속 구간은 앞에서부터 2개씩 묶임
+    if join_consecutive and len(idx) >= 2:
+        run = np.ones(len(idx), dtype=bool)
+        run[1:] = (np.diff(idx) != 1) | (up[1:] != up[:-1])
+        first = np.flatnonzero(run)
+        pos = np.arange(len(idx)) - np.repeat(first, np.diff(np.append(first, len(idx))))
+        starts = np.flatnonzero(pos % 2 == 0)
+        top = np.maximum.reduceat(top, starts)
+        bottom = np.minimum.reduceat(bottom, starts)
+        idx, up = idx[starts], up[starts]
+
+    idx = idx.tolist()
+    return [
+        {
+            "kind":      "bullish" if u else "bearish",
+            "top":       t,
+            "bottom":    b,
+            "index":     i,
+            "label":     lb,
+            "mitigated": False,
+        }
+        for i, lb, u, t, b in zip(idx, labels(candles, idx), up.tolist(), top.tolist(), bottom.tolist())
+    ]
 
 # 스윙 고저 탐지 — 전후 swing_length 캔들 대비 극값, 연속 중복 제거
+# 창 최대/최소는 sliding_window_view 로 전 봉 일괄 계산
 def swing(candles: list[dict], swing_length: int = 5) -> list[dict]:
     n     = len(candles)
-    highs = np.array([c["high"] for c in candles], dtype=float)
-    lows  = np.array([c["low"]  for c in candles], dtype=float)
-
-    raw: list[dict] = []
-    for i in range(swing_length, n - swing_length):
-        win_h = highs[i - swing_length: i + swing_length + 1]
-        win_l = lows [i - swing_length: i + swing_length + 1]
-        if highs[i] == win_h.max():
-            raw.append({"index": i, "kind": "high", "level": float(highs[i])})
-        elif lows[i] == win_l.min():
-            raw.append({"index": i, "kind": "low",  "level": float(lows[i])})
+    width = 2 * swing_length + 1
+    if n < width:
+        return []
+    highs = col(candles, "high")
+    lows  = col(candles, "low")
+
+    mid = slice(swing_length, n - swing_length)
+    is_high = highs[mid] == sliding_window_view(highs, width).max(axis=-1)
+    is_low  = ~is_high & (lows[mid] == sliding_window_view(lows, width).min(axis=-1))
+    idx     = np.flatnonzero(is_high | is_low)
+    kinds   = is_high[idx].tolist()
+    levels  = np.where(is_high[idx], highs[idx + swing_length], lows[idx + swing_length]).tolist()
 
     # 연속 같은 방향 -> 더 극단적인 쪽만 유지
     cleaned: list[dict] = []
-    for item in raw:
+    for i, up, level in zip((idx + swing_length).tolist(), kinds, levels):
+        item = {"index": i, "kind": "high" if up else "low", "level": level}
         if cleaned and cleaned[-1]["kind"] == item["kind"]:
             prev = cleaned[-1]
-            if item["kind"] == "high" and item["level"] >= prev["level"]:
+            if up and level >= prev["level"]:
                 cleaned[-1] = item
-            elif item["kind"] == "low" and item["level"] <= prev["level"]:
+            elif not up and level <= prev["level"]:
                 cleaned[-1] = item
         else:
             cleaned.append(item)
 
     return cleaned
 
+# 구간 최소값 희소 테이블 — 레벨 k 는 [i, i + 2^k) 최소값 인덱스 (길이 n - 2^k + 1, 동률은 앞 인덱스)
+def sparse(x: np.ndarray) -> list[np.ndarray]:
+    table = [np.arange(len(x))]
+    step = 1
+    while 2 * step <= len(x):
+        prev = table[-1]
+        a, b = prev[:-step], prev[step:]
+        table.append(np.where(x[b] < x[a], b, a))
+        step *= 2
+    return table
+
+# [start, stop) 구간 최소값 첫 인덱스 — 겹치는 두 블록 비교, 질의당 O(1) (빈 구간 불가)
+def argmin(x: np.ndarray, table: list[np.ndarray], start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    k = np.log2(stop - start).astype(np.int64)
+    a = np.array([table[lv][s] for lv, s in zip(k.tolist(), start.tolist())], dtype=np.int64)
+    b = np.array([table[lv][e - (1 << lv)] for lv, e in zip(k.tolist(), stop.tolist())], dtype=np.int64)
+    return np.where(x[b] < x[a], b, a)
+
+# 각 시작점 이후 x ≤ level 인 첫 인덱스 (없으면 -1)
+# 희소 테이블 위 이진 점프 — 미진입 블록([pos, pos + 2^k) 최소값 > 기준)이면 큰 블록부터 건너뜀, 질의당 O(log n)
+# 질의 수 × 봉 수가 작으면 (질의 × 봉) 비교 행렬 1회가 테이블 구성보다 저렴
+_DENSE = 1 << 16
+
+
+def first(x: np.ndarray, start: np.ndarray, level: np.ndarray, table: list[np.ndarray] | None = None) -> np.ndarray:
+    n = len(x)
+    out = np.full(len(start), -1, dtype=np.int64)
+    sel = np.flatnonzero(start < n)
+    if not len(sel) or not n:
+        return out
+    if table is None and len(sel) * n <= _DENSE:
+        hit = (x <= level[sel, None]) & (np.arange(n) >= start[sel, None])
+        pos = hit.argmax(axis=1)
+        found = hit[np.arange(len(sel)), pos]
+        out[sel[found]] = pos[found]
+        return out
+    table = sparse(x) if table is None else table
+    pos, lvl = start[sel].astype(np.int64), level[sel]
+    for k in range(len(table) - 1, -1, -1):
+        block = table[k]
+        ok = pos < len(block)
+        ok[ok] = x[block[pos[ok]]] > lvl[ok]
+        pos[ok] += 1 << k
+    hit = pos < n
+    hit[hit] = x[pos[hit]] <= lvl[hit]
+    out[sel[hit]] = pos[hit]
+    return out
+
 # OB 탐지 — 스윙 돌파 직전 최저저가(Bullish)/최고고가(Bearish) 캔들, strength=body_ratio
-def obz(candles: list[dict], swing_length: int = 5) -> list[dict]:
-    swings  = swing(candles, swing_length)
+# 돌파 봉은 종가 희소 테이블 점프, OB 캔들은 구간 argmin 테이블 — 스윙 수와 무관하게 O(n log n)
+# swings 전달 시 스윙 재탐지 생략 (분석 메모 공유용)
+def obz(candles: list[dict], swing_length: int = 5, swings: list[dict] | None = None) -> list[dict]:
+    if swings is None:
+        swings = swing(candles, swing_length)
     n       = len(candles)
-    result: list[dict] = []
-    crossed: set[int]  = set()
-
-    # Bullish OB: 스윙 고가 돌파
-    for sh in (s for s in swings if s["kind"] == "high"):
-        hi     = sh["index"]
-        sh_lvl = sh["level"]
-        if hi in crossed:
+    if not swings:
+        return []
+    o, h, l, c = (col(candles, k) for k in ("open", "high", "low", "close"))
+    days = sessions(candles)
+
+    picks = []
+    # Bullish OB: 스윙 고가 돌파 (종가 > 레벨), hi+1 ~ j-1 구간에서 최저 저가 캔들
+    # Bearish OB: 스윙 저가 하향 돌파 (종가 < 레벨), li+1 ~ j-1 구간에서 최고 고가 캔들
+    for kind, swing_kind, x, ext in (("bullish", "high", -c, l), ("bearish", "low", c, -h)):
+        pts = [s for s in swings if s["kind"] == swing_kind]
+        if not pts:
             continue
-
-        for j in range(hi + 1, n):
-            if candles[j]["close"] > sh_lvl:
-                crossed.add(hi)
-                # hi+1 ~ j-1 구간에서 최저 저가 캔들 선택
-                seg = candles[hi + 1: j] or [candles[j - 1]]
-                ob_c = min(seg, key=lambda c: c["low"])
-                ob_i = hi + 1 + seg.index(ob_c)
-
-                # 분봉: 동일 세션 체크
-                if "time" in ob_c:
-                    if not same(ob_c["time"], candles[j]["time"]):
-                        break
-
-                result.append({
-                    "kind":      "bullish",
-                    "top":       float(ob_c["high"]),
-                    "bottom":    float(ob_c["low"]),
-                    "index":     ob_i,
-                    "label":     str(ob_c.get("date", ob_c.get("time", ob_i))),
-                    "strength":  abs(body(ob_c)),
-                    "mitigated": False,
-                })
-                break
-
-    # Bearish OB: 스윙 저가 하향 돌파
-    for sl in (s for s in swings if s["kind"] == "low"):
-        li     = sl["index"]
-        sl_lvl = sl["level"]
-        if li in crossed:
+        start = np.array([s["index"] + 1 for s in pts], dtype=np.int64)
+        level = np.array([s["level"] for s in pts], dtype=np.float64)
+        # 엄격 부등호(종가 > 레벨 / 종가 < 레벨) → 바로 아래 부동소수 이하 판정
+        bound = np.nextafter(-level if kind == "bullish" else level, -np.inf)
+        j = first(x, start, bound)
+        found = j >= 0
+        start, j = start[found], j[found]
+        if not len(j):
             continue
+        # 빈 구간이면 j-1 캔들, 인덱스는 start
+        src = j - 1
+        idx = start.copy()
+        wide = j > start
+        if wide.any():
+            src[wide] = argmin(ext, sparse(ext), start[wide], j[wide])
+            idx[wide] = src[wide]
+        # 분봉: 동일 세션 체크
+        keep = days[src] == days[j] if days is not None else np.ones(len(j), dtype=bool)
+        picks.append((kind, src[keep], idx[keep]))
 
-        for j in range(li + 1, n):
-            if candles[j]["close"] < sl_lvl:
-                crossed.add(li)
-                # li+1 ~ j-1 구간에서 최고 고가 캔들 선택
-                seg = candles[li + 1: j] or [candles[j - 1]]
-                ob_c = max(seg, key=lambda c: c["high"])
-                ob_i = li + 1 + seg.index(ob_c)
-
-                if "time" in ob_c:
-                    if not same(ob_c["time"], candles[j]["time"]):
-                        break
-
-                result.append({
-                    "kind":      "bearish",
-                    "top":       float(ob_c["high"]),
-                    "bottom":    float(ob_c["low"]),
-                    "index":     ob_i,
-                    "label":     str(ob_c.get("date", ob_c.get("time", ob_i))),
-                    "strength":  abs(body(ob_c)),
-                    "mitigated": False,
-                })
-                break
+    result: list[dict] = []
+    for kind, src, idx in picks:
+        src = src.tolist()
+        for s, i, lb in zip(src, idx.tolist(), labels(candles, src)):
+            hi, lo, op, cl = float(h[s]), float(l[s]), float(o[s]), float(c[s])
+            rng = hi - lo
+            result.append({
+                "kind":      kind,
+                "top":       hi,
+                "bottom":    lo,
+                "index":     i,
+                "label":     lb,
+                "strength":  abs((cl - op) / rng) if rng else 0.0,
+                "mitigated": False,
+            })
 
     return result
 
 # BOS/CHoCH 탐지 — 마지막 4개 스윙 패턴으로 추세 지속(BOS)/전환(CHoCH) 판단
-def bos(candles: list[dict], swing_length: int = 5) -> dict:
-    swings = swing(candles, swing_length)
+# swings 전달 시 스윙 재탐지 생략 (증분 추적기 공유용)
+def bos(candles: list[dict], swing_length: int = 5, swings: list[dict] | None = None) -> dict:
+    if swings is None:
+        swings = analysis(candles).swings if swing_length == 5 else swing(candles, swing_length)
     if len(swings) < 4:
         return {"bos": 0, "choch": 0, "level": 0.0}
 
@@ -228,19 +294,31 @@ def mitigate(zones: list[dict], price: float) -> None:
 def livez(zones: list[dict]) -> list[dict]:
     return [z for z in zones if not z["mitigated"]]
 
+# 구간별 첫 mitigation 봉 인덱스 (없으면 -1) — 형성 봉 index+2 부터 탐색
+# Bullish: 저가 ≤ top, Bearish: 고가 ≥ bottom (부호 반전해 같은 최소값 테이블로 판정), 전체 구간 한 번에 배열 연산
+def mitigation(candles: list[dict], zones: list[dict]) -> np.ndarray:
+    out = np.full(len(zones), -1, dtype=np.int64)
+    if not zones or not len(candles):
+        return out
+    bull = np.array([z["kind"] == "bullish" for z in zones])
+    bear = np.array([z["kind"] == "bearish" for z in zones])
+    start = np.array([z["index"] + 2 for z in zones], dtype=np.int64)
+    level = np.array([z["top"] if b else -z["bottom"] for z, b in zip(zones, bull)], dtype=np.float64)
+    for mask, x in ((bull, col(candles, "low")), (bear, -col(candles, "high"))):
+        sel = np.flatnonzero(mask)
+        if len(sel):
+            out[sel] = first(x, start[sel], level[sel])
+    return out
+
 # 형성 이후 캔들이 구간을 건드리면 mitigated 마킹 (히스토리 리플레이)
 # Bullish: 이후 저가가 top 이하로 진입 / Bearish: 이후 고가가 bottom 이상으로 진입
 def sweep(candles: list[dict], zones: list[dict]) -> None:
-    for z in zones:
-        if z["mitigated"]:
-            continue
-        for c in candles[z["index"] + 2:]:
-            if z["kind"] == "bullish" and c["low"] <= z["top"]:
-                z["mitigated"] = True
-                break
-            if z["kind"] == "bearish" and c["high"] >= z["bottom"]:
-                z["mitigated"] = True
-                break
+    live = [z for z in zones if not z["mitigated"]]
+    if not live:
+        return
+    for z, at in zip(live, mitigation(candles, live).tolist()):
+        if at >= 0:
+            z["mitigated"] = True
 
 # 현재가 가장 근접 미완화 구간
 def near(zones: list[dict], price: float) -> dict | None:
@@ -249,11 +327,77 @@ def near(zones: list[dict], price: float) -> dict | None:
         return None
     return min(active, key=lambda z: abs(price - (z["top"] + z["bottom"]) / 2))
 
+# 캔들 시계열 1개의 SMC 분석 — FVG/OB(sweep 완료)/스윙을 처음 요청될 때 1회 계산
+# 구간 dict 는 같은 시계열을 읽는 모든 팩터가 공유하므로 읽기 전용
+class SmcAnalysis:
+    __slots__ = ("candles", "_fvgs", "_obs", "_swings")
+
+    def __init__(self, candles: list[dict]) -> None:
+        self.candles = candles
+        self._fvgs: list[dict] | None = None
+        self._obs: list[dict] | None = None
+        self._swings: list[dict] | None = None
+
+    @property
+    def swings(self) -> list[dict]:
+        if self._swings is None:
+            self._swings = swing(self.candles)
+        return self._swings
+
+    @property
+    def fvgs(self) -> list[dict]:
+        if self._fvgs is None:
+            zones = fvgz(self.candles)
+            sweep(self.candles, zones)
+            self._fvgs = zones
+        return self._fvgs
+
+    @property
+    def obs(self) -> list[dict]:
+        if self._obs is None:
+            zones = obz(self.candles, swings=self.swings)
+            sweep(self.candles, zones)
+            self._obs = zones
+        return self._obs
+
+
+# 시계열별 분석 메모 — (객체 id, 길이, 마지막 봉 시각) 키, 최근 _MEMO_SIZE 개 유지
+# 항목이 캔들 객체를 참조하므로 살아 있는 동안 id 재사용 없음, 제자리 추가는 길이/시각으로 구분
+_MEMO_SIZE = 64
+_memo: OrderedDict[tuple, SmcAnalysis] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+# 마지막 봉 시각 (없으면 None)
+def tail(candles):
+    if not len(candles):
+        return None
+    if isinstance(candles, CandleFrame):
+        return int(candles.ts[-1]) if candles.key else None
+    last = candles[-1]
+    return last.get("time", last.get("date"))
+
+
+# 캔들 시계열의 공유 분석 (메모 적중 시 재사용)
+def analysis(candles: list[dict]) -> SmcAnalysis:
+    key = (id(candles), len(candles), tail(candles))
+    with _memo_lock:
+        hit = _memo.get(key)
+        if hit is not None and hit.candles is candles:
+            _memo.move_to_end(key)
+            return hit
+        hit = SmcAnalysis(candles)
+        _memo[key] = hit
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+        return hit
+
 # FVG 근접도 점수 (-8~+8) — Bullish 내부/근접 양수, Bearish 음수
-def fvg(candles: list[dict], price: float) -> tuple[float, str]:
-    fvgs = fvgz(candles)
-    sweep(candles, fvgs)
-    z    = near(fvgs, price)
+# zones 전달 시 sweep 완료된 FVG 목록을 그대로 사용, 없으면 시계열 공유 분석
+def fvg(candles: list[dict], price: float, zones: list[dict] | None = None) -> tuple[float, str]:
+    if zones is None:
+        zones = analysis(candles).fvgs
+    z    = near(zones, price)
     if z is None:
         return 0.0, "FVG 없음"
 
@@ -280,10 +424,10 @@ def fvg(candles: list[dict], price: float) -> tuple[float, str]:
 
 
 # OB 지지/저항 점수 (-7~+7) — strength(body_ratio) 가중, Bullish 양수, Bearish 음수
-def ob(candles: list[dict], price: float) -> tuple[float, str]:
-    obs = obz(candles)
-    sweep(candles, obs)
-    z   = near(obs, price)
+def ob(candles: list[dict], price: float, zones: list[dict] | None = None) -> tuple[float, str]:
+    if zones is None:
+        zones = analysis(candles).obs
+    z   = near(zones, price)
     if z is None:
         return 0.0, "Order Block 없음"
 
@@ -312,8 +456,8 @@ def ob(candles: list[dict], price: float) -> tuple[float, str]:
 
 
 # BOS/CHoCH 구조 점수 (-5~+5) — BOS 추세 지속, CHoCH 전환 경고
-def struct(candles: list[dict]) -> tuple[float, str]:
-    sb = bos(candles)
+def struct(candles: list[dict], swings: list[dict] | None = None) -> tuple[float, str]:
+    sb = bos(candles, swings=swings)
 
     if sb["bos"] == 1:
         return 5.0, f"Bullish BOS 확인 (레벨 {sb['level']:,.0f})"
@@ -326,12 +470,14 @@ def struct(candles: list[dict]) -> tuple[float, str]:
     return 0.0, "구조 중립"
 
 # 분봉 FVG 점수 — 15분봉에서 최신 미완화 FVG 지지/저항 점수 + 존 반환
-def fvgin(candles_15m: list[dict], price: float) -> tuple[float, str, dict | None]:
+def fvgin(
+    candles_15m: list[dict], price: float, zones: list[dict] | None = None,
+) -> tuple[float, str, dict | None]:
     if len(candles_15m) < 5:
         return 0.0, "분봉 데이터 부족", None
-    fvgs = fvgz(candles_15m)
-    sweep(candles_15m, fvgs)
-    active = livez(fvgs)
+    if zones is None:
+        zones = analysis(candles_15m).fvgs
+    active = livez(zones)
     if not active:
         return 0.0, "분봉 FVG 없음", None
     z = min(active, key=lambda z: abs(price - (z["top"] + z["bottom"]) / 2))
@@ -356,26 +502,23 @@ def fvgin(candles_15m: list[dict], price: float) -> tuple[float, str, dict | Non
 
 
 # FVG 기반 구조적 손절가 — 가장 가까운 Bullish FVG 하단 (지지선)
-def stop(candles: list[dict], price: float) -> float | None:
-    fvgs = fvgz(candles)
-    sweep(candles, fvgs)
-    bull_below = [z for z in livez(fvgs)
+def stop(candles: list[dict], price: float, zones: list[dict] | None = None) -> float | None:
+    if zones is None:
+        zones = analysis(candles).fvgs
+    bull_below = [z for z in livez(zones)
                   if z["kind"] == "bullish" and z["bottom"] < price]
     if not bull_below:
         return None
     return float(max(bull_below, key=lambda z: z["bottom"])["bottom"])
 
 
-# SMC 전체 분석 요약 — fvg/ob/str 점수 + active 구간 수
+# SMC 전체 분석 요약 — fvg/ob/str 점수 + active 구간 수 (FVG/OB/스윙 각 1회 계산)
 def scan(candles: list[dict], price: float) -> dict:
-    fvg_s, fvg_r = fvg(candles, price)
-    ob_s,  ob_r  = ob(candles, price)
-    str_s, str_r = struct(candles)
-
-    fvgs = fvgz(candles)
-    obs  = obz(candles)
-    sweep(candles, fvgs)
-    sweep(candles, obs)
+    a = analysis(candles)
+    fvgs, obs = a.fvgs, a.obs
+    fvg_s, fvg_r = fvg(candles, price, fvgs)
+    ob_s,  ob_r  = ob(candles, price, obs)
+    str_s, str_r = struct(candles, a.swings)
 
     return {
         "fvg_score":   round(fvg_s, 1),
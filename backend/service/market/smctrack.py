@@ -0,0 +1,301 @@
+# SMC 증분 추적 — 확정 봉 1개마다 FVG/OB/스윙/mitigation 상태 전진 (smc.fvgz/obz/swing + sweep 결과와 동일)
+# 조회(fvg/ob/fvgin/struct/stop)는 유지 중인 미완화 구간만 사용 — 전체 히스토리 재계산 없음
+# 완화된 구간은 바로 폐기, keep 지정 시 최근 keep 봉 밖의 봉/구간/대기 스윙도 폐기 (인덱스는 전체 기준 유지)
+import heapq
+
+from service.market import smc
+
+
+# FVG 증분 추적 — smc.fvgz(join_consecutive=True) + smc.sweep 결과를 봉마다 유지
+class FvgTrack:
+    def __init__(self) -> None:
+        self.candles: list[dict] = []
+        # candles[0] 의 전체 인덱스 (앞부분 폐기 시 증가)
+        self.base = 0
+        # 병합 판정용 직전 구간
+        self.last: dict | None = None
+        self.live: list[dict] = []
+
+    # 봉 1개 반영 — 신규 갭 탐지/병합 후 미완화 구간 mitigation 갱신
+    def push(self, c: dict) -> None:
+        self.candles.append(c)
+        m = self.base + len(self.candles) - 1
+        if m >= 2:
+            self.gap(m - 1)
+        hit = False
+        for z in self.live:
+            if z["index"] + 2 > m:
+                continue
+            if z["kind"] == "bullish" and c["low"] <= z["top"]:
+                z["mitigated"] = True
+                hit = True
+            elif z["kind"] == "bearish" and c["high"] >= z["bottom"]:
+                z["mitigated"] = True
+                hit = True
+        if hit:
+            self.live = smc.livez(self.live)
+
+    # i 번째 봉 중심 3캔들 갭 판정 (fvgz 루프 본문과 동일)
+    def gap(self, i: int) -> None:
+        k = i - self.base
+        prev, mid, nxt = self.candles[k - 1], self.candles[k], self.candles[k + 1]
+        if "time" in mid:
+            if not (smc.same(prev["time"], mid["time"]) and
+                    smc.same(mid["time"], nxt["time"])):
+                return
+        if mid["close"] > mid["open"] and prev["high"] < nxt["low"]:
+            kind, top, bottom = "bullish", float(nxt["low"]), float(prev["high"])
+        elif mid["close"] < mid["open"] and prev["low"] > nxt["high"]:
+            kind, top, bottom = "bearish", float(prev["low"]), float(nxt["high"])
+        else:
+            return
+
+        # fvgz 병합 규칙 — 직전 구간의 시작 index + 1 과 같은 방향일 때만 확장
+        # (형성 이후 재검사 대상 봉은 현재 봉뿐 — push 에서 처리)
+        cur = self.last
+        if cur is not None and cur["kind"] == kind and cur["index"] + 1 == i:
+            cur["top"]    = max(cur["top"], top)
+            cur["bottom"] = min(cur["bottom"], bottom)
+            return
+
+        z = {
+            "kind":      kind,
+            "top":       top,
+            "bottom":    bottom,
+            "index":     i,
+            "label":     str(mid.get("date", mid.get("time", i))),
+            "mitigated": False,
+        }
+        self.last = z
+        self.live.append(z)
+
+    # 전체 인덱스 start 이전 봉/구간 폐기 (병합 판정용 직전 구간은 유지)
+    def cut(self, start: int) -> None:
+        del self.candles[: max(0, start - self.base)]
+        self.base = max(self.base, start)
+        self.live = [z for z in self.live if z["index"] >= start]
+
+
+# 스윙 증분 추적 — smc.swing 의 윈도 극값 판정 + 연속 중복 제거를 봉마다 유지
+class SwingTrack:
+    def __init__(self, swing_length: int = 5) -> None:
+        self.swing_length = swing_length
+        self.highs: list[float] = []
+        self.lows: list[float] = []
+        # highs[0] 의 전체 인덱스 (앞부분 폐기 시 증가)
+        self.base = 0
+        self.swings: list[dict] = []
+
+    # 봉 1개 반영 — 전후 swing_length 가 확정된 index 1개를 판정
+    # 반환: (새로 목록에 들어간 스윙, 그 때문에 빠진 스윙) — 변화 없으면 (None, None)
+    def push(self, c: dict) -> tuple[dict | None, dict | None]:
+        self.highs.append(float(c["high"]))
+        self.lows.append(float(c["low"]))
+        k = self.swing_length
+        j = len(self.highs) - 1 - k
+        i = self.base + j
+        if i < k:
+            return None, None
+        if self.highs[j] == max(self.highs[j - k: j + k + 1]):
+            item = {"index": i, "kind": "high", "level": self.highs[j]}
+        elif self.lows[j] == min(self.lows[j - k: j + k + 1]):
+            item = {"index": i, "kind": "low", "level": self.lows[j]}
+        else:
+            return None, None
+        if self.swings and self.swings[-1]["kind"] == item["kind"]:
+            prev = self.swings[-1]
+            if item["kind"] == "high" and item["level"] >= prev["level"]:
+                self.swings[-1] = item
+                return item, prev
+            elif item["kind"] == "low" and item["level"] <= prev["level"]:
+                self.swings[-1] = item
+                return item, prev
+            return None, None
+        self.swings.append(item)
+        return item, None
+
+    # 전체 인덱스 start 이전 값/스윙 폐기 — 판정 창(전후 swing_length) 과 구조 판정용 마지막 4개 스윙은 유지
+    def cut(self, start: int) -> None:
+        start = min(start, self.base + len(self.highs) - 2 * self.swing_length - 1)
+        if start <= self.base:
+            return
+        del self.highs[: start - self.base]
+        del self.lows[: start - self.base]
+        self.base = start
+        old = sum(1 for s in self.swings if s["index"] < start)
+        del self.swings[: max(0, min(old, len(self.swings) - 4))]
+
+
+# OB 증분 추적 — smc.obz + smc.sweep 결과를 봉마다 유지
+# 미돌파 스윙은 레벨 힙에 대기 (고가 스윙: 최소 레벨부터, 저가 스윙: 최대 레벨부터) → 봉당 돌파분만 처리
+# mitigation 은 미완화 구간만 봉마다 검사, 완화된 구간은 폐기
+# candles 는 FvgTrack 과 공유 — base 는 candles[0] 의 전체 인덱스
+class ObTrack:
+    def __init__(self, candles: list[dict]) -> None:
+        self.candles = candles
+        self.base = 0
+        self.pending: dict[int, dict] = {}
+        self.alive: dict[int, str] = {}
+        self._up: list[tuple[float, int]] = []
+        self._down: list[tuple[float, int]] = []
+
+    # 봉 m 반영 — 기존 구간 mitigation 후 대기 스윙 돌파 판정
+    def push(self, m: int) -> None:
+        c = self.bar(m)
+        hit = []
+        for i, z in self.pending.items():
+            if z["index"] + 2 > m:
+                continue
+            if z["kind"] == "bullish" and c["low"] <= z["top"] or z["kind"] == "bearish" and c["high"] >= z["bottom"]:
+                z["mitigated"] = True
+                hit.append(i)
+        for i in hit:
+            del self.pending[i]
+        close = c["close"]
+        while self._up and close > self._up[0][0]:
+            _, i = heapq.heappop(self._up)
+            if self.alive.get(i) == "high":
+                self.make("bullish", i, m)
+        while self._down and close < -self._down[0][0]:
+            _, i = heapq.heappop(self._down)
+            if self.alive.get(i) == "low":
+                self.make("bearish", i, m)
+
+    # 새 스윙 확정 (봉 m 시점) — 이미 지난 봉 중 돌파가 있으면 바로 OB, 없으면 대기
+    def add(self, s: dict, m: int) -> None:
+        i, level = s["index"], s["level"]
+        self.alive[i] = s["kind"]
+        up = s["kind"] == "high"
+        for j in range(i + 1, m + 1):
+            close = self.bar(j)["close"]
+            if (close > level) if up else (close < level):
+                self.make("bullish" if up else "bearish", i, j)
+                return
+        heapq.heappush(self._up if up else self._down, (level, i) if up else (-level, i))
+
+    # 스윙이 더 극단적인 같은 방향 스윙으로 대체됨 → 해당 OB 제거
+    def drop(self, s: dict) -> None:
+        self.alive.pop(s["index"], None)
+        self.pending.pop(s["index"], None)
+
+    # 전체 인덱스 k 봉
+    def bar(self, k: int) -> dict:
+        return self.candles[k - self.base]
+
+    # 전체 인덱스 start 이전 스윙/구간 폐기 (봉 목록은 공유 소유자가 자름)
+    def cut(self, start: int) -> None:
+        self.base = start
+        self.alive = {i: kind for i, kind in self.alive.items() if i >= start}
+        self.pending = {i: z for i, z in self.pending.items() if i >= start}
+        self._up = [e for e in self._up if e[1] in self.alive]
+        self._down = [e for e in self._down if e[1] in self.alive]
+        heapq.heapify(self._up)
+        heapq.heapify(self._down)
+
+    # 스윙 i 의 돌파 봉 j → OB 구간 (start ~ j-1 최저저가/최고고가 캔들, 빈 구간이면 j-1 캔들·인덱스 start)
+    def make(self, kind: str, i: int, j: int) -> None:
+        bar, start = self.bar, i + 1
+        if j > start:
+            if kind == "bullish":
+                src = min(range(start, j), key=lambda k: bar(k)["low"])
+            else:
+                src = max(range(start, j), key=lambda k: bar(k)["high"])
+            idx = src
+        else:
+            src, idx = j - 1, start
+        c = bar(src)
+        # 분봉: 동일 세션 체크
+        if "time" in c and not smc.same(c["time"], bar(j)["time"]):
+            return
+        hi, lo = float(c["high"]), float(c["low"])
+        rng = hi - lo
+        z = {
+            "kind":      kind,
+            "top":       hi,
+            "bottom":    lo,
+            "index":     idx,
+            "label":     str(c.get("date", c.get("time", src))),
+            "strength":  abs((float(c["close"]) - float(c["open"])) / rng) if rng else 0.0,
+            "mitigated": False,
+        }
+        # 형성 이후 지난 봉으로 mitigation 리플레이
+        for k in range(idx + 2, self.base + len(self.candles)):
+            if kind == "bullish" and bar(k)["low"] <= hi or kind == "bearish" and bar(k)["high"] >= lo:
+                return
+        self.pending[i] = z
+
+    # 미완화 구간만 (obz 순서)
+    @property
+    def live(self) -> list[dict]:
+        return [self.pending[i] for i in sorted(self.pending, key=lambda i: (self.alive[i] != "high", i))]
+
+
+# 종목·봉 주기별 SMC 상태 — 확정 봉만 push, 점수 조회는 유지 중인 구간으로 계산
+# keep: 유지할 최근 봉 수 (None 이면 전체 — 백테스트처럼 입력 길이가 정해진 경우), 봉 목록이 2배가 되면 정리
+class SmcTracker:
+    def __init__(self, swing_length: int = 5, keep: int | None = None) -> None:
+        self.keep = keep if keep is None else max(keep, 2 * swing_length + 3)
+        self.fvg_track = FvgTrack()
+        self.swing_track = SwingTrack(swing_length)
+        self.ob_track = ObTrack(self.fvg_track.candles)
+
+    # 캔들 목록으로 초기화
+    @classmethod
+    def of(cls, candles: list[dict], swing_length: int = 5, keep: int | None = None) -> "SmcTracker":
+        tracker = cls(swing_length, keep)
+        for c in candles:
+            tracker.push(c)
+        return tracker
+
+    @property
+    def candles(self) -> list[dict]:
+        return self.fvg_track.candles
+
+    @property
+    def swings(self) -> list[dict]:
+        return self.swing_track.swings
+
+    @property
+    def fvgs(self) -> list[dict]:
+        return self.fvg_track.live
+
+    @property
+    def obs(self) -> list[dict]:
+        return self.ob_track.live
+
+    # 확정 봉 1개 반영
+    def push(self, c: dict) -> None:
+        self.fvg_track.push(c)
+        m = self.fvg_track.base + len(self.candles) - 1
+        self.ob_track.push(m)
+        added, dropped = self.swing_track.push(c)
+        if dropped is not None:
+            self.ob_track.drop(dropped)
+        if added is not None:
+            self.ob_track.add(added, m)
+        if self.keep is not None and len(self.candles) >= 2 * self.keep:
+            self.cut(m + 1 - self.keep)
+
+    # 전체 인덱스 start 이전 봉/구간/대기 스윙 폐기
+    def cut(self, start: int) -> None:
+        self.fvg_track.cut(start)
+        self.ob_track.cut(start)
+        self.swing_track.cut(start)
+
+    def fvg(self, price: float) -> tuple[float, str]:
+        return smc.fvg(self.candles, price, self.fvgs)
+
+    def ob(self, price: float) -> tuple[float, str]:
+        return smc.ob(self.candles, price, self.obs)
+
+    def fvgin(self, price: float) -> tuple[float, str, dict | None]:
+        return smc.fvgin(self.candles, price, self.fvgs)
+
+    def struct(self) -> tuple[float, str]:
+        return smc.struct(self.candles, self.swings)
+
+    def bos(self) -> dict:
+        return smc.bos(self.candles, swings=self.swings)
+
+    def stop(self, price: float) -> float | None:
+        return smc.stop(self.candles, price, self.fvgs)
@@ -0,0 +1,299 @@
+# 스트리밍 지표 — 봉/틱 1개당 O(1) 갱신 상태 (EMA, MACD, Wilder RSI, 볼린저, ATR, VWAP)
+# push(확정 봉)는 상태 전진, peek(형성 중 봉)은 상태 변경 없이 잠정 값만 계산
+# EMA/MACD/RSI 는 indicators.emas/macds/rsis 와 같은 계수·연산 순서 (확정 봉 기준 값 동일)
+import datetime
+import math
+from collections import deque
+
+import numpy as np
+
+
+# 지수이동평균 — 첫 값으로 시작
+class Ema:
+    def __init__(self, period: int) -> None:
+        self.k = 2.0 / (period + 1)
+        self.value: float | None = None
+
+    def push(self, x: float) -> float:
+        self.value = self.peek(x)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        if self.value is None:
+            return float(x)
+        return x * self.k + self.value * (1 - self.k)
+
+
+# MACD — 선 = EMA(fast) - EMA(slow), 시그널은 slow 번째 봉부터 EMA(signal)
+class Macd:
+    def __init__(self, fast: int = 12, slow: int = 26, signal_period: int = 9) -> None:
+        self.slow = slow
+        self.signal_period = signal_period
+        self.fast_ema = Ema(fast)
+        self.slow_ema = Ema(slow)
+        self.signal = Ema(signal_period)
+        self.line: float | None = None
+        self.n = 0
+
+    def push(self, x: float) -> None:
+        self.line = self.fast_ema.push(x) - self.slow_ema.push(x)
+        self.n += 1
+        if self.n >= self.slow:
+            self.signal.push(self.line)
+
+    # (선, 시그널) — 시그널 미형성이면 None
+    def peek(self, x: float) -> tuple[float, float | None]:
+        line = self.fast_ema.peek(x) - self.slow_ema.peek(x)
+        if self.n + 1 < self.slow:
+            return line, None
+        return line, self.signal.peek(line)
+
+    # indicators.macd 와 같은 유효 조건 (slow + signal 봉 이상)
+    def view(self, line: float | None = None, sig: float | None = None, n: int | None = None) -> dict | None:
+        line = self.line if line is None else line
+        sig = self.signal.value if sig is None else sig
+        n = self.n if n is None else n
+        if n < self.slow + self.signal_period or line is None or sig is None:
+            return None
+        return {"macd": round(line, 2), "signal": round(sig, 2), "histogram": round(line - sig, 2)}
+
+
+# Wilder RSI — 첫 period 개 변화량 단순평균 후 Wilder 평활
+class Rsi:
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.prev: float | None = None
+        self.seed: list[tuple[float, float]] = []
+        self.avg_g: float | None = None
+        self.avg_l: float | None = None
+
+    # (평균상승, 평균하락) 다음 상태 — 초기 구간이면 None
+    def step(self, x: float) -> tuple[float, float] | None:
+        delta = x - self.prev
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        p = self.period
+        if self.avg_g is None:
+            if len(self.seed) + 1 < p:
+                return None
+            pairs = self.seed + [(gain, loss)]
+            return float(np.mean([g for g, _ in pairs])), float(np.mean([l for _, l in pairs]))
+        return (
+            gain * (1.0 / p) + self.avg_g * ((p - 1) / p),
+            loss * (1.0 / p) + self.avg_l * ((p - 1) / p),
+        )
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        if self.prev is not None:
+            nxt = self.step(x)
+            if nxt is None:
+                delta = x - self.prev
+                self.seed.append((delta if delta > 0 else 0.0, -delta if delta < 0 else 0.0))
+            else:
+                self.avg_g, self.avg_l = nxt
+                self.seed = []
+        self.prev = x
+
+    def peek(self, x: float) -> float | None:
+        if self.prev is None:
+            return None
+        return rsival(self.step(float(x)))
+
+    @property
+    def value(self) -> float | None:
+        if self.avg_g is None:
+            return None
+        return rsival((self.avg_g, self.avg_l))
+
+
+def rsival(avg: tuple[float, float] | None) -> float | None:
+    if avg is None:
+        return None
+    g, l = avg
+    if l == 0:
+        return 100.0
+    return round(100 - 100 / (1 + g / l), 2)
+
+
+# 볼린저밴드 — 최근 period 개 누적합/제곱합 (기준값 차감으로 자릿수 손실 완화)
+# 창이 한 바퀴 돌 때마다 기준값을 창 평균으로 옮기고 합을 창에서 다시 계산 — 가격 수준 이동/장기 누적 오차 제거 (봉당 O(1) 상각)
+class Boll:
+    def __init__(self, period: int = 20, std_dev: float = 2.0) -> None:
+        self.period = period
+        self.std_dev = std_dev
+        self.win: deque[float] = deque()
+        self.base: float | None = None
+        self.s1 = 0.0
+        self.s2 = 0.0
+        self.since = 0
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        if self.base is None:
+            self.base = x
+        if len(self.win) == self.period:
+            old = self.win.popleft() - self.base
+            self.s1 -= old
+            self.s2 -= old * old
+        d = x - self.base
+        self.win.append(x)
+        self.s1 += d
+        self.s2 += d * d
+        self.since += 1
+        if self.since >= self.period:
+            self.rebase()
+
+    # 기준값 = 창 평균, 누적합/제곱합 재계산
+    def rebase(self) -> None:
+        self.base = math.fsum(self.win) / len(self.win)
+        devs = [v - self.base for v in self.win]
+        self.s1 = math.fsum(devs)
+        self.s2 = math.fsum(d * d for d in devs)
+        self.since = 0
+
+    # 상태(또는 x 반영 잠정 상태) 기준 밴드 — 창 미충족이면 None
+    def view(self, x: float | None = None) -> dict | None:
+        n, s1, s2 = len(self.win), self.s1, self.s2
+        last = self.win[-1] if self.win else None
+        if x is not None:
+            x = float(x)
+            base = x if self.base is None else self.base
+            if n == self.period:
+                old = self.win[0] - base
+                s1, s2, n = s1 - old, s2 - old * old, n - 1
+            d = x - base
+            s1, s2, n, last = s1 + d, s2 + d * d, n + 1, x
+        else:
+            base = self.base
+        if n < self.period:
+            return None
+        mean = s1 / n
+        sd = math.sqrt(max(s2 / n - mean * mean, 0.0))
+        mid = base + mean
+        return {
+            "upper":         round(mid + self.std_dev * sd, 2),
+            "middle":        round(mid, 2),
+            "lower":         round(mid - self.std_dev * sd, 2),
+            "current_price": float(last),
+        }
+
+
+# ATR — 최근 period 개 True Range 단순평균 (indicators.atr 와 같은 정의)
+class Atr:
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.prev: float | None = None
+        self.win: deque[float] = deque()
+        self.total = 0.0
+
+    @staticmethod
+    def tr(high: float, low: float, prev: float) -> float:
+        return max(high - low, abs(high - prev), abs(low - prev))
+
+    def push(self, high: float, low: float, close: float) -> None:
+        if self.prev is not None:
+            tr = self.tr(float(high), float(low), self.prev)
+            if len(self.win) == self.period:
+                self.total -= self.win.popleft()
+            self.win.append(tr)
+            self.total += tr
+        self.prev = float(close)
+
+    @property
+    def value(self) -> float | None:
+        if len(self.win) < self.period:
+            return None
+        return round(self.total / self.period, 2)
+
+    def peek(self, high: float, low: float) -> float | None:
+        if self.prev is None:
+            return None
+        tr = self.tr(float(high), float(low), self.prev)
+        total, n = self.total + tr, len(self.win) + 1
+        if n > self.period:
+            total -= self.win[0]
+            n -= 1
+        if n < self.period:
+            return None
+        return round(total / self.period, 2)
+
+
+# 세션 VWAP — 틱 가격 × 체결량 누적, 날짜가 바뀌면 초기화
+class Vwap:
+    def __init__(self) -> None:
+        self.day: datetime.date | None = None
+        self.pv = 0.0
+        self.vol = 0
+
+    def push(self, price: float, volume: int, ts: datetime.datetime) -> None:
+        if ts.date() != self.day:
+            self.day, self.pv, self.vol = ts.date(), 0.0, 0
+        self.pv += float(price) * volume
+        self.vol += volume
+
+    @property
+    def value(self) -> float | None:
+        return round(self.pv / self.vol, 2) if self.vol else None
+
+
+# 봉 시각 → ISO 문자열 (JSON 전송용)
+def stamp(value) -> str:
+    return value.isoformat() if isinstance(value, datetime.datetime) else str(value)
+
+
+# 종목·봉 주기별 지표 묶음 — 확정 봉은 push, 형성 중 봉은 view(forming) 잠정 값
+class Live:
+    def __init__(self) -> None:
+        self.ema20 = Ema(20)
+        self.macd = Macd()
+        self.rsi = Rsi()
+        self.boll = Boll()
+        self.atr = Atr()
+        self.vwap = Vwap()
+        self.bars = 0
+        self.last: dict | None = None
+
+    # 확정 봉 1개 반영
+    def push(self, c: dict) -> None:
+        close = float(c["close"])
+        self.ema20.push(close)
+        self.macd.push(close)
+        self.rsi.push(close)
+        self.boll.push(close)
+        self.atr.push(c["high"], c["low"], close)
+        self.bars += 1
+        self.last = c
+
+    # 틱 반영 (VWAP)
+    def tick(self, price: float, volume: int, ts: datetime.datetime) -> None:
+        self.vwap.push(price, volume, ts)
+
+    # 현재 값 — forming 이 있으면 형성 중 봉까지 포함한 잠정 값
+    def view(self, forming: dict | None = None) -> dict:
+        if forming is None:
+            ema = self.ema20.value
+            return {
+                "bars":      self.bars,
+                "time":      stamp(self.last["time"]) if self.last else None,
+                "ema20":     round(ema, 2) if ema is not None else None,
+                "rsi":       self.rsi.value,
+                "macd":      self.macd.view(),
+                "bollinger": self.boll.view(),
+                "atr":       self.atr.value,
+                "vwap":      self.vwap.value,
+                "provisional": False,
+            }
+        close = float(forming["close"])
+        line, sig = self.macd.peek(close)
+        return {
+            "bars":      self.bars + 1,
+            "time":      stamp(forming["time"]),
+            "ema20":     round(self.ema20.peek(close), 2),
+            "rsi":       self.rsi.peek(close),
+            "macd":      self.macd.view(line, sig, self.macd.n + 1),
+            "bollinger": self.boll.view(close),
+            "atr":       self.atr.peek(forming["high"], forming["low"]),
+            "vwap":      self.vwap.value,
+            "provisional": True,
+        }
@@ -1,9 +1,15 @@
 # 이벤트 기반 백테스터 — 9팩터 스코어링 전략 검증
 import logging
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field, replace
-from datetime import datetime
+from datetime import date, datetime
+
+import numpy as np
 
 from service.market import indicators, smc
+from service.market.frame import CandleFrame, col
+from service.trading.stepscorer import DayBook, StepScorer
 from service.trading.strategy import Scorer, BUY_THRESHOLD
 
 logger = logging.getLogger(__name__)
@@ -51,7 +57,7 @@ class BacktestResult:
     validation_warnings: list[str] = field(default_factory=list)
     trades: list[Trade] = field(default_factory=list)
 
-# API 없이 로컬 데이터만으로 9팩터 스코어링
+# API 없이 로컬 데이터만으로 9팩터 스코어링 (봉마다 전체 재계산 — StepScorer 의 기준 구현)
 class BacktestScorer:
     # Scorer 내부 인스턴스 생성
     def __init__(self):
@@ -87,84 +93,176 @@ def ts(dt) -> str:
         return dt.strftime("%Y-%m-%d %H:%M")
     return str(dt)
 
+# 일봉/봉 시각 → 날짜 서수 (날짜 없음·형식 오류는 가장 과거로 취급 — 문자열 비교 시 '' 와 동일)
+def dord(value) -> int:
+    if isinstance(value, datetime):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+# 일봉 날짜 서수 배열 1회 구성 — 날짜순 아니면 정렬 사본 사용 (bisect 전제)
+def dayidx(daily: list[dict]) -> tuple[list[dict], list[int]]:
+    if isinstance(daily, CandleFrame):
+        ords = daily.ords().tolist()
+        if any(a > b for a, b in zip(ords, ords[1:])):
+            order = np.argsort(daily.ords(), kind="stable")
+            return daily.take(order), [ords[j] for j in order]
+        return daily, ords
+    ords = [dord(c.get("date", "")) for c in daily]
+    if any(a > b for a, b in zip(ords, ords[1:])):
+        order = sorted(range(len(daily)), key=ords.__getitem__)
+        daily = [daily[j] for j in order]
+        ords = [ords[j] for j in order]
+    return daily, ords
+
+
+# 봉 시각 이전(당일 제외) 일봉 개수 — 미래 참조 금지 경계
+def cut(ords: list[int], bar_time) -> int:
+    return bisect_left(ords, dord(bar_time))
+
+
+# 일봉 앞부분 n개 읽기 전용 뷰 — 봉마다 리스트 복사 없이 sync 에 전달
+class Prefix(Sequence):
+    __slots__ = ("rows", "n")
+
+    def __init__(self, rows: list[dict], n: int) -> None:
+        self.rows = rows
+        self.n = n
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.rows[:self.n][i]
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("prefix index out of range")
+        return self.rows[i]
+
+
 # 15분봉 순회하며 진입/청산 시뮬레이션
 def bt(
     code: str,
     candles_15m: list[dict],
     daily: list[dict],
     cfg: BacktestConfig | None = None,
+    *,
+    book: DayBook | None = None,
+    tick: Callable[[], None] | None = None,
+    scores: dict[int, tuple[float, float | None]] | None = None,
 ) -> BacktestResult:
     if cfg is None:
         cfg = BacktestConfig()
 
-    scorer = BacktestScorer()
+    scorer = StepScorer(book)
+    daily, ords = dayidx(daily)
     n = len(candles_15m)
     trades: list[Trade] = []
     equity = [1.0]
 
-    in_trade = False
-    entry_price = 0.0
-    entry_bar = 0
-    stop_price: float | None = None
-    tp_price = 0.0
+    high, low, close = hlc(candles_15m)
+    pushed = 0
 
-    for i in range(1, n):
+    i = 1
+    while i < n:
+        # 봉 단위 진행 콜백 (작업 큐 진행률/취소 지점)
+        if tick is not None:
+            tick()
         bar = candles_15m[i]
-        bar_time = bar["time"]
-
-        # 청산 체크 (진입보다 먼저)
-        if in_trade:
-            hold_bars = i - entry_bar
-
-            # 1) FVG 동적 손절
-            if stop_price and bar["low"] <= stop_price:
-                out(trades, equity, entry_bar, candles_15m,
-                    i, bar_time, entry_price, stop_price, "stop", cfg)
-                in_trade = False
-                continue
-
-            # 2) 고정 % 폴백 손절
-            fallback = entry_price * (1 - cfg.fallback_stop_pct / 100)
-            if bar["low"] <= fallback:
-                out(trades, equity, entry_bar, candles_15m,
-                    i, bar_time, entry_price, fallback, "stop", cfg)
-                in_trade = False
-                continue
-
-            # 3) 익절 (+tp%)
-            if bar["high"] >= tp_price:
-                out(trades, equity, entry_bar, candles_15m,
-                    i, bar_time, entry_price, tp_price, "tp", cfg)
-                in_trade = False
-                continue
-
-            # 4) 최대 보유 봉수 초과 - 종가 청산
-            if hold_bars >= cfg.max_hold_bars:
-                out(trades, equity, entry_bar, candles_15m,
-                    i, bar_time, entry_price, float(bar["close"]), "trail", cfg)
-                in_trade = False
-                continue
 
         # 진입 체크 (미래 참조 금지: candles[:i]만 사용)
-        if not in_trade:
-            bar_date = bar_time.date().isoformat() if isinstance(bar_time, datetime) else str(bar_time)[:10]
-            daily_slice = [c for c in daily if str(c.get("date", ""))[:10] < bar_date]
-            if len(daily_slice) < 35:
-                continue
-
-            total, stop = scorer.val(daily_slice, candles_15m[:i], bar["close"])
-
-            # 시그널 발생 → 다음 봉 시가에 진입 (슬리피지 반영)
-            if total >= cfg.buy_threshold and i + 1 < n:
-                nxt = candles_15m[i + 1]
-                entry_price = bpx(float(nxt["open"]), cfg)
-                tp_price = entry_price * (1 + cfg.take_profit_pct / 100)
-                stop_price = stop
-                entry_bar = i + 1
-                in_trade = True
+        k = cut(ords, bar["time"])
+        if k < 35:
+            i += 1
+            continue
+
+        # 봉 점수는 설정과 무관 — 같은 캔들 격자 실행 간 scores 로 공유
+        hit = scores.get(i) if scores is not None else None
+        if hit is None:
+            # 직전 봉까지 증분 반영 — 스코어 입력은 항상 candles[:i]
+            for j in range(pushed, i):
+                scorer.push(candles_15m[j])
+            pushed = i
+            scorer.sync(Prefix(daily, k))
+            hit = scorer.val(bar["close"])
+            if scores is not None:
+                scores[i] = hit
+        total, stop = hit
+
+        # 시그널 발생 → 다음 봉 시가에 진입 (슬리피지 반영)
+        if total >= cfg.buy_threshold and i + 1 < n:
+            entry_bar = i + 1
+            entry_price = bpx(float(candles_15m[entry_bar]["open"]), cfg)
+            hit = exitbar(high, low, close, entry_bar, entry_price, stop, cfg)
+            # 청산 봉까지 건너뜀 (보유 중 봉은 진입 평가 없음)
+            last = hit[0] if hit else n - 1
+            if tick is not None:
+                for _ in range(last - i):
+                    tick()
+            if hit is None:
+                break
+            j, price, reason = hit
+            out(trades, equity, entry_bar, candles_15m,
+                j, candles_15m[j]["time"], entry_price, price, reason, cfg)
+            i = j + 1
+            continue
+        i += 1
 
     return stat(code, n, trades, equity, candles_15m, cfg)
 
+# 15분봉 고가/저가/종가 배열
+def hlc(candles_15m: list[dict]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return tuple(col(candles_15m, key) for key in ("high", "low", "close"))
+
+
+# 진입 후 첫 청산 봉 탐색 — 조건별 첫 도달(argmax) 후 우선순위 적용
+# 같은 봉 동시 충족 시 FVG 손절 → 폴백 손절 → 익절 → 최대 보유 순 (미청산이면 None)
+def exitbar(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entry_bar: int,
+    entry_price: float,
+    stop_price: float | None,
+    cfg: BacktestConfig,
+) -> tuple[int, float, str] | None:
+    end = min(len(close), entry_bar + cfg.max_hold_bars + 1)
+    if entry_bar >= end:
+        return None
+    lo, hi = low[entry_bar:end], high[entry_bar:end]
+    fallback = entry_price * (1 - cfg.fallback_stop_pct / 100)
+    tp_price = entry_price * (1 + cfg.take_profit_pct / 100)
+
+    # 조건별 첫 도달 오프셋 (미도달은 창 길이)
+    size = end - entry_bar
+    firsts = []
+    for mask in (
+        lo <= stop_price if stop_price else None,
+        lo <= fallback,
+        hi >= tp_price,
+    ):
+        firsts.append(int(mask.argmax()) if mask is not None and mask.any() else size)
+    first = min(firsts)
+    if first < size:
+        j = entry_bar + first
+        if firsts[0] == first:
+            return j, stop_price, "stop"
+        if firsts[1] == first:
+            return j, fallback, "stop"
+        return j, tp_price, "tp"
+
+    # 최대 보유 봉수 도달 - 종가 청산
+    j = entry_bar + cfg.max_hold_bars
+    if j < len(close):
+        return j, float(close[j]), "trail"
+    return None
+
+
 # 거래 청산 기록 + 에퀴티 갱신
 def out(
     trades: list[Trade],
@@ -281,20 +379,52 @@ def bh(candles_15m: list[dict], cfg: BacktestConfig) -> float | None:
 
 def risks(candles_15m: list[dict]) -> list[str]:
     warnings: list[str] = [
-        "단일 포지션·% 수익 모델 — 실봇의 자금배분(buy_percent)·다종목 보유·현금 갱신·체결 지연·미체결은 미반영",
+        "단일 포지션·% 수익 모델 — 실봇의 자금배분(buy_percent)·다종목 보유·현금 갱신·체결 지연·미체결은 미반영 (자금배분/다종목은 포트폴리오 백테스트로 검증)",
     ]
     if len(candles_15m) < 500:
         warnings.append("15분봉 표본이 작아 결과 신뢰도가 낮습니다.")
-    dates = {
-        c["time"].date().isoformat()
-        for c in candles_15m
-        if isinstance(c.get("time"), datetime)
-    }
+    if isinstance(candles_15m, CandleFrame):
+        dates = set(candles_15m.days().tolist()) if candles_15m.key == "time" else set()
+    else:
+        dates = {
+            c["time"].date().isoformat()
+            for c in candles_15m
+            if isinstance(c.get("time"), datetime)
+        }
     if len(dates) < 20:
         warnings.append("검증 거래일 수가 부족해 국면별 안정성을 판단하기 어렵습니다.")
     return warnings
 
 
+# 파라미터 격자 전개 — threshold × tp × stop 순서 고정 (결과 행 순서 기준)
+def grids(
+    cfg: BacktestConfig,
+    *,
+    buy_thresholds: list[float],
+    take_profit_pcts: list[float],
+    stop_pcts: list[float],
+) -> list[BacktestConfig]:
+    return [
+        replace(cfg, buy_threshold=threshold, take_profit_pct=tp, fallback_stop_pct=stop)
+        for threshold in buy_thresholds
+        for tp in take_profit_pcts
+        for stop in stop_pcts
+    ]
+
+
+# 격자 결과 행
+def gridrow(cfg: BacktestConfig, result: BacktestResult) -> dict:
+    return {
+        "buy_threshold": cfg.buy_threshold,
+        "take_profit_pct": cfg.take_profit_pct,
+        "fallback_stop_pct": cfg.fallback_stop_pct,
+        "total_trades": result.total_trades,
+        "cum_return_pct": result.cum_return_pct,
+        "mdd_pct": result.mdd_pct,
+        "excess_return_pct": result.excess_return_pct,
+    }
+
+
 def grid(
     code: str,
     candles_15m: list[dict],
@@ -305,33 +435,49 @@ def grid(
     take_profit_pcts: list[float],
     stop_pcts: list[float],
 ) -> list[dict]:
-    rows: list[dict] = []
-    for threshold in buy_thresholds:
-        for tp in take_profit_pcts:
-            for stop in stop_pcts:
-                result = bt(
-                    code,
-                    candles_15m,
-                    daily,
-                    replace(
-                        cfg,
-                        buy_threshold=threshold,
-                        take_profit_pct=tp,
-                        fallback_stop_pct=stop,
-                    ),
-                )
-                rows.append({
-                    "buy_threshold": threshold,
-                    "take_profit_pct": tp,
-                    "fallback_stop_pct": stop,
-                    "total_trades": result.total_trades,
-                    "cum_return_pct": result.cum_return_pct,
-                    "mdd_pct": result.mdd_pct,
-                    "excess_return_pct": result.excess_return_pct,
-                })
-    return rows
+    cfgs = grids(
+        cfg,
+        buy_thresholds=buy_thresholds,
+        take_profit_pcts=take_profit_pcts,
+        stop_pcts=stop_pcts,
+    )
+    # 설정 간 봉 점수/일봉 스냅샷 공유 — 설정별 차이는 진입 임계값·청산 탐색뿐
+    book, scores = DayBook(daily), {}
+    return [gridrow(c, bt(code, candles_15m, daily, c, book=book, scores=scores)) for c in cfgs]
+
+
+# walk-forward 창 구간 [start, end) — rolling: 연속 등분 / anchored: 0에서 시작해 끝점만 확장
+def spans(n: int, windows: int, mode: str = "rolling") -> list[tuple[int, int]]:
+    if mode not in ("rolling", "anchored"):
+        raise ValueError(f"unknown walk-forward mode: {mode}")
+    if windows <= 0 or n <= 0:
+        return []
+    size = max(1, n // windows)
+    out: list[tuple[int, int]] = []
+    for idx in range(windows):
+        start = idx * size
+        end = n if idx == windows - 1 else min(n, (idx + 1) * size)
+        if start >= end:
+            continue
+        out.append((0 if mode == "anchored" else start, end))
+    return out
+
+
+# walk-forward 결과 행
+def wfrow(idx: int, chunk: list[dict], result: BacktestResult) -> dict:
+    return {
+        "window": idx + 1,
+        "start_time": ts(chunk[0]["time"]),
+        "end_time": ts(chunk[-1]["time"]),
+        "total_bars": result.total_bars,
+        "total_trades": result.total_trades,
+        "cum_return_pct": result.cum_return_pct,
+        "excess_return_pct": result.excess_return_pct,
+        "mdd_pct": result.mdd_pct,
+    }
 
 
+# 창마다 bt 실행 — 일봉 지표/구간 스냅샷(DayBook)은 전 창이 공유
 def wf(
     code: str,
     candles_15m: list[dict],
@@ -339,28 +485,11 @@ def wf(
     cfg: BacktestConfig,
     *,
     windows: int = 6,
+    mode: str = "rolling",
 ) -> list[dict]:
-    if windows <= 0 or not candles_15m:
-        return []
-
-    n = len(candles_15m)
-    size = max(1, n // windows)
+    book = DayBook(daily)
     rows: list[dict] = []
-    for idx in range(windows):
-        start = idx * size
-        end = n if idx == windows - 1 else min(n, (idx + 1) * size)
+    for idx, (start, end) in enumerate(spans(len(candles_15m), windows, mode)):
         chunk = candles_15m[start:end]
-        if not chunk:
-            continue
-        result = bt(code, chunk, daily, cfg)
-        rows.append({
-            "window": idx + 1,
-            "start_time": ts(chunk[0]["time"]),
-            "end_time": ts(chunk[-1]["time"]),
-            "total_bars": result.total_bars,
-            "total_trades": result.total_trades,
-            "cum_return_pct": result.cum_return_pct,
-            "excess_return_pct": result.excess_return_pct,
-            "mdd_pct": result.mdd_pct,
-        })
+        rows.append(wfrow(idx, chunk, bt(code, chunk, daily, cfg, book=book)))
     return rows
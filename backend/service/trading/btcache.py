@@ -0,0 +1,53 @@
+# 백테스트 결과 캐시 — 입력 내용 지문(15분봉 파일 지문 + 일봉 + 설정) 해시를 키로 Redis/인메모리 보관
+import hashlib
+import json
+import logging
+from dataclasses import asdict, is_dataclass
+from typing import Any
+
+from service.infra.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 입력이 바뀌면 키 자체가 바뀌므로 TTL 은 저장 공간 회수용
+_TTL = 7 * 24 * 3600
+
+_PREFIX = "bt:"
+
+_cache = TTLCache()
+
+
+# 일봉 내용 지문
+def digest(daily: list[dict]) -> str:
+    raw = json.dumps(daily, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# 캐시 키 — bt:{code}:{kind}:{sha256(입력 지문 + 파라미터)}
+def key(kind: str, code: str, sig: list, daily: str, **params: Any) -> str:
+    params = {k: asdict(v) if is_dataclass(v) else v for k, v in params.items()}
+    raw = json.dumps([sig, daily, params], sort_keys=True, default=str, separators=(",", ":"))
+    return f"{_PREFIX}{code}:{kind}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def get(ckey: str) -> Any | None:
+    return _cache.get(ckey)
+
+
+def put(ckey: str, value: Any) -> None:
+    _cache.set(ckey, value, _TTL)
+
+
+# 종목 단위 무효화 (codes 생략 시 전체)
+def drop(codes: list[str] | None = None) -> None:
+    if codes is None:
+        _cache.invalidate(_PREFIX)
+        return
+    _cache.invalidate(*(f"{_PREFIX}{code}:" for code in codes))
+
+
+# CandleStore.flush 이벤트 핸들러 — 새 세션이 저장된 종목 결과 폐기
+async def onflush(event: str, data: dict | None) -> None:
+    codes = (data or {}).get("codes")
+    drop(list(codes) if codes else None)
+    logger.info("백테스트 결과 캐시 무효화: %s", codes or "전체")
@@ -0,0 +1,202 @@
+# 백테스트 작업 큐 — 제출 → 작업 ID → 진행률 폴링/SSE → 결과 (이벤트 루프 비차단)
+import asyncio
+import datetime
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 완료 작업 보관 한도 (오래된 것부터 정리)
+_KEEP = 100
+
+_DONE = ("done", "failed", "cancelled")
+
+_jobs: dict[str, "Job"] = {}
+
+# 단일 백테스트(bt) 실행 스레드 풀 — 격자/walk-forward 는 btpool 프로세스 풀
+_exec: ThreadPoolExecutor | None = None
+
+# 동시 실행 슬롯 (이벤트 루프 단위로 생성)
+_slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+
+# 대기열 초과
+class JobsFull(Exception):
+    pass
+
+
+# 취소 요청된 작업의 봉 루프 중단
+class Cancelled(Exception):
+    pass
+
+
+# 작업 상태 — 진행률은 처리한 봉 수 / 예상 총 봉 수
+@dataclass
+class Job:
+    id: str
+    code: str
+    status: str = "queued"
+    bars: int = 0
+    total: int = 0
+    result: dict | None = None
+    error: str | None = None
+    created_at: str = ""
+    stop: bool = False
+    exc: BaseException | None = field(default=None, repr=False)
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+    # 봉 N개 처리 반영
+    def step(self, n: int = 1) -> None:
+        self.bars += n
+
+    # bt 봉 루프 콜백 — 취소 요청 시 스레드 안에서 중단
+    def tick(self) -> None:
+        if self.stop:
+            raise Cancelled(self.id)
+        self.bars += 1
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _DONE
+
+    # 응답 직렬화 (결과는 완료 시에만)
+    def view(self, result: bool = True) -> dict[str, Any]:
+        pct = round(min(self.bars, self.total) / self.total * 100, 1) if self.total else 0.0
+        data = {
+            "job_id": self.id,
+            "code": self.code,
+            "status": self.status,
+            "bars": self.bars,
+            "total_bars": self.total,
+            "progress_pct": 100.0 if self.status == "done" else pct,
+            "error": self.error,
+            "created_at": self.created_at,
+        }
+        if result and self.status == "done":
+            data["result"] = self.result
+        return data
+
+
+# 스레드 풀 반환 (최초 호출 시 생성)
+def executor() -> ThreadPoolExecutor:
+    global _exec
+    if _exec is None:
+        _exec = ThreadPoolExecutor(max_workers=max(1, settings.backtest_jobs), thread_name_prefix="backtest")
+    return _exec
+
+
+# 현재 루프의 실행 슬롯
+def slots() -> asyncio.Semaphore:
+    global _slots
+    loop = asyncio.get_running_loop()
+    if _slots is None or _slots[0] is not loop:
+        _slots = (loop, asyncio.Semaphore(max(1, settings.backtest_jobs)))
+    return _slots[1]
+
+
+# 동기 함수를 작업 스레드에서 실행
+async def offload(fn: Callable, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor(), lambda: fn(*args, **kwargs))
+
+
+# 작업 조회
+def get(job_id: str) -> Job | None:
+    return _jobs.get(job_id)
+
+
+# 전체 작업 (최신순)
+def jobs() -> list[Job]:
+    return sorted(_jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+
+# 진행 중(대기 포함) 작업 수
+def active() -> int:
+    return sum(1 for j in _jobs.values() if not j.finished)
+
+
+# 완료 작업 정리 — 보관 한도 초과분 삭제
+def prune() -> None:
+    done = [j for j in _jobs.values() if j.finished]
+    for j in sorted(done, key=lambda j: j.created_at)[:max(0, len(done) - _KEEP)]:
+        _jobs.pop(j.id, None)
+
+
+# 작업 제출 — work(job) 코루틴은 실행 슬롯 확보 후 시작
+def submit(code: str, work: Callable[[Job], Awaitable[dict]]) -> Job:
+    prune()
+    if active() >= settings.backtest_job_queue:
+        raise JobsFull(f"백테스트 대기열 초과 ({settings.backtest_job_queue}건)")
+    job = Job(
+        id=uuid.uuid4().hex,
+        code=code,
+        created_at=datetime.datetime.now().isoformat(timespec="milliseconds"),
+    )
+    _jobs[job.id] = job
+    job.task = asyncio.create_task(run(job, work))
+    return job
+
+
+# 작업 실행 — 상태 전이 queued → running → done/failed/cancelled
+async def run(job: Job, work: Callable[[Job], Awaitable[dict]]) -> None:
+    try:
+        async with slots():
+            if job.stop:
+                raise Cancelled(job.id)
+            job.status = "running"
+            job.result = await work(job)
+        job.status = "done"
+    except (Cancelled, asyncio.CancelledError):
+        job.status = "cancelled"
+    except Exception as exc:
+        job.status = "failed"
+        job.exc = exc
+        job.error = str(getattr(exc, "detail", "") or exc)
+        logger.warning("백테스트 작업 실패 [%s] %s: %s", job.code, job.id, job.error)
+
+
+# 작업 취소 — 대기 중이면 즉시, 실행 중이면 다음 봉에서 중단
+def cancel(job_id: str) -> Job | None:
+    job = _jobs.get(job_id)
+    if job is None or job.finished:
+        return job
+    job.stop = True
+    if job.task is not None:
+        job.task.cancel()
+    return job
+
+
+# 작업 완료 대기 (동기 API 경로)
+async def wait(job: Job) -> Job:
+    if job.task is not None:
+        await asyncio.shield(job.task)
+    return job
+
+
+# 진행 상황 스트림 — 변경 시에만 발행, 종료 상태에서 결과 포함 후 종료
+async def events(job: Job, interval: float = 0.5):
+    last = None
+    while True:
+        snap = (job.status, job.bars)
+        if snap != last:
+            last = snap
+            yield job.view(result=job.finished)
+        if job.finished:
+            return
+        await asyncio.sleep(interval)
+
+
+# 종료 훅 — 미완료 작업 취소 후 스레드 풀 정리
+def close() -> None:
+    global _exec
+    for job in list(_jobs.values()):
+        cancel(job.id)
+    if _exec is not None:
+        _exec.shutdown(wait=False, cancel_futures=True)
+        _exec = None
@@ -0,0 +1,347 @@
+# 백테스트 프로세스 풀 — 캔들/일봉은 공유메모리로 1회 전달, 워커에는 설정만 분배
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from config import settings
+from service.trading.backtest import BacktestConfig, bt, gridrow, grids, spans, wfrow
+from service.trading.btsearch import SPACE, Halving, sample, searchrow
+from service.trading.stepscorer import DayBook
+
+logger = logging.getLogger(__name__)
+
+_COLS = ("open", "high", "low", "close", "volume")
+
+# 프로세스 풀 (지연 생성, 앱 종료 시 close)
+_pool: ProcessPoolExecutor | None = None
+
+# 워커 측 데이터 캐시 — 같은 공유메모리 이름이면 재구성 생략
+_ctx: dict = {"name": None, "candles_15m": [], "daily": [], "book": None, "scores": {}}
+
+
+# 공유메모리 블록 명세 — 워커로 전달되는 유일한 데이터 참조
+@dataclass(frozen=True)
+class Packed:
+    name: str
+    n15: int
+    nday: int
+    dtype: str
+
+
+# 워커 수 — 설정값(0이면 CPU 코어 수)
+def size() -> int:
+    return settings.backtest_workers or os.cpu_count() or 1
+
+
+# 워커 생성 방식 — 스레드가 도는 서버 프로세스에서 fork 하면 잡힌 락이 복제되므로 forkserver
+# (서버 프로세스는 워커 모듈을 미리 import 해 두고 단일 스레드 상태에서 워커를 fork)
+def context() -> multiprocessing.context.BaseContext:
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload([__name__])
+    return ctx
+
+
+# 풀 반환 (최초 호출 시 생성)
+def pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=size(), mp_context=context())
+    return _pool
+
+
+# 풀 종료 (lifespan 종료 훅)
+def close() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# 캔들 → 공유메모리 (시각 int64 us + OHLCV 행렬), 정수 시세면 int64 유지
+def pack(candles_15m: list[dict], daily: list[dict]) -> tuple[shared_memory.SharedMemory, Packed]:
+    rows = list(candles_15m) + list(daily)
+    n15, nday = len(candles_15m), len(daily)
+    integral = all(type(r[k]) is int for r in rows for k in _COLS)
+    dtype = np.dtype(np.int64 if integral else np.float64)
+    total = max(1, len(rows)) * 8 * (1 + len(_COLS))
+    shm = shared_memory.SharedMemory(create=True, size=total)
+    try:
+        ts, px = view(shm, n15 + nday, dtype)
+        ts[:n15] = np.array([r["time"] for r in candles_15m], dtype="datetime64[us]").astype(np.int64)
+        ts[n15:] = np.array([str(r.get("date", ""))[:10] for r in daily], dtype="datetime64[D]").astype(np.int64)
+        for j, k in enumerate(_COLS):
+            px[j] = [r[k] for r in rows]
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    return shm, Packed(shm.name, n15, nday, dtype.str)
+
+
+# 공유메모리 버퍼 위 배열 뷰
+def view(shm: shared_memory.SharedMemory, n: int, dtype: np.dtype) -> tuple[np.ndarray, np.ndarray]:
+    ts = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+    px = np.ndarray((len(_COLS), n), dtype=dtype, buffer=shm.buf, offset=n * 8)
+    return ts, px
+
+
+# 워커 측 공유메모리 연결 — 해제 책임은 생성한 부모에게만 (resource_tracker 중복 등록 방지)
+def attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+# 공유메모리 → list[dict] 재구성 (bt 입력 형태)
+def unpack(spec: Packed) -> tuple[list[dict], list[dict]]:
+    shm = attach(spec.name)
+    try:
+        n = spec.n15 + spec.nday
+        ts, px = view(shm, n, np.dtype(spec.dtype))
+        times = ts[:spec.n15].astype("datetime64[us]").tolist()
+        dates = ts[spec.n15:].astype("datetime64[D]").tolist()
+        cols = [px[j].tolist() for j in range(len(_COLS))]
+    finally:
+        shm.close()
+    candles_15m = [
+        {"time": times[i], **{k: cols[j][i] for j, k in enumerate(_COLS)}}
+        for i in range(spec.n15)
+    ]
+    daily = [
+        {"date": dates[i].isoformat(), **{k: cols[j][spec.n15 + i] for j, k in enumerate(_COLS)}}
+        for i in range(spec.nday)
+    ]
+    return candles_15m, daily
+
+
+# 워커: 데이터셋 로드 (공유메모리 이름 단위 캐시) — 일봉 스냅샷 저장소도 데이터셋 단위로 공유
+def load(spec: Packed) -> tuple[list[dict], list[dict], DayBook]:
+    if _ctx["name"] != spec.name:
+        _ctx["candles_15m"], _ctx["daily"] = unpack(spec)
+        _ctx["book"] = DayBook(_ctx["daily"])
+        _ctx["scores"] = {}
+        _ctx["name"] = spec.name
+    return _ctx["candles_15m"], _ctx["daily"], _ctx["book"]
+
+
+# 워커: 설정 1개 백테스트 → 격자 행 (전체 구간 봉 점수는 워커 내 설정 간 공유)
+def gridjob(spec: Packed, code: str, cfg: BacktestConfig) -> dict:
+    candles_15m, daily, book = load(spec)
+    return gridrow(cfg, bt(code, candles_15m, daily, cfg, book=book, scores=_ctx["scores"]))
+
+
+# 워커: walk-forward 창 1개 → 창 행
+def wfjob(spec: Packed, code: str, cfg: BacktestConfig, idx: int, start: int, end: int) -> dict:
+    candles_15m, daily, book = load(spec)
+    chunk = candles_15m[start:end]
+    return wfrow(idx, chunk, bt(code, chunk, daily, cfg, book=book))
+
+
+# 워커: 앞쪽 m봉 구간 백테스트 → 탐색 행 (봉 점수는 구간 길이와 무관해 전체 구간 점수 공유)
+def searchjob(spec: Packed, code: str, cfg: BacktestConfig, m: int) -> dict:
+    candles_15m, daily, book = load(spec)
+    return searchrow(cfg, m, bt(code, candles_15m[:m], daily, cfg, book=book, scores=_ctx["scores"]))
+
+
+# 작업 목록을 풀에 제출 — fn(spec, *args), 입력 순서대로 Future 반환
+def submit(
+    candles_15m: list[dict],
+    daily: list[dict],
+    fn,
+    argsets: list[tuple],
+) -> tuple[shared_memory.SharedMemory, list[Future]]:
+    shm, spec = pack(candles_15m, daily)
+    try:
+        ex = pool()
+        return shm, [ex.submit(fn, spec, *args) for args in argsets]
+    except Exception:
+        free(shm)
+        raise
+
+
+# Future 결과를 순서대로 수집 후 공유메모리 해제
+def gather(shm: shared_memory.SharedMemory, futs: list[Future]) -> list[dict]:
+    try:
+        return [f.result() for f in futs]
+    finally:
+        for f in futs:
+            f.cancel()
+        free(shm)
+
+
+# 비동기 수집 — 이벤트 루프 비차단, 작업 완료마다 progress(봉 수) 통지
+async def agather(
+    shm: shared_memory.SharedMemory,
+    futs: list[Future],
+    sizes: list[int] | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> list[dict]:
+    try:
+        waits = [asyncio.wrap_future(f) for f in futs]
+        if progress is not None:
+            for w, n in zip(waits, sizes or [0] * len(waits)):
+                w.add_done_callback(lambda w, n=n: None if w.cancelled() or w.exception() else progress(n))
+        return list(await asyncio.gather(*waits))
+    finally:
+        for f in futs:
+            f.cancel()
+        free(shm)
+
+
+# 공유메모리 해제 (모든 Future 완료 후)
+def free(shm: shared_memory.SharedMemory) -> None:
+    shm.close()
+    shm.unlink()
+
+
+# 파라미터 격자 병렬 실행 — backtest.grid 와 동일 행/순서
+def grid(
+    code: str,
+    candles_15m: list[dict],
+    daily: list[dict],
+    cfg: BacktestConfig,
+    *,
+    buy_thresholds: list[float],
+    take_profit_pcts: list[float],
+    stop_pcts: list[float],
+) -> list[dict]:
+    cfgs = grids(cfg, buy_thresholds=buy_thresholds, take_profit_pcts=take_profit_pcts, stop_pcts=stop_pcts)
+    return gather(*submit(candles_15m, daily, gridjob, [(code, c) for c in cfgs]))
+
+
+# 비동기 격자 실행 (API 경로)
+async def agrid(
+    code: str,
+    candles_15m: list[dict],
+    daily: list[dict],
+    cfg: BacktestConfig,
+    *,
+    buy_thresholds: list[float],
+    take_profit_pcts: list[float],
+    stop_pcts: list[float],
+    progress: Callable[[int], None] | None = None,
+) -> list[dict]:
+    cfgs = grids(cfg, buy_thresholds=buy_thresholds, take_profit_pcts=take_profit_pcts, stop_pcts=stop_pcts)
+    return await agrids(code, candles_15m, daily, cfgs, progress=progress)
+
+
+# 설정 목록 병렬 실행 — 입력 순서대로 격자 행 (캐시 미스분만 돌릴 때)
+async def agrids(
+    code: str,
+    candles_15m: list[dict],
+    daily: list[dict],
+    cfgs: list[BacktestConfig],
+    *,
+    progress: Callable[[int], None] | None = None,
+) -> list[dict]:
+    if not cfgs:
+        return []
+    shm, futs = submit(candles_15m, daily, gridjob, [(code, c) for c in cfgs])
+    return await agather(shm, futs, [len(candles_15m)] * len(cfgs), progress)
+
+
+# walk-forward 창 병렬 실행 — backtest.wf 와 동일 행/순서
+def wf(
+    code: str,
+    candles_15m: list[dict],
+    daily: list[dict],
+    cfg: BacktestConfig,
+    *,
+    windows: int = 6,
+    mode: str = "rolling",
+) -> list[dict]:
+    argsets = [(code, cfg, idx, a, b) for idx, (a, b) in enumerate(spans(len(candles_15m), windows, mode))]
+    if not argsets:
+        return []
+    return gather(*submit(candles_15m, daily, wfjob, argsets))
+
+
+# 비동기 walk-forward 실행 (API 경로)
+async def awf(
+    code: str,
+    candles_15m: list[dict],
+    daily: list[dict],
+    cfg: BacktestConfig,
+    *,
+    windows: int = 6,
+    mode: str = "rolling",
+    progress: Callable[[int], None] | None = None,
+) -> list[dict]:
+    argsets = [(code, cfg, idx, a, b) for idx, (a, b) in enumerate(spans(len(candles_15m), windows, mode))]
+    if not argsets:
+        return []
+    shm, futs = submit(candles_15m, daily, wfjob, argsets)
+    return await agather(shm, futs, [b - a for *_, a, b in argsets], progress)
+
+
+# 연속 반감 탐색 병렬 실행 — 공유메모리 1회 적재 후 단계마다 생존 설정만 제출
+def search(
+    code: str,
+    candles_15m: list[dict],
+    daily: list[dict],
+    cfg: BacktestConfig,
+    *,
+    space: dict[str, list] | None = None,
+    configs: int = 500,
+    eta: int = 4,
+    rungs: int = 4,
+    seed: int = 0,
+) -> dict:
+    plan = Halving(sample(cfg, space or SPACE, configs, seed), len(candles_15m), eta, rungs)
+    shm, spec = pack(candles_15m, daily)
+    try:
+        ex = pool()
+        while batch := plan.next():
+            futs = [ex.submit(searchjob, spec, code, c, m) for c, m in batch]
+            try:
+                plan.feed([f.result() for f in futs])
+            finally:
+                for f in futs:
+                    f.cancel()
+    finally:
+        free(shm)
+    return plan.report()
+
+
+# 비동기 탐색 (API 경로) — 평가 완료마다 progress(봉 수) 통지
+async def asearch(
+    code: str,
+    candles_15m: list[dict],
+    daily: list[dict],
+    cfg: BacktestConfig,
+    *,
+    space: dict[str, list] | None = None,
+    configs: int = 500,
+    eta: int = 4,
+    rungs: int = 4,
+    seed: int = 0,
+    progress: Callable[[int], None] | None = None,
+) -> dict:
+    plan = Halving(sample(cfg, space or SPACE, configs, seed), len(candles_15m), eta, rungs)
+    shm, spec = pack(candles_15m, daily)
+    try:
+        ex = pool()
+        while batch := plan.next():
+            futs = [ex.submit(searchjob, spec, code, c, m) for c, m in batch]
+            waits = [asyncio.wrap_future(f) for f in futs]
+            if progress is not None:
+                for w, (_, m) in zip(waits, batch):
+                    w.add_done_callback(lambda w, m=m: None if w.cancelled() or w.exception() else progress(m))
+            try:
+                plan.feed(list(await asyncio.gather(*waits)))
+            finally:
+                for f in futs:
+                    f.cancel()
+    finally:
+        free(shm)
+    return plan.report()
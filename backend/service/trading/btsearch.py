@@ -0,0 +1,144 @@
+# 파라미터 탐색 — 넓은 범위 무작위 표본 + 연속 반감(successive halving): 짧은 구간에서 하위 설정 조기 탈락
+import math
+import random
+from dataclasses import replace
+
+from service.trading.backtest import BacktestConfig, BacktestResult, bt
+from service.trading.stepscorer import DayBook
+
+# 순위 지표 — 누적수익률에 MDD(음수) 절반 가중 (수익만 큰 고위험 설정 억제)
+_MDD_WEIGHT = 0.5
+
+# 기본 탐색 공간
+SPACE = {
+    "buy_thresholds": [35.0, 40.0, 45.0, 50.0, 55.0, 60.0, 65.0, 70.0],
+    "take_profit_pcts": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0],
+    "stop_pcts": [1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0],
+    "max_hold_bars": [4, 8, 12, 20, 30, 40],
+}
+
+
+# 탐색 공간에서 설정 n개 — 전체 조합이 n 이하면 전부, 아니면 시드 고정 무작위 비복원 추출
+def sample(cfg: BacktestConfig, space: dict[str, list], n: int, seed: int = 0) -> list[BacktestConfig]:
+    axes = [
+        ("buy_threshold", space["buy_thresholds"]),
+        ("take_profit_pct", space["take_profit_pcts"]),
+        ("fallback_stop_pct", space["stop_pcts"]),
+        ("max_hold_bars", space["max_hold_bars"]),
+    ]
+    total = math.prod(len(values) for _, values in axes)
+    picks = range(total) if total <= n else sorted(random.Random(seed).sample(range(total), n))
+    out = []
+    for idx in picks:
+        fields = {}
+        for name, values in reversed(axes):
+            idx, j = divmod(idx, len(values))
+            fields[name] = values[j]
+        out.append(replace(cfg, **fields))
+    return out
+
+
+# 순위 점수
+def fitness(row: dict) -> float:
+    return row["cum_return_pct"] + _MDD_WEIGHT * row["mdd_pct"]
+
+
+# 탐색 결과 행 (설정 + 구간 성과)
+def searchrow(cfg: BacktestConfig, bars: int, result: BacktestResult) -> dict:
+    row = {
+        "buy_threshold": cfg.buy_threshold,
+        "take_profit_pct": cfg.take_profit_pct,
+        "fallback_stop_pct": cfg.fallback_stop_pct,
+        "max_hold_bars": cfg.max_hold_bars,
+        "bars": bars,
+        "total_trades": result.total_trades,
+        "cum_return_pct": result.cum_return_pct,
+        "mdd_pct": result.mdd_pct,
+        "win_rate_pct": result.win_rate_pct,
+    }
+    row["fitness"] = round(fitness(row), 2)
+    return row
+
+
+# 연속 반감 계획 — 단계 k 는 앞쪽 n·eta^(k-K) 봉으로 평가, 상위 1/eta 만 다음 단계 진출
+# 단계별 비용(설정 수 × 구간 비율)이 같아 500개 탐색 ≈ (K+1) × 마지막 단계 설정 수 만큼의 전체 실행
+class Halving:
+    def __init__(self, cfgs: list[BacktestConfig], n: int, eta: int = 4, rungs: int = 4) -> None:
+        self.n = n
+        self.eta = max(2, eta)
+        self.rungs = max(1, rungs)
+        self.alive = list(cfgs)
+        self.rung = 0
+        self.evals: list[dict] = []
+        self.steps: list[dict] = []
+        self.last: list[dict] = []
+
+    # 현재 단계 평가 구간 길이 (봉 수)
+    def bars(self) -> int:
+        frac = self.eta ** (self.rung - self.rungs + 1)
+        return max(1, min(self.n, math.ceil(self.n * frac)))
+
+    # 다음 평가 묶음 [(설정, 봉 수)] — 종료 시 빈 목록
+    def next(self) -> list[tuple[BacktestConfig, int]]:
+        if self.rung >= self.rungs or not self.alive:
+            return []
+        m = self.bars()
+        return [(cfg, m) for cfg in self.alive]
+
+    # 예정 평가 봉 수 합계 (진행률 분모) — 단계별 생존 수 × 구간 길이
+    def budget(self) -> int:
+        total, alive = 0, len(self.alive)
+        for rung in range(self.rung, self.rungs):
+            frac = self.eta ** (rung - self.rungs + 1)
+            total += alive * max(1, min(self.n, math.ceil(self.n * frac)))
+            alive = max(1, math.ceil(alive / self.eta))
+        return total
+
+    # 평가 결과 반영 → 상위 설정만 유지 (동점은 입력 순서)
+    def feed(self, rows: list[dict]) -> None:
+        m = self.bars()
+        for row in rows:
+            row["rung"] = self.rung
+        self.evals.extend(rows)
+        self.steps.append({"rung": self.rung, "bars": m, "configs": len(rows)})
+        order = sorted(range(len(rows)), key=lambda j: -rows[j]["fitness"])
+        self.last = [rows[j] for j in order]
+        self.rung += 1
+        if self.rung < self.rungs:
+            keep = max(1, math.ceil(len(rows) / self.eta))
+            self.alive = [self.alive[j] for j in order[:keep]]
+
+    # 탐색 요약 — 마지막 단계 순위 + 전체 평가 기록 + 전체 실행 환산 비용
+    def report(self) -> dict:
+        cost = sum(s["configs"] * s["bars"] for s in self.steps) / self.n if self.n else 0.0
+        return {
+            "best": self.last[0] if self.last else None,
+            "leaderboard": self.last[:10],
+            "rungs": self.steps,
+            "evaluations": self.evals,
+            "evaluation_count": len(self.evals),
+            "cost_full_runs": round(cost, 2),
+        }
+
+
+# 직렬 탐색 (테스트/기준 구현) — 봉 점수는 모든 평가가 공유
+def search(
+    code: str,
+    candles_15m: list[dict],
+    daily: list[dict],
+    cfg: BacktestConfig,
+    *,
+    space: dict[str, list] | None = None,
+    configs: int = 500,
+    eta: int = 4,
+    rungs: int = 4,
+    seed: int = 0,
+) -> dict:
+    plan = Halving(sample(cfg, space or SPACE, configs, seed), len(candles_15m), eta, rungs)
+    book, scores = DayBook(daily), {}
+    while batch := plan.next():
+        plan.feed([
+            searchrow(c, m, bt(code, candles_15m[:m], daily, c, book=book, scores=scores))
+            for c, m in batch
+        ])
+    return plan.report()
@@ -0,0 +1,74 @@
+# 몬테카를로 강건성 분석 — 거래 수익률 재표본(복원 추출)/순서 섞기 + 비용 충격, 경로×거래 행렬로 일괄 계산
+import numpy as np
+
+from service.trading.backtest import Trade
+
+# 신뢰 구간 분위수 (%)
+_BANDS = (5, 25, 50, 75, 95)
+
+
+# 경로별 지표 — r: (경로, 거래) 거래당 수익률(소수), bt.stat 과 같은 정의
+#   누적수익률 %, MDD %(시작 자본 포함 고점 기준), 손익비(손실 없으면 평균손실 1)
+def metrics(r: np.ndarray) -> dict[str, np.ndarray]:
+    growth = np.cumprod(1.0 + r, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(growth, axis=1), 1.0)
+    mdd = np.minimum(((growth - peaks) / peaks).min(axis=1), 0.0) * 100
+
+    pct = r * 100
+    win = pct > 0
+    nwin = win.sum(axis=1)
+    nloss = r.shape[1] - nwin
+    avg_win = np.divide(np.where(win, pct, 0.0).sum(axis=1), nwin, out=np.zeros(len(r)), where=nwin > 0)
+    sum_loss = np.where(win, 0.0, pct).sum(axis=1)
+    avg_loss = np.where(nloss > 0, np.abs(sum_loss / np.maximum(nloss, 1)), 1.0)
+    rr = np.divide(avg_win, avg_loss, out=np.zeros(len(r)), where=avg_loss > 0)
+    return {
+        "cum_return_pct": (growth[:, -1] - 1.0) * 100,
+        "mdd_pct": mdd,
+        "risk_reward": rr,
+    }
+
+
+# 분위수 구간 요약
+def band(values: np.ndarray) -> dict[str, float]:
+    qs = np.percentile(values, _BANDS)
+    return {f"p{q}": round(float(v), 2) for q, v in zip(_BANDS, qs)}
+
+
+# 거래 목록 → 경로 n개 시뮬레이션 신뢰 구간 (거래 없으면 None)
+#   mode: bootstrap(복원 추출 — 거래 구성 불확실성) | permute(순서만 섞기 — 경로 의존 MDD)
+#   cost_shock_bps: 경로별 추가 왕복 비용 평균(지수분포, 불리한 방향만) — 슬리피지/스프레드 악화 시나리오
+def mc(
+    trades: list[Trade],
+    *,
+    paths: int = 1000,
+    mode: str = "bootstrap",
+    cost_shock_bps: float = 5.0,
+    seed: int = 0,
+) -> dict | None:
+    pnl = np.array([t.pnl_pct for t in trades], dtype=np.float64) / 100
+    n = len(pnl)
+    if n == 0 or paths <= 0:
+        return None
+    rng = np.random.default_rng(seed)
+    if mode == "permute":
+        idx = rng.permuted(np.broadcast_to(np.arange(n), (paths, n)), axis=1)
+    else:
+        idx = rng.integers(0, n, size=(paths, n))
+    r = pnl[idx]
+    if cost_shock_bps > 0:
+        shock = rng.exponential(cost_shock_bps, size=(paths, 1)) / 10_000
+        r = (1.0 + r) * (1.0 - shock) - 1.0
+
+    m = metrics(r)
+    return {
+        "paths": paths,
+        "trades": n,
+        "mode": mode,
+        "cost_shock_bps": cost_shock_bps,
+        "seed": seed,
+        "cum_return_pct": band(m["cum_return_pct"]),
+        "mdd_pct": band(m["mdd_pct"]),
+        "risk_reward": band(m["risk_reward"]),
+        "loss_prob_pct": round(float((m["cum_return_pct"] < 0).mean() * 100), 1),
+    }
@@ -0,0 +1,304 @@
+# 다종목 포트폴리오 백테스터 — 공용 시계 위에서 Bot.loop/EntryEngine 슬롯 규칙(buy_percent·target_buy_count·현금 갱신) 재현
+import logging
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, time, timedelta
+
+import numpy as np
+
+from config import settings
+from service.trading.backtest import (
+    BacktestConfig, Prefix, bpx, cut, dayidx, exitbar, hlc, spx, tcost, ts,
+)
+from service.trading.stepscorer import StepScorer
+
+logger = logging.getLogger(__name__)
+
+# 매수 스캔 허용 구간 (봉 마감 시각 기준, Bot.loop 09:05 ~ 15:15)
+_SCAN_START = time(9, 5)
+_SCAN_END = time(15, 15)
+
+# 15분봉 길이 — 봉 라벨(시작 시각) → 마감 시각
+_BAR = timedelta(minutes=15)
+
+
+# 종목별 시뮬레이션 상태 — 캔들/가격 배열/일봉 인덱스 + 증분 스코어러
+class Leg:
+    def __init__(self, code: str, candles_15m: list[dict], daily: list[dict]) -> None:
+        self.code = code
+        self.candles = candles_15m
+        self.n = len(candles_15m)
+        self.daily, self.ords = dayidx(daily)
+        self.high, self.low, self.close = hlc(candles_15m)
+        self.at = {c["time"]: i for i, c in enumerate(candles_15m)}
+        self.scorer = StepScorer()
+        self.pushed = 0
+        # 봉마다 같은 날 마지막 봉 인덱스 (장마감 청산 지점)
+        self.eod = np.empty(self.n, dtype=np.int64)
+        last = self.n - 1
+        for i in range(self.n - 1, -1, -1):
+            if i < self.n - 1 and day(candles_15m[i]["time"]) != day(candles_15m[i + 1]["time"]):
+                last = i
+            self.eod[i] = last
+
+    # 봉 i 시점 9팩터 점수 + 손절가 (candles[:i], 당일 이전 일봉만 — bt 와 동일 규칙)
+    def score(self, i: int) -> tuple[float, float | None] | None:
+        k = cut(self.ords, self.candles[i]["time"])
+        if k < 35:
+            return None
+        for j in range(self.pushed, i):
+            self.scorer.push(self.candles[j])
+        self.pushed = i
+        self.scorer.sync(Prefix(self.daily, k))
+        return self.scorer.val(self.candles[i]["close"])
+
+
+# 보유 포지션 — 청산 봉/가격은 진입 시 확정 (청산 규칙은 종목 봉만 참조)
+@dataclass
+class Holding:
+    code: str
+    qty: int
+    entry_bar: int
+    entry_price: float
+    exit_bar: int
+    exit_price: float
+    reason: str
+
+
+# 포트폴리오 거래 기록 (종목·수량 포함)
+@dataclass
+class PortfolioTrade:
+    code: str
+    qty: int
+    entry_bar: int
+    entry_time: str
+    entry_price: float
+    exit_bar: int
+    exit_time: str
+    exit_price: float
+    exit_reason: str  # stop | tp | trail | eod | end
+    pnl_pct: float
+    pnl_amount: float
+    cost_bps: float = 0.0
+
+
+# 포트폴리오 결과 집계 (현금 기준 에퀴티)
+@dataclass
+class PortfolioResult:
+    codes: list[str]
+    total_bars: int = 0
+    total_trades: int = 0
+    initial_cash: float = 0.0
+    final_equity: float = 0.0
+    cum_return_pct: float = 0.0
+    annualized_pct: float = 0.0
+    mdd_pct: float = 0.0
+    win_rate_pct: float = 0.0
+    risk_reward: float = 0.0
+    avg_trade_cost_bps: float = 0.0
+    max_positions: int = 0
+    exposure_pct: float = 0.0
+    per_code: dict[str, dict] = field(default_factory=dict)
+    validation_warnings: list[str] = field(default_factory=list)
+    trades: list[PortfolioTrade] = field(default_factory=list)
+
+
+# 봉 시각 → 날짜 (문자열 시각은 앞 10자리)
+def day(value) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return str(value)[:10]
+
+
+# 매수 스캔 가능 봉 — 봉 마감 시각이 장중 매수 구간 안
+def window(value) -> bool:
+    if not isinstance(value, datetime):
+        return True
+    closed = (value + _BAR).time()
+    return _SCAN_START < closed < _SCAN_END
+
+
+# 후보 종목 일괄 채점 — 시계 t 에 봉이 있는 미보유 종목 전체를 한 번에 평가
+def batch(legs: dict[str, Leg], codes: list[str], t) -> dict[str, tuple[float, float | None]]:
+    scores = {}
+    for code in codes:
+        leg = legs[code]
+        i = leg.at.get(t)
+        if i is None or i < 1:
+            continue
+        hit = leg.score(i)
+        if hit is not None:
+            scores[code] = hit
+    return scores
+
+
+# 진입 후 청산 봉 — 손절/익절/최대 보유(exitbar) vs 장마감 청산 중 먼저 오는 것
+def exitplan(leg: Leg, entry_bar: int, entry_price: float, stop: float | None,
+             cfg: BacktestConfig, intraday: bool) -> tuple[int, float, str]:
+    hit = exitbar(leg.high, leg.low, leg.close, entry_bar, entry_price, stop, cfg)
+    # 같은 봉이면 장중 손절/익절이 종가 청산보다 먼저
+    if intraday:
+        j = int(leg.eod[entry_bar])
+        if hit is None or j < hit[0]:
+            return j, float(leg.close[j]), "eod"
+    if hit is None:
+        return leg.n - 1, float(leg.close[-1]), "end"
+    return hit
+
+
+# 다종목 동시 시뮬레이션 — 시계 순서대로 청산 → 평가 → 스캔 순서 매수 (슬롯/현금 한도)
+# intraday: Bot.loop 장중 규칙 (봉 마감 09:05~15:15 에만 스캔 + 당일 마지막 봉 종가 일괄 청산)
+def pbt(
+    candles: dict[str, list[dict]],
+    daily: dict[str, list[dict]],
+    cfg: BacktestConfig | None = None,
+    *,
+    cash: float = 10_000_000,
+    buy_percent: float | None = None,
+    target_buy_count: int | None = None,
+    intraday: bool = True,
+    tick: Callable[[], None] | None = None,
+) -> PortfolioResult:
+    cfg = cfg or BacktestConfig()
+    buy_percent = settings.buy_percent if buy_percent is None else buy_percent
+    target_buy_count = settings.target_buy_count if target_buy_count is None else target_buy_count
+
+    # 스캔 순서 = 입력 순서 (워치리스트 순서)
+    codes = [c for c, rows in candles.items() if rows]
+    legs = {c: Leg(c, candles[c], daily.get(c, [])) for c in codes}
+    clock = sorted({t for c in codes for t in legs[c].at})
+
+    initial = float(cash)
+    held: dict[str, Holding] = {}
+    marks: dict[str, float] = {}
+    trades: list[PortfolioTrade] = []
+    equity = [initial]
+    busy = 0
+    max_positions = 0
+
+    for t in clock:
+        if tick is not None:
+            tick()
+
+        # 1) 청산 — 예정된 청산 봉에 도달한 포지션 매도, 현금 회수
+        closed: set[str] = set()
+        for code, pos in list(held.items()):
+            leg = legs[code]
+            if leg.at.get(t) != pos.exit_bar:
+                continue
+            price = spx(pos.exit_price, cfg)
+            cash += pos.qty * price
+            pnl = (price - pos.entry_price) / pos.entry_price * 100
+            trades.append(PortfolioTrade(
+                code=code,
+                qty=pos.qty,
+                entry_bar=pos.entry_bar,
+                entry_time=ts(leg.candles[pos.entry_bar]["time"]),
+                entry_price=round(pos.entry_price, 0),
+                exit_bar=pos.exit_bar,
+                exit_time=ts(t),
+                exit_price=round(price, 0),
+                exit_reason=pos.reason,
+                pnl_pct=round(pnl, 2),
+                pnl_amount=round(pos.qty * (price - pos.entry_price), 0),
+                cost_bps=round(tcost(cfg), 2),
+            ))
+            del held[code]
+            closed.add(code)
+
+        for code in codes:
+            i = legs[code].at.get(t)
+            if i is not None:
+                marks[code] = float(legs[code].close[i])
+
+        # 2) 매수 스캔 — 스캔마다 현금 갱신 후 종목당 buy_percent, 슬롯 다 차면 중단
+        if (not intraday or window(t)) and len(held) < target_buy_count:
+            buy_amount = cash * buy_percent
+            pending = [c for c in codes if c not in held and c not in closed]
+            scores = batch(legs, pending, t)
+            for code in pending:
+                if len(held) >= target_buy_count:
+                    break
+                hit = scores.get(code)
+                if hit is None:
+                    continue
+                total, stop = hit
+                leg = legs[code]
+                i = leg.at[t]
+                if total < cfg.buy_threshold or i + 1 >= leg.n:
+                    continue
+                # 다음 봉 시가 체결 (슬리피지 반영)
+                entry_bar = i + 1
+                entry_price = bpx(float(leg.candles[entry_bar]["open"]), cfg)
+                qty = int(buy_amount // entry_price)
+                if qty <= 0:
+                    continue
+                cash -= qty * entry_price
+                j, price, reason = exitplan(leg, entry_bar, entry_price, stop, cfg, intraday)
+                held[code] = Holding(code, qty, entry_bar, entry_price, j, price, reason)
+
+        max_positions = max(max_positions, len(held))
+        busy += bool(held)
+        equity.append(cash + sum(pos.qty * marks.get(code, pos.entry_price) for code, pos in held.items()))
+
+    return pstat(codes, len(clock), initial, trades, equity, busy, max_positions, cfg)
+
+
+# 누적수익률, 연환산, MDD(시계 단위 평가액), 승률, 손익비, 종목별 요약
+def pstat(
+    codes: list[str],
+    total_bars: int,
+    initial: float,
+    trades: list[PortfolioTrade],
+    equity: list[float],
+    busy: int,
+    max_positions: int,
+    cfg: BacktestConfig,
+) -> PortfolioResult:
+    result = PortfolioResult(codes=codes, total_bars=total_bars, initial_cash=initial)
+    result.trades = trades
+    result.total_trades = len(trades)
+    result.max_positions = max_positions
+    result.final_equity = round(equity[-1], 0)
+    result.exposure_pct = round(busy / total_bars * 100, 1) if total_bars else 0.0
+    result.validation_warnings = [
+        "시장 국면 게이트·미체결/부분체결·호가 단위는 미반영 — 체결은 다음 봉 시가 가정",
+    ]
+    if total_bars < 500:
+        result.validation_warnings.append("시계 봉 수가 작아 결과 신뢰도가 낮습니다.")
+
+    growth = equity[-1] / initial if initial else 1.0
+    result.cum_return_pct = round((growth - 1.0) * 100, 2)
+    bars_per_year = 26 * 252
+    if total_bars > 0 and growth > 0:
+        result.annualized_pct = round(((growth ** (bars_per_year / total_bars)) - 1.0) * 100, 2)
+
+    curve = np.asarray(equity, dtype=np.float64)
+    peaks = np.maximum.accumulate(curve)
+    result.mdd_pct = round(float(((curve - peaks) / peaks * 100).min()), 2)
+
+    for code in codes:
+        mine = [t for t in trades if t.code == code]
+        if mine:
+            result.per_code[code] = {
+                "trades": len(mine),
+                "pnl_amount": round(sum(t.pnl_amount for t in mine), 0),
+                "win_rate_pct": round(sum(1 for t in mine if t.pnl_pct > 0) / len(mine) * 100, 1),
+            }
+
+    if not trades:
+        return result
+
+    wins = [t for t in trades if t.pnl_pct > 0]
+    losses = [t for t in trades if t.pnl_pct <= 0]
+    result.win_rate_pct = round(len(wins) / len(trades) * 100, 1)
+    avg_win = sum(t.pnl_pct for t in wins) / len(wins) if wins else 0
+    avg_loss = abs(sum(t.pnl_pct for t in losses) / len(losses)) if losses else 1
+    result.risk_reward = round(avg_win / avg_loss, 2) if avg_loss else 0
+    result.avg_trade_cost_bps = round(sum(t.cost_bps for t in trades) / len(trades), 2)
+    return result
+
+
+# 결과 직렬화 (API 응답)
+def prow(result: PortfolioResult) -> dict:
+    return asdict(result)
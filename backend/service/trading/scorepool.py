@@ -0,0 +1,77 @@
+# 스코어링 워커 풀 — 지표/SMC/팩터 계산을 이벤트 루프 밖에서 실행 (thread | process | inline)
+# 대기(제출 → 워커 시작)와 계산 시간을 분리 측정 — score_pool_seconds{phase}
+import asyncio
+import functools
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from config import settings
+from service.infra.metrics import score_pool_seconds
+
+# 풀 (지연 생성, 앱 종료 시 close)
+_pool: Executor | None = None
+
+_MODES = ("thread", "process", "inline")
+
+
+# 실행 방식 — 설정값 (알 수 없는 값은 thread)
+def mode() -> str:
+    return settings.score_pool if settings.score_pool in _MODES else "thread"
+
+
+# 워커 수 — 설정값(0이면 CPU 코어 수, 최대 4)
+def size() -> int:
+    return settings.score_workers or min(4, os.cpu_count() or 1)
+
+
+# process 워커 생성 방식 — 스레드가 도는 서버 프로세스에서 fork 하지 않도록 forkserver (스코어러 모듈 미리 import)
+def context() -> multiprocessing.context.BaseContext:
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["service.trading.strategy"])
+    return ctx
+
+
+# 풀 반환 (최초 호출 시 생성, inline 이면 None)
+def pool() -> Executor | None:
+    global _pool
+    if _pool is None and mode() != "inline":
+        if mode() == "process":
+            _pool = ProcessPoolExecutor(max_workers=size(), mp_context=context())
+        else:
+            _pool = ThreadPoolExecutor(max_workers=size(), thread_name_prefix="score")
+    return _pool
+
+
+# 풀 종료 (lifespan 종료 훅)
+def close() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# 워커 측 실행 — (시작 시각, 종료 시각, 결과). 시각은 프로세스 간 공통인 monotonic
+def timed(fn: Callable, *args: Any, **kwargs: Any) -> tuple[float, float, Any]:
+    start = time.monotonic()
+    result = fn(*args, **kwargs)
+    return start, time.monotonic(), result
+
+
+# fn(*args, **kwargs) 를 풀에서 실행 — process 모드면 fn/인자/결과는 pickle 가능해야 함
+async def run(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    sent = time.monotonic()
+    executor = pool()
+    if executor is None:
+        start, end, result = timed(fn, *args, **kwargs)
+    else:
+        loop = asyncio.get_running_loop()
+        start, end, result = await loop.run_in_executor(
+            executor, functools.partial(timed, fn, *args, **kwargs)
+        )
+    score_pool_seconds.labels(phase="queue").observe(max(0.0, start - sent))
+    score_pool_seconds.labels(phase="compute").observe(end - start)
+    return result
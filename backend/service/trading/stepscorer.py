@@ -0,0 +1,245 @@
+# 증분 스코어링 엔진 — 봉 단위로 지표/SMC 상태를 전진시켜 BacktestScorer.val 과 동일 점수 산출
+from dataclasses import dataclass
+
+import numpy as np
+
+from service.market import smc
+from service.market.smctrack import FvgTrack, SmcTracker, SwingTrack
+from service.trading.strategy import Scorer
+
+
+# 일봉 지표 증분 상태 — indicators.summary 와 같은 연산 순서로 RSI/MACD/볼린저 유지
+class DayInd:
+    def __init__(
+        self,
+        rsi_period: int = 14,
+        fast: int = 12,
+        slow: int = 26,
+        signal_period: int = 9,
+        bb_period: int = 20,
+        std_dev: float = 2.0,
+    ) -> None:
+        self.rsi_period = rsi_period
+        self.fast = fast
+        self.slow = slow
+        self.signal_period = signal_period
+        self.bb_period = bb_period
+        self.std_dev = std_dev
+        self.closes: list[float] = []
+        self.last: dict | None = None
+        # Wilder 평균 (초기 period 개는 단순평균)
+        self._gains: list[float] = []
+        self._losses: list[float] = []
+        self._avg_g = 0.0
+        self._avg_l = 0.0
+        # EMA 상태
+        self._kf = 2.0 / (fast + 1)
+        self._ks = 2.0 / (slow + 1)
+        self._kg = 2.0 / (signal_period + 1)
+        self._ema_f = 0.0
+        self._ema_s = 0.0
+        self._line = 0.0
+        self._sig = 0.0
+
+    # 일봉 1개 반영
+    def push(self, c: dict) -> None:
+        close = float(c["close"])
+        n = len(self.closes)
+        if n == 0:
+            self._ema_f = close
+            self._ema_s = close
+        else:
+            delta = close - self.closes[-1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            p = self.rsi_period
+            if n <= p:
+                self._gains.append(gain)
+                self._losses.append(loss)
+                if n == p:
+                    self._avg_g = np.array(self._gains).mean()
+                    self._avg_l = np.array(self._losses).mean()
+            else:
+                # indicators.rsis 재귀와 같은 계수/연산 순서
+                self._avg_g = gain * (1.0 / p) + self._avg_g * ((p - 1) / p)
+                self._avg_l = loss * (1.0 / p) + self._avg_l * ((p - 1) / p)
+            self._ema_f = close * self._kf + self._ema_f * (1 - self._kf)
+            self._ema_s = close * self._ks + self._ema_s * (1 - self._ks)
+        self._line = self._ema_f - self._ema_s
+        # 시그널 EMA 는 line[slow-1] 부터 시작
+        if n == self.slow - 1:
+            self._sig = self._line
+        elif n >= self.slow:
+            self._sig = self._line * self._kg + self._sig * (1 - self._kg)
+        self.closes.append(close)
+        self.last = c
+
+    def rsi(self) -> float | None:
+        if len(self.closes) < self.rsi_period + 1:
+            return None
+        if self._avg_l == 0:
+            return 100.0
+        return round(100 - 100 / (1 + self._avg_g / self._avg_l), 2)
+
+    def macd(self) -> dict | None:
+        if len(self.closes) < self.slow + self.signal_period:
+            return None
+        m, s = float(self._line), float(self._sig)
+        return {
+            "macd":      round(m, 2),
+            "signal":    round(s, 2),
+            "histogram": round(m - s, 2),
+        }
+
+    def bollinger(self) -> dict | None:
+        if len(self.closes) < self.bb_period:
+            return None
+        window = np.array(self.closes[-self.bb_period:], dtype=np.float64)
+        mid    = float(window.mean())
+        sd     = float(window.std(ddof=0))
+        return {
+            "upper":         round(mid + self.std_dev * sd, 2),
+            "middle":        round(mid, 2),
+            "lower":         round(mid - self.std_dev * sd, 2),
+            "current_price": float(self.closes[-1]),
+        }
+
+    # indicators.summary 와 동일 형태
+    def summary(self) -> dict:
+        return {
+            "rsi":       self.rsi(),
+            "macd":      self.macd(),
+            "bollinger": self.bollinger(),
+            "price":     self.last["close"] if self.last else None,
+            "volume":    self.last["volume"] if self.last else None,
+        }
+
+
+# 일봉 k개 시점의 스코어 입력 스냅샷 (가격 무관 부분)
+@dataclass
+class DayCtx:
+    candles: list[dict]
+    ind: dict
+    fvgs: list[dict]
+    obs: list[dict]
+    swings: list[dict]
+
+
+# 일봉 지표/FVG/스윙 증분 상태 — snap 으로 불변 스냅샷 발행
+class DayTrack:
+    def __init__(self) -> None:
+        self.ind = DayInd()
+        self.smc = SmcTracker()
+
+    @property
+    def candles(self) -> list[dict]:
+        return self.smc.candles
+
+    def push(self, c: dict) -> None:
+        self.ind.push(c)
+        self.smc.push(c)
+
+    # 이후 push 의 in-place mitigation/병합이 스냅샷에 번지지 않도록 구간 dict 복사
+    def snap(self) -> DayCtx:
+        return DayCtx(
+            candles=list(self.candles),
+            ind=self.ind.summary(),
+            fvgs=[dict(z) for z in self.smc.fvgs],
+            obs=[dict(z) for z in self.smc.obs],
+            swings=list(self.smc.swings),
+        )
+
+
+# 일봉 시점별 스냅샷 공유 저장소 — 여러 백테스트(walk-forward 창/격자)가 1회 계산을 재사용
+class DayBook:
+    def __init__(self, daily: list[dict]) -> None:
+        self.daily = daily
+        self._track = DayTrack()
+        self._snaps: dict[int, DayCtx] = {}
+
+    # daily 가 이 저장소 일봉의 앞부분인지 (동일 객체 기준)
+    def owns(self, daily) -> bool:
+        k = len(daily)
+        if k > len(self.daily):
+            return False
+        return k == 0 or daily[k - 1] is self.daily[k - 1]
+
+    # 일봉 k개 시점 스냅샷 — 전진 방향은 이어서 계산, 역행 시 재구성
+    def at(self, k: int) -> DayCtx:
+        snap = self._snaps.get(k)
+        if snap is not None:
+            return snap
+        if len(self._track.candles) > k:
+            self._track = DayTrack()
+        for j in range(len(self._track.candles), k):
+            self._track.push(self.daily[j])
+        snap = self._track.snap()
+        self._snaps[k] = snap
+        return snap
+
+
+# 백테스트용 증분 스코어러 — 15분봉은 push, 일봉은 sync 로 전진
+class StepScorer:
+    def __init__(self, book: DayBook | None = None) -> None:
+        self._s = Scorer()
+        self.book = book
+        self.days = DayTrack()
+        self._day: DayCtx | None = None
+        self._booked = False
+        self.f15 = FvgTrack()
+        self.s15 = SwingTrack()
+
+    # 마감된 15분봉 1개 반영
+    def push(self, bar: dict) -> None:
+        self.f15.push(bar)
+        self.s15.push(bar)
+
+    # 일봉 누적 구간 동기화 — 공유 저장소 우선, 아니면 자체 상태를 연장(불연속이면 재구성)
+    def sync(self, daily) -> None:
+        if self.book is not None and self.book.owns(daily):
+            self._day = self.book.at(len(daily))
+            self._booked = True
+            return
+        if self._booked:
+            self._day = None
+            self._booked = False
+        have = self.days.candles
+        n = len(have)
+        if len(daily) < n or (n and daily[n - 1] is not have[-1]):
+            self.days = DayTrack()
+            self._day = None
+            n = 0
+        if len(daily) == n and self._day is not None:
+            return
+        for j in range(n, len(daily)):
+            self.days.push(daily[j])
+        self._day = None
+
+    # 현재 일봉 스냅샷 (일봉이 바뀔 때만 재발행 — 하루 1회)
+    def day(self) -> DayCtx:
+        if self._day is None:
+            self._day = self.days.snap()
+        return self._day
+
+    # 9팩터 점수 + FVG 손절가 산출 (BacktestScorer.val 과 동일 규칙)
+    def val(self, price: int) -> tuple[float, float | None]:
+        d = self.day()
+        ind = d.ind
+        if self.f15.candles:
+            c, fvgs, swings = self.f15.candles, self.f15.live, self.s15.swings
+        else:
+            c, fvgs, swings = d.candles, d.fvgs, d.swings
+
+        rsi_s, _ = self._s.rsi(ind["rsi"])
+        macd_s, _ = self._s.macd(ind["macd"])
+        bb_s, _ = self._s.bb(ind["bollinger"])
+        vol_s, _ = self._s.vol(d.candles, price)
+        pred_s, _ = self._s.pred(None, price)
+        fvg_s, _ = self._s.fvg(d.candles, price, d.fvgs)
+        ob_s, _ = self._s.ob(d.candles, price, d.obs)
+        fvg15_s, _ = self._s.fvg15(c, price, fvgs)
+        str_s, _ = self._s.struct(c, swings)
+
+        total = rsi_s + macd_s + bb_s + vol_s + pred_s + fvg_s + ob_s + fvg15_s + str_s
+        stop = smc.stop(c, float(price), fvgs)
+        return round(total, 1), stop
@@ -3,10 +3,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
+import time
 from dataclasses import dataclass
 
 from service.market import indicators
 from service.market import smc
+from service.market.frame import frame
+from service.infra.metrics import score_factor_seconds
+from service.trading import scorepool
 from service.trading.ports import Quotes
 from service.infra.ttl_cache import TTLCache
 
@@ -27,9 +32,15 @@ W_STRUCT   = 8  # BOS/CHoCH 구조 점수
 BUY_THRESHOLD  = 55
 SELL_THRESHOLD = -40
 
-# 평가 캐시
+# 평가 캐시 — 종목 세대 + 입력 버전(마지막 일봉 날짜, 마지막 15분봉 시각, 가격 구간) 키
+# 15분봉 확정 이벤트는 종목 세대 값만 갱신 (키 스캔 없이 이전 세대 엔트리는 TTL 로 소멸)
+# TTL 은 이벤트가 오지 않는 종목(실시간 미구독)의 안전망 — 15분봉 1개 주기
 _cache = TTLCache()
-_TTL   = 120
+_TTL   = 900
+# 종목 세대 값 유지 시간 — 평가 엔트리 TTL 이상이어야 만료 후 이전 엔트리와 키가 겹치지 않음
+_GEN_TTL = 24 * 3600
+# 가격 구간 폭 (bp) — 같은 구간 안의 가격 변화는 재계산하지 않음
+_PRICE_BP = 10
 
 # 팩터 계산 입력 묶음
 @dataclass
@@ -94,6 +105,17 @@ class Scorer:
         mode = "fast" if fast else "full"
         return f"{mode}:{code}"
 
+    # 종목 세대 — 15분봉 확정 시 onbar 가 갱신 (없으면 0)
+    def gen(self, code: str) -> str:
+        return str(_cache.get(f"gen:{code}") or 0)
+
+    # 입력 버전 — 마지막 일봉 날짜 / 마지막 15분봉 시각 (시각 없으면 봉 수) / 로그 가격 구간 (_PRICE_BP 폭)
+    def version(self, candles: list[dict], candles_15m: list[dict] | None, price: int | None) -> str:
+        day = candles[-1].get("date", len(candles)) if len(candles) else ""
+        bar = candles_15m[-1].get("time", len(candles_15m)) if candles_15m else ""
+        step = math.log(price) / math.log1p(_PRICE_BP / 10_000) if price and price > 0 else 0
+        return f"{day}|{bar}|{int(step)}"
+
     # RSI 점수화 (-25 ~ +25)
     def rsi(self, val: float | None) -> tuple[float, str]:
         if val is None:
@@ -171,33 +193,33 @@ class Scorer:
         return 0, f"변동성 미돌파 (목표 {target:,.0f})"
 
     # 일봉 FVG 근접도 점수화 (-8 ~ +8)
-    def fvg(self, candles: list[dict], price: int) -> tuple[float, str]:
+    def fvg(self, candles: list[dict], price: int, zones: list[dict] | None = None) -> tuple[float, str]:
         try:
-            s, r = smc.fvg(candles, float(price))
+            s, r = smc.fvg(candles, float(price), zones)
             return round(s * (W_FVG / 8), 1), r
         except Exception:
             return 0.0, "FVG 계산 오류"
 
     # OB 지지/저항 점수화 (-7 ~ +7)
-    def ob(self, candles: list[dict], price: int) -> tuple[float, str]:
+    def ob(self, candles: list[dict], price: int, zones: list[dict] | None = None) -> tuple[float, str]:
         try:
-            s, r = smc.ob(candles, float(price))
+            s, r = smc.ob(candles, float(price), zones)
             return round(s * (W_OB / 7), 1), r
         except Exception:
             return 0.0, "OB 계산 오류"
 
     # 15분봉 FVG 점수화 (-15 ~ +15) — 실제 진입 트리거
-    def fvg15(self, candles_15m: list[dict], price: int) -> tuple[float, str]:
+    def fvg15(self, candles_15m: list[dict], price: int, zones: list[dict] | None = None) -> tuple[float, str]:
         try:
-            s, r, _ = smc.fvgin(candles_15m, float(price))
+            s, r, _ = smc.fvgin(candles_15m, float(price), zones)
             return round(s * (W_FVG_15M / 10), 1), r
         except Exception:
             return 0.0, "15m FVG 계산 오류"
 
     # BOS/CHoCH 구조 점수화 (-8 ~ +8)
-    def struct(self, candles: list[dict]) -> tuple[float, str]:
+    def struct(self, candles: list[dict], swings: list[dict] | None = None) -> tuple[float, str]:
         try:
-            s, r = smc.struct(candles)
+            s, r = smc.struct(candles, swings)
             return round(s * (W_STRUCT / 5), 1), r
         except Exception:
             return 0.0, "구조 분석 오류"
@@ -228,83 +250,241 @@ class Scorer:
             return -W_PREDICT * 0.5, f"방향 필터: 약하락 {change_pct:.1f}%"
         return 0, f"방향 필터: 중립 {change_pct:+.1f}%"
 
+    # 평가 입력 조회 — (일봉, 현재가 정보, 15분봉 또는 None)
+    # timings 전달 시 조회별 소요 시간(초) 기록 — fetch.daily / fetch.price / fetch.c15
+    async def fetch(
+        self, code: str, fast: bool, timings: dict | None = None,
+    ) -> tuple[list[dict], dict, list[dict] | None]:
+        b = self.broker
+        t = timings if timings is not None else {}
+        if fast:
+            candles, price_info = await asyncio.gather(
+                clock("fetch.daily", b.daily(code), t), clock("fetch.price", b.price(code), t),
+            )
+            return candles, price_info, None
+        return await asyncio.gather(
+            clock("fetch.daily", b.daily(code), t), clock("fetch.price", b.price(code), t),
+            clock("fetch.c15", b.c15(code), t),
+        )
+
+    # 조회된 입력 → 평가 결과 (ind 전달 시 일봉 지표 재계산 생략 — 일괄 평가용)
+    def score(
+        self,
+        candles: list[dict],
+        price_info: dict,
+        candles_15m: list[dict] | None,
+        prediction: dict | None,
+        fast: bool,
+        ind: dict | None = None,
+        timings: dict | None = None,
+    ) -> dict:
+        t = timings if timings is not None else {}
+        current_price = price_info["price"]
+        # 컬럼형 변환 1회 — 이후 지표/SMC 팩터는 배열 뷰 공유 (dict 재추출 없음)
+        candles = frame(candles)
+        if candles_15m:
+            candles_15m = frame(candles_15m)
+        if ind is None:
+            t0 = time.perf_counter()
+            ind = indicators.summary(candles)
+            t["indicators"] = time.perf_counter() - t0
+
+        fi = FactorInput(
+            ind=ind,
+            candles=candles,
+            price=current_price,
+            prediction=prediction,
+            candles_15m=candles_15m,
+            fast=fast,
+        )
+        total = 0
+        factors = []
+        for name, maxw, fn in _FACTORS:
+            t0 = time.perf_counter()
+            score, reason = fn(self, fi)
+            t[name] = time.perf_counter() - t0
+            total += score
+            factors.append({"name": name, "score": round(score, 1), "max": maxw, "reason": reason})
+
+        # 동적 손절가는 full 평가 + 실제 15분봉 데이터가 있을 때만 계산
+        t0 = time.perf_counter()
+        stop_price = (
+            smc.stop(candles_15m, float(current_price))
+            if candles_15m
+            else None
+        )
+        t["stop"] = time.perf_counter() - t0
+
+        if total >= BUY_THRESHOLD:
+            signal  = "buy"
+            summary = f"매수 시그널 (스코어 {total:+.0f}/100)"
+        elif total <= SELL_THRESHOLD:
+            signal  = "sell"
+            summary = f"매도 시그널 (스코어 {total:+.0f}/100)"
+        else:
+            signal  = "hold"
+            summary = f"관망 (스코어 {total:+.0f}/100)"
+
+        return {
+            "signal":     signal,
+            "score":      round(total, 1),
+            "factors":    factors,
+            "summary":    summary,
+            "price":      current_price,
+            "stop_price": stop_price,
+        }
+
+    # 평가 실패 결과
+    def failed(self) -> dict:
+        return {
+            "signal":     "hold",
+            "score":      0,
+            "factors":    [],
+            "summary":    "평가 실패 (서버 로그 참조)",
+            "price":      0,
+            "stop_price": None,
+        }
+
     # 종목 종합 평가 (멀티팩터 + 15분봉 FVG 앙상블)
     # fast=True: 1단계 스크리닝용 (15분봉 스킵 → API 호출 2건으로 축소)
-    async def evaluate(self, code: str, prediction: dict | None = None, fast: bool = False) -> dict:
+    # debug=True: 캐시를 거치지 않고 계산, 결과에 구간별 소요 시간(ms) "timing" 포함
+    async def evaluate(
+        self, code: str, prediction: dict | None = None, fast: bool = False, debug: bool = False,
+    ) -> dict:
         cache_key = self.ckey(code, fast=fast, prediction=prediction)
-        if cache_key is not None:
-            cached = _cache.get(cache_key)
-            if cached is not None:
-                return cached
+        timings: dict[str, float] = {}
         try:
-            b = self.broker
-            if fast:
-                candles, price_info = await asyncio.gather(
-                    b.daily(code), b.price(code),
-                )
-                candles_15m = None
-            else:
-                candles, price_info, candles_15m = await asyncio.gather(
-                    b.daily(code), b.price(code), b.c15(code),
-                )
-            current_price = price_info["price"]
-            ind = indicators.summary(candles)
-
-            fi = FactorInput(
-                ind=ind,
-                candles=candles,
-                price=current_price,
-                prediction=prediction,
-                candles_15m=candles_15m,
-                fast=fast,
-            )
-            total = 0
-            factors = []
-            for name, maxw, fn in _FACTORS:
-                score, reason = fn(self, fi)
-                total += score
-                factors.append({"name": name, "score": round(score, 1), "max": maxw, "reason": reason})
-
-            # 동적 손절가는 full 평가 + 실제 15분봉 데이터가 있을 때만 계산
-            stop_price = (
-                smc.stop(candles_15m, float(current_price))
-                if candles_15m
-                else None
-            )
-
-            if total >= BUY_THRESHOLD:
-                signal  = "buy"
-                summary = f"매수 시그널 (스코어 {total:+.0f}/100)"
-            elif total <= SELL_THRESHOLD:
-                signal  = "sell"
-                summary = f"매도 시그널 (스코어 {total:+.0f}/100)"
-            else:
-                signal  = "hold"
-                summary = f"관망 (스코어 {total:+.0f}/100)"
-
-            result = {
-                "signal":     signal,
-                "score":      round(total, 1),
-                "factors":    factors,
-                "summary":    summary,
-                "price":      current_price,
-                "stop_price": stop_price,
-            }
-
+            try:
+                candles, price_info, candles_15m = await self.fetch(code, fast, timings)
+            finally:
+                observe(timings, fast)
+            if cache_key is not None:
+                cache_key = f"{cache_key}:{self.gen(code)}:{self.version(candles, candles_15m, price_info.get('price'))}"
+                cached = None if debug else _cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            result, spent = await scorepool.run(scoreone, candles, price_info, candles_15m, prediction, fast)
+            observe(spent, fast)
             if cache_key is not None:
                 _cache.set(cache_key, result, _TTL)
-            return result
+            return breakdown(result, timings | spent) if debug else result
 
         except Exception as e:
             logger.error(f"Strategy evaluate failed for {code}: {e}")
-            return {
-                "signal":     "hold",
-                "score":      0,
-                "factors":    [],
-                "summary":    "평가 실패 (서버 로그 참조)",
-                "price":      0,
-                "stop_price": None,
-            }
+            return self.failed()
+
+    # 여러 종목 일괄 평가 — 입력 조회는 동시 concurrency 건까지, 일봉 RSI/MACD/볼린저는 (종목 × 봉) 행렬 1회 연산
+    # 종목별 결과는 evaluate 와 동일 (캐시 공유, 실패 종목은 평가 실패 결과)
+    async def evaluate_many(
+        self,
+        codes: list[str],
+        *,
+        fast: bool = False,
+        predictions: dict[str, dict | None] | None = None,
+        concurrency: int = 10,
+        debug: bool = False,
+    ) -> dict[str, dict]:
+        predictions = predictions or {}
+        out: dict[str, dict] = {}
+        todo = list(dict.fromkeys(codes))
+
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        timings: dict[str, dict[str, float]] = {code: {} for code in todo}
+
+        # 종목별 입력 조회 (실패는 None)
+        async def load(code: str):
+            async with sem:
+                try:
+                    return await self.fetch(code, fast, timings[code])
+                except Exception as e:
+                    logger.error(f"Strategy evaluate failed for {code}: {e}")
+                    return None
+                finally:
+                    observe(timings[code], fast)
+
+        loaded = await asyncio.gather(*[load(code) for code in todo])
+        ready = []
+        keys: dict[str, str] = {}
+        for code, data in zip(todo, loaded):
+            if data is None:
+                out[code] = self.failed()
+                continue
+            cache_key = self.ckey(code, fast=fast, prediction=predictions.get(code))
+            if cache_key is not None:
+                keys[code] = cache_key = f"{cache_key}:{self.gen(code)}:{self.version(data[0], data[2], data[1].get('price'))}"
+                cached = None if debug else _cache.get(cache_key)
+                if cached is not None:
+                    out[code] = cached
+                    continue
+            ready.append((code, data))
+
+        items = [(code, *data, predictions.get(code)) for code, data in ready]
+        results, shared = await scorepool.run(scoremany, items, fast)
+        observe(shared, fast)
+        for (code, _), (result, spent) in zip(ready, results):
+            if result is None:
+                out[code] = self.failed()
+                continue
+            observe(spent, fast)
+            if code in keys:
+                _cache.set(keys[code], result, _TTL)
+            out[code] = breakdown(result, timings[code] | shared | spent) if debug else result
+        return {code: out[code] for code in dict.fromkeys(codes)}
+
+# 풀 작업 — 종목 1건 (점수, 구간별 소요 시간) (process 워커에서도 실행되도록 모듈 함수, broker 불필요)
+def scoreone(
+    candles, price_info: dict, candles_15m, prediction: dict | None, fast: bool,
+) -> tuple[dict, dict[str, float]]:
+    timings: dict[str, float] = {}
+    return Scorer().score(candles, price_info, candles_15m, prediction, fast, timings=timings), timings
+
+# 풀 작업 — 여러 종목 점수, 일봉 지표는 (종목 × 봉) 행렬 1회 연산
+# items: (code, 일봉, 현재가, 15분봉, 예측) → ([(점수 | 실패 None, 소요 시간)], 일괄 지표 소요 시간)
+def scoremany(items: list[tuple], fast: bool) -> tuple[list[tuple[dict | None, dict]], dict[str, float]]:
+    s = Scorer()
+    t0 = time.perf_counter()
+    dailies = [frame(item[1]) for item in items]
+    try:
+        inds = indicators.summaries(dailies)
+    except Exception as e:
+        logger.error(f"Strategy batch indicators failed: {e}")
+        inds = [None] * len(items)
+    shared = {"indicators": time.perf_counter() - t0} if items else {}
+    out: list[tuple[dict | None, dict]] = []
+    for (code, _, price_info, candles_15m, prediction), candles, ind in zip(items, dailies, inds):
+        timings: dict[str, float] = {}
+        try:
+            out.append((s.score(candles, price_info, candles_15m, prediction, fast, ind, timings), timings))
+        except Exception as e:
+            logger.error(f"Strategy evaluate failed for {code}: {e}")
+            out.append((None, timings))
+    return out, shared
+
+# 입력 조회 1건 — 완료(실패 포함)까지 소요 시간(초)을 timings[name] 에 기록
+async def clock(name: str, aw, timings: dict[str, float]):
+    t0 = time.perf_counter()
+    try:
+        return await aw
+    finally:
+        timings[name] = time.perf_counter() - t0
+
+# 구간별 소요 시간 → score_factor_seconds{factor, mode}
+def observe(timings: dict[str, float], fast: bool) -> None:
+    mode = "fast" if fast else "full"
+    for name, seconds in timings.items():
+        score_factor_seconds.labels(factor=name, mode=mode).observe(seconds)
+
+# 디버그 결과 — 캐시 원본은 두고 사본에 구간별 소요 시간(ms) 추가
+def breakdown(result: dict, timings: dict[str, float]) -> dict:
+    return result | {"timing": {name: round(seconds * 1000, 3) for name, seconds in timings.items()}}
+
+# CandleStore 15분봉 확정 이벤트 핸들러 — 종목 세대 갱신 (set 1회, 다음 평가는 새 키로 즉시 재계산)
+async def onbar(event: str, data: dict | None) -> None:
+    data = data or {}
+    if data.get("interval", 15) != 15 or not data.get("code"):
+        return
+    _cache.set(f"gen:{data['code']}", time.time_ns(), _GEN_TTL)
 
 # 모듈 레벨 싱글턴 인스턴스 (broker는 합성 루트 main.py에서 bind)
 scorer = Scorer()
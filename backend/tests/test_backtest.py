@@ -1,4 +1,5 @@
 import datetime
+import random
 import sys
 import tempfile
 import unittest
@@ -7,7 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from service.market.candle_store import CandleStore
-from service.trading.backtest import BacktestConfig, bt, grid, wf
+from service.trading.backtest import BacktestConfig, bt, exitbar, grid, hlc, spans, wf
 from service.trading.regime import regime as mkt
 from service.trading.research import wftab, wfrows
 
@@ -103,6 +104,73 @@ class BacktestResearchTest(unittest.TestCase):
         self.assertLessEqual(windows[0]["start_time"], windows[0]["end_time"])
         self.assertLess(windows[0]["end_time"], windows[1]["start_time"])
 
+    def test_walk_forward_modes(self):
+        self.assertEqual(spans(10, 3), [(0, 3), (3, 6), (6, 10)])
+        self.assertEqual(spans(10, 3, "anchored"), [(0, 3), (0, 6), (0, 10)])
+        self.assertEqual(spans(3, 5), [(0, 1), (1, 2), (2, 3)])
+        with self.assertRaises(ValueError):
+            spans(10, 3, "expanding")
+
+        cfg = BacktestConfig(buy_threshold=-999, fee_bps=0, sell_tax_bps=0, slippage_bps=0, spread_bps=0)
+        windows = wf("005930", bars(), dayset(), cfg, windows=2, mode="anchored")
+
+        self.assertEqual(windows[0]["start_time"], windows[1]["start_time"])
+        self.assertGreater(windows[1]["total_bars"], windows[0]["total_bars"])
+
+    # 벡터 청산 탐색 — 봉별 분기 순회(손절 → 폴백 → 익절 → 최대 보유)와 동일
+    def test_exit_resolver_matches_bar_loop(self):
+        def scan(candles, entry_bar, entry_price, stop_price, cfg):
+            fallback = entry_price * (1 - cfg.fallback_stop_pct / 100)
+            tp_price = entry_price * (1 + cfg.take_profit_pct / 100)
+            for i in range(entry_bar, len(candles)):
+                bar = candles[i]
+                if stop_price and bar["low"] <= stop_price:
+                    return i, stop_price, "stop"
+                if bar["low"] <= fallback:
+                    return i, fallback, "stop"
+                if bar["high"] >= tp_price:
+                    return i, tp_price, "tp"
+                if i - entry_bar >= cfg.max_hold_bars:
+                    return i, float(bar["close"]), "trail"
+            return None
+
+        rng = random.Random(5)
+        price, candles = 100, []
+        for _ in range(300):
+            o = price + rng.randint(-2, 2)
+            c = o + rng.randint(-3, 3)
+            candles.append({"high": max(o, c) + rng.randint(0, 2), "low": min(o, c) - rng.randint(0, 2), "close": c})
+            price = c
+        high, low, close = hlc(candles)
+        for _ in range(400):
+            entry_bar = rng.randrange(len(candles))
+            entry_price = float(candles[entry_bar]["close"] + rng.randint(-2, 2))
+            stop_price = rng.choice([None, 0, entry_price - rng.randint(1, 4)])
+            cfg = BacktestConfig(
+                take_profit_pct=rng.choice([0.5, 1.0, 3.0]),
+                fallback_stop_pct=rng.choice([0.5, 2.0, 5.0]),
+                max_hold_bars=rng.choice([1, 5, 20, 100]),
+            )
+            self.assertEqual(
+                exitbar(high, low, close, entry_bar, entry_price, stop_price, cfg),
+                scan(candles, entry_bar, entry_price, stop_price, cfg),
+            )
+
+    # 격자 설정 간 봉 점수 공유 — 설정별 단독 실행과 동일 결과
+    def test_grid_shared_scores_match_single_runs(self):
+        cfg = BacktestConfig(fee_bps=0, sell_tax_bps=0, slippage_bps=0, spread_bps=0)
+        axes = dict(buy_thresholds=[-999, 0], take_profit_pcts=[1.0, 5.0], stop_pcts=[0.5, 3.0])
+        rows = grid("005930", bars(), dayset(), cfg, **axes)
+        single = [
+            bt("005930", bars(), dayset(), BacktestConfig(
+                buy_threshold=r["buy_threshold"], take_profit_pct=r["take_profit_pct"],
+                fallback_stop_pct=r["fallback_stop_pct"], fee_bps=0, sell_tax_bps=0, slippage_bps=0, spread_bps=0,
+            ))
+            for r in rows
+        ]
+        self.assertEqual([r["cum_return_pct"] for r in rows], [s.cum_return_pct for s in single])
+        self.assertEqual([r["total_trades"] for r in rows], [s.total_trades for s in single])
+
     def test_market_regime_blocks_new_buys_on_broad_selloff(self):
         regime = mkt([
             {"code": "KOSPI", "change_percent": -1.4},
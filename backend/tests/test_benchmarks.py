@@ -0,0 +1,47 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks import legacy, run
+from benchmarks.synth import dataset
+from service.market import smc
+from service.market.frame import frame
+
+
+# 벤치마크 러너 — 합성 데이터 형태 + JSON 보고서 스키마
+class BenchmarkRunnerTest(unittest.TestCase):
+    # 15분봉 n개, 일봉은 첫 세션 이전 warmup + 세션 구간까지 (미래 일봉 없음)
+    def test_dataset_shape(self):
+        c15, daily = dataset(300, warmup=40)
+        self.assertEqual(len(c15), 300)
+        first = c15[0]["time"].date().isoformat()
+        self.assertEqual(sum(1 for d in daily if d["date"] < first), 40)
+        self.assertEqual(daily[-1]["date"], c15[-1]["time"].date().isoformat())
+        self.assertEqual(dataset(300, warmup=40), (c15, daily))
+
+    def test_report_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "bench.json"
+            rc = run.main(["--sizes", "200", "--repeat", "1", "--only", "bt,smc.fvgz", "--out", str(out)])
+            report = json.loads(out.read_text())
+        self.assertEqual(rc, 0)
+        self.assertEqual([r["name"] for r in report["results"]], ["bt", "smc.fvgz"])
+        self.assertEqual(report["results"][0]["bars"], 200)
+        self.assertIn("git_rev", report["meta"])
+        self.assertGreater(report["results"][0]["best_s"], 0)
+
+
+    # 벡터화 swing/obz == 봉 루프 기준 구현 (dict 리스트/프레임, 여러 창 길이)
+    def test_legacy_parity(self):
+        c15, _ = dataset(2000)
+        for src in (c15, frame(c15)):
+            for length in (2, 5):
+                self.assertEqual(smc.swing(src, length), legacy.swing(c15, length))
+                self.assertEqual(smc.obz(src, length), legacy.obz(c15, length))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.infra.event_bus import EventBus
+from service.infra.ttl_cache import TTLCache
+from service.market import candle_store as candle_module
+from service.market.candle_store import CandleStore
+from service.trading import btcache
+from service.trading.backtest import BacktestConfig
+
+
+def fresh() -> TTLCache:
+    with mock.patch.object(TTLCache, "conn", lambda self: None):
+        return TTLCache()
+
+
+# 결과 캐시 키/무효화 — 입력 지문이 같으면 같은 키, flush 이벤트로 종목 단위 폐기
+class BacktestCacheTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(btcache, "_cache", fresh())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key_is_content_addressed(self):
+        sig = [("2026-03-02_15m.csv", 10, 200)]
+        daily = btcache.digest([{"date": "2026-03-01", "close": 100}])
+        k = btcache.key("api", "005930", sig, daily, cfg=BacktestConfig())
+        self.assertEqual(k, btcache.key("api", "005930", list(sig), daily, cfg=BacktestConfig()))
+        self.assertTrue(k.startswith("bt:005930:api:"))
+        self.assertNotEqual(k, btcache.key("api", "005930", sig, daily, cfg=BacktestConfig(buy_threshold=60)))
+        self.assertNotEqual(k, btcache.key("api", "005930", [("2026-03-02_15m.csv", 11, 200)], daily, cfg=BacktestConfig()))
+        self.assertNotEqual(daily, btcache.digest([{"date": "2026-03-01", "close": 101}]))
+
+    def test_flush_event_drops_codes(self):
+        btcache.put("bt:005930:api:x", {"a": 1})
+        btcache.put("bt:000660:api:y", {"b": 2})
+        asyncio.run(btcache.onflush("flush", {"codes": ["005930"]}))
+        self.assertIsNone(btcache.get("bt:005930:api:x"))
+        self.assertEqual(btcache.get("bt:000660:api:y"), {"b": 2})
+        asyncio.run(btcache.onflush("flush", None))
+        self.assertIsNone(btcache.get("bt:000660:api:y"))
+
+    # CandleStore.flush — 저장 종목 통지, 파일 지문 갱신
+    def test_candle_flush_emits_and_changes_sig(self):
+        events = []
+        bus = EventBus()
+        bus.on("flush", lambda event, data: events.append(data))
+
+        async def main(store):
+            await store.ingest("005930", 100, 10, datetime.datetime(2026, 3, 2, 9, 1))
+            await store.flush("2026-03-02")
+            await bus.fire(*bus._local_queue.get_nowait().values())
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(candle_module, "bus", bus):
+            store = CandleStore(Path(tmp))
+            self.assertEqual(store.sig("005930"), [])
+            asyncio.run(main(store))
+            sig = store.sig("005930")
+            self.assertEqual([name for name, *_ in sig], ["2026-03-02_15m.csv"])
+            self.assertEqual(len(store.span("005930")), 1)
+        self.assertEqual(events, [{"date": "2026-03-02", "codes": ["005930"]}])
+
+
+if __name__ == "__main__":
+    unittest.main()
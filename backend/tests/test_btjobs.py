@@ -0,0 +1,230 @@
+import asyncio
+import datetime
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.backtest as backtest_api
+from service.infra.ttl_cache import TTLCache
+from service.trading import btjobs, btpool
+from service.trading.backtest import BacktestConfig, bt
+from tests.test_stepscorer import bars, days
+
+
+# 작업 큐 — 상태 전이/진행률/취소/대기열 한도
+class BacktestJobTest(unittest.TestCase):
+    def setUp(self):
+        btjobs._jobs.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        btjobs.close()
+
+    # bt 봉 콜백으로 진행률 집계, 완료 시 결과 보관
+    def test_runs_off_loop_with_progress(self):
+        c15, daily = bars(6, datetime.date(2025, 11, 20)), days(60)
+
+        async def work(job):
+            job.total = len(c15) - 1
+            result = await btjobs.offload(bt, "005930", c15, daily, BacktestConfig(), tick=job.tick)
+            return {"total_bars": result.total_bars}
+
+        async def main():
+            job = btjobs.submit("005930", work)
+            await btjobs.wait(job)
+            return job
+
+        job = asyncio.run(main())
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.bars, len(c15) - 1)
+        self.assertEqual(job.view()["progress_pct"], 100.0)
+        self.assertEqual(job.view()["result"], {"total_bars": len(c15)})
+
+    # 실행 중 취소 — 다음 봉 콜백에서 중단
+    def test_cancel_running(self):
+        started = asyncio.Event()
+
+        def loop(job):
+            while True:
+                job.tick()
+                time.sleep(0.001)
+
+        async def work(job):
+            started.set()
+            return await btjobs.offload(loop, job)
+
+        async def main():
+            job = btjobs.submit("005930", work)
+            await started.wait()
+            btjobs.cancel(job.id)
+            await btjobs.wait(job)
+            return job
+
+        job = asyncio.run(main())
+        self.assertEqual(job.status, "cancelled")
+        self.assertTrue(job.stop)
+
+    # 실패는 상태/메시지로 보관 (작업 큐는 계속 동작)
+    def test_failure_recorded(self):
+        async def work(job):
+            raise ValueError("boom")
+
+        async def main():
+            return await btjobs.wait(btjobs.submit("005930", work))
+
+        job = asyncio.run(main())
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, "boom")
+
+    # 대기열 한도 초과 시 JobsFull, 실행 슬롯 초과분은 queued 유지
+    def test_queue_bounded(self):
+        async def work(job):
+            await asyncio.sleep(10)
+
+        async def main():
+            with mock.patch.object(btjobs.settings, "backtest_job_queue", 3), \
+                    mock.patch.object(btjobs.settings, "backtest_jobs", 1):
+                queued = [btjobs.submit("005930", work) for _ in range(3)]
+                await asyncio.sleep(0)
+                with self.assertRaises(btjobs.JobsFull):
+                    btjobs.submit("005930", work)
+                states = [j.status for j in queued]
+                for j in queued:
+                    btjobs.cancel(j.id)
+                await asyncio.gather(*(btjobs.wait(j) for j in queued))
+                return states, [j.status for j in queued]
+
+        states, final = asyncio.run(main())
+        self.assertEqual(states, ["running", "queued", "queued"])
+        self.assertEqual(final, ["cancelled"] * 3)
+
+
+# 인메모리 전용 캐시 (Redis 연결 시도 없음)
+def fresh() -> TTLCache:
+    with mock.patch.object(TTLCache, "conn", lambda self: None):
+        return TTLCache()
+
+
+# 작업 API — 제출 → 폴링 → 결과, SSE 종료 이벤트
+class BacktestJobApiTest(unittest.TestCase):
+    def setUp(self):
+        btjobs._jobs.clear()
+        app = FastAPI()
+        app.include_router(backtest_api.router)
+        self.client = TestClient(app)
+        self.c15, self.daily = bars(4, datetime.date(2025, 11, 20)), days(60)
+        patches = [
+            mock.patch.object(backtest_api.store, "span", return_value=self.c15),
+            mock.patch.object(backtest_api.store, "sig", return_value=[("2025-11-20_15m.csv", 1, 1)]),
+            mock.patch.object(backtest_api.btcache, "_cache", fresh()),
+            mock.patch.object(backtest_api.daily_store, "recent", return_value=self.daily),
+            mock.patch.object(backtest_api, "wftab", return_value=1),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(btpool.close)
+
+    def poll(self, job_id: str) -> dict:
+        for _ in range(500):
+            data = self.client.get(f"/api/backtest/jobs/{job_id}").json()
+            if data["status"] not in ("queued", "running"):
+                return data
+            time.sleep(0.01)
+        self.fail("job did not finish")
+
+    def test_submit_poll_result(self):
+        with self.client:
+            resp = self.client.post("/api/backtest/jobs", json={"code": "5930", "wf_windows": 3})
+            self.assertEqual(resp.status_code, 202)
+            data = self.poll(resp.json()["job_id"])
+        self.assertEqual(data["status"], "done")
+        self.assertEqual(data["code"], "005930")
+        self.assertEqual(data["bars"], data["total_bars"])
+        self.assertEqual(data["result"]["total_bars"], len(self.c15))
+        self.assertEqual(len(data["result"]["validation"]["walk_forward"]), 3)
+        self.assertIn("monte_carlo", data["result"]["validation"])
+
+    def test_events_stream_ends_with_result(self):
+        with self.client:
+            job_id = self.client.post(
+                "/api/backtest/jobs", json={"code": "005930", "include_validation": False},
+            ).json()["job_id"]
+            body = self.client.get(f"/api/backtest/jobs/{job_id}/events").text
+        self.assertIn("event: done", body)
+        self.assertIn('"result"', body)
+
+    # 동기 경로도 같은 결과, 데이터 부족은 기존대로 400
+    def test_sync_route_and_errors(self):
+        with self.client:
+            resp = self.client.post("/api/backtest", json={"code": "005930", "include_validation": False})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json()["total_bars"], len(self.c15))
+            with mock.patch.object(backtest_api.store, "span", return_value=self.c15[:10]):
+                self.assertEqual(
+                    self.client.post("/api/backtest", json={"code": "005930"}).status_code, 400,
+                )
+            self.assertEqual(self.client.get("/api/backtest/jobs/nope").status_code, 404)
+
+    # 같은 입력·파라미터 재실행은 캐시 결과, 격자는 겹치는 설정만 재사용
+    def test_result_cache(self):
+        body = {"code": "005930", "wf_windows": 2}
+        with self.client:
+            first = self.client.post("/api/backtest", json=body).json()
+            with mock.patch.object(backtest_api, "bt", side_effect=AssertionError("recomputed")):
+                again = self.client.post("/api/backtest", json=body).json()
+            self.assertFalse(first.pop("cached"))
+            self.assertTrue(again.pop("cached"))
+            self.assertEqual(again, first)
+
+            # 임계값 +5 이동 → 격자 27개 중 18개 캐시 적중, 미스 9개만 실행
+            job = self.client.post("/api/backtest/jobs", json={**body, "buy_threshold": 60.0}).json()
+            data = self.poll(job["job_id"])
+            n = len(self.c15)
+            walk = sum(b - a for a, b in backtest_api.spans(n, 2, "rolling"))
+            self.assertEqual(data["total_bars"], n - 1 + 9 * n + walk)
+
+            # 15분봉 파일 지문 변경 → 전체 재계산
+            with mock.patch.object(backtest_api.store, "sig", return_value=[("2025-11-20_15m.csv", 2, 1)]):
+                self.assertFalse(self.client.post("/api/backtest", json=body).json()["cached"])
+
+    # 파라미터 탐색 작업 — 진행률 = 예정 평가 봉 수, 재요청은 캐시
+    def test_search_job(self):
+        body = {"code": "005930", "configs": 20, "rungs": 2, "buy_thresholds": [-10, 0, 10, 20, 30]}
+        with self.client:
+            resp = self.client.post("/api/backtest/search", json=body)
+            self.assertEqual(resp.status_code, 202)
+            data = self.poll(resp.json()["job_id"])
+            self.assertEqual(data["status"], "done")
+            self.assertEqual(data["bars"], data["total_bars"])
+            result = data["result"]
+            self.assertEqual(result["evaluation_count"], 25)
+            self.assertEqual([s["configs"] for s in result["rungs"]], [20, 5])
+            self.assertFalse(result["cached"])
+            again = self.poll(self.client.post("/api/backtest/search", json=body).json()["job_id"])
+            self.assertTrue(again["result"]["cached"])
+
+    # 포트폴리오 작업 — 종목별 데이터 로드 후 공용 시계 진행률
+    def test_portfolio_job(self):
+        with self.client:
+            resp = self.client.post(
+                "/api/backtest/portfolio",
+                json={"codes": ["005930", "000660"], "buy_threshold": -50, "target_buy_count": 1},
+            )
+            self.assertEqual(resp.status_code, 202)
+            data = self.poll(resp.json()["job_id"])
+        self.assertEqual(data["status"], "done")
+        self.assertEqual(data["bars"], data["total_bars"])
+        self.assertEqual(data["result"]["codes"], ["005930", "000660"])
+        self.assertEqual(data["result"]["max_positions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
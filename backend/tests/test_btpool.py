@@ -0,0 +1,63 @@
+import asyncio
+import datetime
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.trading import btpool
+from service.trading.backtest import BacktestConfig, grid, wf
+from tests.test_stepscorer import bars, days
+
+
+_AXES = dict(buy_thresholds=[-10, 0, 10], take_profit_pcts=[0.5, 1.0], stop_pcts=[0.5, 1.0])
+
+
+# 프로세스 풀 격자 — 직렬 grid 와 동일 행/순서 + 공유메모리 왕복
+class BacktestPoolTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.daily = days(60)
+        cls.c15 = bars(6, datetime.date(2025, 11, 20))
+        cls.cfg = BacktestConfig()
+
+    @classmethod
+    def tearDownClass(cls):
+        btpool.close()
+
+    # 공유메모리 pack/unpack 후 dict 원형 복원 (int 시세·datetime·date 문자열)
+    def test_pack_roundtrip(self):
+        shm, spec = btpool.pack(self.c15, self.daily)
+        try:
+            c15, daily = btpool.unpack(spec)
+        finally:
+            btpool.free(shm)
+        self.assertEqual(c15, self.c15)
+        self.assertEqual(daily, [{k: r[k] for k in ("date", *btpool._COLS)} for r in self.daily])
+        self.assertIs(type(c15[0]["close"]), int)
+
+    # 병렬 실행 결과가 직렬 grid 와 같은 순서로 동일
+    def test_matches_serial_grid(self):
+        serial = grid("005930", self.c15, self.daily, self.cfg, **_AXES)
+        pooled = btpool.grid("005930", self.c15, self.daily, self.cfg, **_AXES)
+        self.assertEqual(len(pooled), 12)
+        self.assertEqual(pooled, serial)
+
+    # 비동기 경로도 동일 결과
+    def test_async_matches(self):
+        serial = grid("005930", self.c15, self.daily, self.cfg, **_AXES)
+        pooled = asyncio.run(btpool.agrid("005930", self.c15, self.daily, self.cfg, **_AXES))
+        self.assertEqual(pooled, serial)
+
+    # walk-forward 창 병렬 실행 — 직렬 wf 와 동일 (rolling/anchored)
+    def test_walk_forward_matches_serial(self):
+        for mode in ("rolling", "anchored"):
+            serial = wf("005930", self.c15, self.daily, self.cfg, windows=4, mode=mode)
+            pooled = btpool.wf("005930", self.c15, self.daily, self.cfg, windows=4, mode=mode)
+            self.assertEqual(len(pooled), 4)
+            self.assertEqual(pooled, serial, mode)
+
+
+if __name__ == "__main__":
+    unittest.main()
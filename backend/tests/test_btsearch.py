@@ -0,0 +1,75 @@
+import datetime
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.trading import btpool
+from service.trading.backtest import BacktestConfig, bt
+from service.trading.btsearch import SPACE, Halving, sample, search, searchrow
+from tests.test_stepscorer import bars, days
+
+
+_SPACE = dict(
+    buy_thresholds=[-10, 0, 10, 20], take_profit_pcts=[0.5, 1.0, 2.0],
+    stop_pcts=[0.5, 1.0], max_hold_bars=[4, 8],
+)
+
+
+# 연속 반감 탐색 — 표본 추출, 단계 비용, 직렬/병렬 동일성
+class SearchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.daily = days(60)
+        cls.c15 = bars(6, datetime.date(2025, 11, 20))
+        cls.cfg = BacktestConfig()
+
+    @classmethod
+    def tearDownClass(cls):
+        btpool.close()
+
+    # 시드 고정 비복원 추출, 조합 수 이하 요청은 전체 조합
+    def test_sample(self):
+        a = sample(self.cfg, SPACE, 500, seed=3)
+        self.assertEqual(len(a), 500)
+        self.assertEqual(a, sample(self.cfg, SPACE, 500, seed=3))
+        self.assertEqual(len({(c.buy_threshold, c.take_profit_pct, c.fallback_stop_pct, c.max_hold_bars) for c in a}), 500)
+        self.assertEqual(len(sample(self.cfg, _SPACE, 1000)), 48)
+        self.assertEqual(a[0].fee_bps, self.cfg.fee_bps)
+
+    # 500개 설정 · eta=4 · 4단계 → 전체 실행 환산 약 32회
+    def test_halving_cost(self):
+        plan = Halving(sample(self.cfg, SPACE, 500), 6400)
+        budget = plan.budget()
+        sizes = []
+        while batch := plan.next():
+            sizes.append((len(batch), batch[0][1]))
+            plan.feed([{"fitness": float(i % 7)} for i in range(len(batch))])
+        self.assertEqual(sizes, [(500, 100), (125, 400), (32, 1600), (8, 6400)])
+        report = plan.report()
+        self.assertEqual(report["evaluation_count"], 665)
+        self.assertEqual(sum(s["configs"] * s["bars"] for s in report["rungs"]), budget)
+        self.assertLessEqual(report["cost_full_runs"], 32.5)
+
+    # 최종 단계는 전체 구간 평가 — 단독 bt 결과와 동일
+    def test_final_rung_full_run(self):
+        report = search("005930", self.c15, self.daily, self.cfg, space=_SPACE, configs=48, rungs=3)
+        best = report["best"]
+        self.assertEqual(best["bars"], len(self.c15))
+        cfg = BacktestConfig(
+            buy_threshold=best["buy_threshold"], take_profit_pct=best["take_profit_pct"],
+            fallback_stop_pct=best["fallback_stop_pct"], max_hold_bars=best["max_hold_bars"],
+        )
+        row = searchrow(cfg, len(self.c15), bt("005930", self.c15, self.daily, cfg))
+        self.assertEqual({**row, "rung": 2}, best)
+
+    # 프로세스 풀 탐색이 직렬 탐색과 동일
+    def test_pool_matches_serial(self):
+        serial = search("005930", self.c15, self.daily, self.cfg, space=_SPACE, configs=30, seed=1)
+        pooled = btpool.search("005930", self.c15, self.daily, self.cfg, space=_SPACE, configs=30, seed=1)
+        self.assertEqual(pooled, serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
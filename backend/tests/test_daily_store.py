@@ -0,0 +1,148 @@
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.market import daily_store as daily_module
+from service.market.daily_store import DailyStore, settled
+
+
+# 달력 일자별 가짜 원격 일봉 (주말 제외) + 호출 구간 기록
+class Remote:
+    def __init__(self) -> None:
+        self.calls: list[tuple[datetime.date, datetime.date]] = []
+
+    def __call__(self, code, start, end):
+        self.calls.append((start, end))
+        out, d = [], start
+        while d <= end:
+            if d.weekday() < 5:
+                price = 1000 + d.toordinal() % 97
+                out.append({
+                    "date": d.isoformat(), "open": price, "high": price + 5,
+                    "low": price - 5, "close": price + 1, "volume": 10_000,
+                })
+            d += datetime.timedelta(days=1)
+        # 실제 remote 와 같이 빈 결과는 수집 실패
+        if not out:
+            raise ValueError(f"데이터 수집 실패: {code}")
+        return out
+
+
+D = datetime.date
+
+
+class DailyStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.remote = Remote()
+        self.store = DailyStore(self.root, fetch=self.remote)
+
+    # 최초 수집 후 같은 구간 재요청은 원격 호출 없음
+    def test_repeat_reads_no_fetch(self):
+        first = self.store.get("5930", D(2026, 1, 5), D(2026, 2, 27))
+        again = self.store.get("005930", D(2026, 1, 5), D(2026, 2, 27))
+        self.assertEqual(first, again)
+        self.assertEqual(len(self.remote.calls), 1)
+        self.assertEqual(first[0]["date"], "2026-01-05")
+        self.assertIs(type(first[0]["close"]), int)
+
+    # 구간 확장 시 빠진 앞/뒤 날짜만 수집
+    def test_incremental_gaps(self):
+        self.store.get("005930", D(2026, 2, 1), D(2026, 2, 28))
+        rows = self.store.get("005930", D(2026, 1, 1), D(2026, 3, 31))
+        self.assertEqual(self.remote.calls[1:], [
+            (D(2026, 1, 1), D(2026, 1, 31)),
+            (D(2026, 2, 28), D(2026, 3, 31)),
+        ])
+        self.assertEqual(rows, self.remote(None, D(2026, 1, 1), D(2026, 3, 31)))
+        self.assertEqual(self.store.covered("005930"), (D(2026, 1, 1), D(2026, 3, 31)))
+        # 부분 구간은 저장분만 읽음
+        part = self.store.get("005930", D(2026, 2, 10), D(2026, 2, 12))
+        self.assertEqual([r["date"] for r in part], ["2026-02-10", "2026-02-11", "2026-02-12"])
+
+    # 오프라인 모드 — 저장 파일(픽스처)만 읽고 원격 호출 없음
+    def test_offline_fixture(self):
+        self.store.get("005930", D(2026, 1, 5), D(2026, 1, 30))
+        offline = DailyStore(self.root, fetch=self.remote, offline=True)
+        rows = offline.get("005930", D(2026, 1, 1), D(2026, 3, 31))
+        self.assertEqual(len(self.remote.calls), 1)
+        self.assertEqual(rows[-1]["date"], "2026-01-30")
+        self.assertEqual(offline.get("000660", D(2026, 1, 1), D(2026, 3, 31)), [])
+
+    # 수집 실패는 전파되고 수집 구간은 갱신되지 않음
+    def test_fetch_failure_keeps_coverage(self):
+        def boom(code, start, end):
+            raise ValueError("데이터 수집 실패")
+
+        store = DailyStore(self.root, fetch=boom)
+        with self.assertRaises(ValueError):
+            store.get("005930", D(2026, 1, 5), D(2026, 1, 30))
+        self.assertIsNone(store.covered("005930"))
+
+    # 주말·휴장일만 남은 구간은 원격 호출 없음
+    def test_closed_gap_skipped(self):
+        self.store.get("005930", D(2026, 3, 2), D(2026, 3, 6))
+        with mock.patch.object(daily_module, "settled", return_value=D(2026, 3, 8)):
+            rows = self.store.get("005930", D(2026, 3, 2), D(2026, 3, 8))
+        self.assertEqual(len(self.remote.calls), 1)
+        self.assertEqual(rows[-1]["date"], "2026-03-06")
+        # 설연휴 + 주말 (2/14 ~ 2/18)
+        self.store.get("000660", D(2026, 2, 2), D(2026, 2, 13))
+        self.store.get("000660", D(2026, 2, 2), D(2026, 2, 18))
+        self.assertEqual(len(self.remote.calls), 2)
+
+    # 수집 구간 끝은 받은 마지막 날짜까지 — 미공시 일자는 다음 요청에서 재수집
+    def test_coverage_stops_at_last_row(self):
+        def partial(code, start, end):
+            return [r for r in Remote()(code, start, end) if r["date"] <= "2026-03-05"]
+
+        store = DailyStore(self.root, fetch=partial)
+        store.get("005930", D(2026, 3, 2), D(2026, 3, 6))
+        self.assertEqual(store.covered("005930"), (D(2026, 3, 2), D(2026, 3, 5)))
+        self.store.get("005930", D(2026, 3, 2), D(2026, 3, 6))
+        self.assertEqual(self.remote.calls, [(D(2026, 3, 6), D(2026, 3, 6))])
+        self.assertEqual(self.store.covered("005930"), (D(2026, 3, 2), D(2026, 3, 6)))
+
+    # 장 마감 후 당일분 미공시 — 뒤 구간 수집 실패는 저장분 제공, 수집 구간 유지 (다음 요청에서 재수집)
+    def test_unpublished_tail_serves_stored(self):
+        first = self.store.get("005930", D(2026, 9, 1), D(2026, 10, 15))
+
+        def unpublished(code, start, end):
+            self.remote.calls.append((start, end))
+            rows = [r for r in Remote()(code, start, end) if r["date"] <= "2026-10-15"] if start <= D(2026, 10, 15) else []
+            if not rows:
+                raise ValueError(f"데이터 수집 실패: {code}")
+            return rows
+
+        self.store._fetch = unpublished
+        with mock.patch.object(daily_module, "settled", return_value=D(2026, 10, 16)):
+            rows = self.store.get("005930", D(2026, 9, 1), D(2026, 10, 16))
+            self.assertEqual(rows, first)
+            self.assertEqual(self.store.covered("005930"), (D(2026, 9, 1), D(2026, 10, 15)))
+            self.store._fetch = self.remote
+            rows = self.store.get("005930", D(2026, 9, 1), D(2026, 10, 16))
+        self.assertEqual(rows[-1]["date"], "2026-10-16")
+        self.assertEqual(self.remote.calls[-2:], [(D(2026, 10, 16), D(2026, 10, 16))] * 2)
+        # 저장분이 없는 종목은 실패 전파
+        self.store._fetch = unpublished
+        with self.assertRaises(ValueError):
+            self.store.get("000660", D(2026, 10, 16), D(2026, 10, 16))
+
+    # 개장일 장중에는 전일까지만 확정
+    def test_settled_cutoff(self):
+        with mock.patch.object(daily_module, "mkt", return_value=True):
+            self.assertEqual(settled(datetime.datetime(2026, 3, 4, 10, 0)), D(2026, 3, 3))
+            self.assertEqual(settled(datetime.datetime(2026, 3, 4, 15, 30)), D(2026, 3, 4))
+        with mock.patch.object(daily_module, "mkt", return_value=False):
+            self.assertEqual(settled(datetime.datetime(2026, 3, 7, 10, 0)), D(2026, 3, 7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
+import asyncio
 import sys
 import unittest
 from pathlib import Path
+from unittest import mock
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from service.infra.metrics import score_factor_seconds
 from service.market import indicators
 import service.trading.strategy as strat
 from service.trading.strategy import Scorer
@@ -115,19 +118,118 @@ class StrategyFactorsTest(unittest.IsolatedAsyncioTestCase):
         finally:
             strat._FACTORS = original
 
-    # 동일 코드 재평가 시 캐시 적중 — 2차 호출 전 데이터를 바꿔도 결과 유지
+    # 같은 입력 버전이면 캐시 적중 — 같은 가격 구간의 가격 변화는 재계산 안 함
     async def test_cache_hit(self):
+        strat._cache.clear()
         daily = _candles(60)
         fake = _FakeBroker(daily, {"price": daily[-1]["close"]}, _candles(30))
         s = Scorer(fake)
 
         res1 = await s.evaluate("000007")
-        fake._price = {"price": 99999}  # 캐시 적중이면 반영 안 됨
+        fake._price = {"price": daily[-1]["close"] + 1}  # 같은 10bp 구간
         res2 = await s.evaluate("000007")
 
-        self.assertEqual(res2["price"], res1["price"])
-        self.assertNotEqual(res2["price"], 99999)
+        self.assertIs(res2, res1)
 
+    # 입력 버전 변경(가격 구간 이동 / 새 봉) 또는 15분봉 확정 이벤트 → 재계산
+    async def test_cache_version(self):
+        strat._cache.clear()
+        daily = _candles(60)
+        fake = _FakeBroker(daily, {"price": daily[-1]["close"]}, _candles(30))
+        s = Scorer(fake)
+
+        res1 = await s.evaluate("000008")
+        fake._price = {"price": 99999}
+        res2 = await s.evaluate("000008")
+        self.assertEqual(res2["price"], 99999)
+
+        fake._c15 = _candles(31)
+        res3 = await s.evaluate("000008")
+        self.assertIsNot(res3, res2)
+        self.assertIs(await s.evaluate("000008"), res3)
+
+        await strat.onbar("bar", {"code": "000008", "interval": 60})
+        self.assertIs(await s.evaluate("000008"), res3)
+        # 무효화는 종목 세대 값 갱신뿐 — 키 스캔 없음
+        with mock.patch.object(strat._cache, "invalidate") as scan:
+            await strat.onbar("bar", {"code": "000008", "interval": 15})
+        scan.assert_not_called()
+        self.assertIsNot(await s.evaluate("000008"), res3)
+        self.assertIsNot(res1, res2)
+
+
+# 팩터별 소요 시간 — debug 결과 breakdown + Prometheus 히스토그램 (factor, mode)
+class FactorTimingTest(unittest.IsolatedAsyncioTestCase):
+    @staticmethod
+    def count(factor: str, mode: str) -> float:
+        for metric in score_factor_seconds.collect():
+            for sample in metric.samples:
+                if sample.name.endswith("_count") and sample.labels == {"factor": factor, "mode": mode}:
+                    return sample.value
+        return 0.0
+
+    async def test_debug_breakdown(self):
+        strat._cache.clear()
+        daily = _candles(60)
+        s = Scorer(_FakeBroker(daily, {"price": daily[-1]["close"]}, _candles(30)))
+        before = self.count("RSI", "full"), self.count("stop", "full"), self.count("fetch.c15", "full")
+
+        res = await s.evaluate("000009", debug=True)
+        names = [name for name, _, _ in strat._FACTORS]
+        self.assertEqual(set(res["timing"]), {*names, "indicators", "stop", "fetch.daily", "fetch.price", "fetch.c15"})
+        self.assertTrue(all(v >= 0 for v in res["timing"].values()))
+        after = self.count("RSI", "full"), self.count("stop", "full"), self.count("fetch.c15", "full")
+        self.assertEqual([b - a for a, b in zip(before, after)], [1, 1, 1])
+
+        # 디버그 결과는 캐시 원본을 바꾸지 않음 / 일반 호출에는 timing 없음
+        plain = await s.evaluate("000009")
+        self.assertNotIn("timing", plain)
+        self.assertEqual(plain, {k: v for k, v in res.items() if k != "timing"})
+
+        fast = await s.evaluate_many(["000009"], fast=True, debug=True)
+        self.assertIn("RSI", fast["000009"]["timing"])
+        self.assertNotIn("fetch.c15", fast["000009"]["timing"])
+        self.assertGreaterEqual(self.count("MACD", "fast"), 1)
+
+
+# 종목별 다른 입력 Quotes 스텁 — 없는 코드는 조회 실패
+class _MultiBroker:
+    def __init__(self, books: dict[str, tuple[list[dict], list[dict]]]):
+        self.books = books
+        self.active = 0
+        self.peak = 0
+
+    async def daily(self, code: str, count: int = 60) -> list[dict]:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        return self.books[code][0]
+
+    async def price(self, code: str) -> dict:
+        return {"price": self.books[code][0][-1]["close"] + 7}
+
+    async def c15(self, code: str) -> list[dict]:
+        return self.books[code][1]
+
+
+# 일괄 평가 — 종목별 결과가 evaluate 단건과 동일, 동시 조회 수 제한
+class EvaluateManyTest(unittest.IsolatedAsyncioTestCase):
+    async def test_matches_single(self):
+        books = {f"1000{i:02d}": (_candles(20 + 9 * i), _candles(10 + 3 * i)) for i in range(8)}
+        codes = list(books) + ["999999"]
+        preds = {"100001": {"predictions": [{"close": 99999}] * 5}}
+        for fast in (True, False):
+            strat._cache.clear()
+            broker = _MultiBroker(books)
+            many = await Scorer(broker).evaluate_many(codes, fast=fast, predictions=preds, concurrency=3)
+            self.assertLessEqual(broker.peak, 3)
+            strat._cache.clear()
+            single = Scorer(_MultiBroker(books))
+            for code in codes:
+                self.assertEqual(many[code], await single.evaluate(code, prediction=preds.get(code), fast=fast), code)
+        self.assertEqual(list(many), codes)
+        self.assertEqual(many["999999"]["summary"], "평가 실패 (서버 로그 참조)")
 
 if __name__ == "__main__":
     unittest.main()
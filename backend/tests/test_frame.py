@@ -0,0 +1,61 @@
+import datetime
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.market import indicators, smc
+from service.market.frame import CandleFrame, col, frame
+from service.trading.backtest import BacktestConfig, bt
+from tests.test_stepscorer import bars, days
+
+
+# 컬럼형 캔들 — dict 왕복, 뷰 슬라이스, 소비 함수 결과 동일
+class CandleFrameTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.c15 = bars(6, datetime.date(2025, 11, 20))
+        cls.daily = days(60)
+
+    # dict 리스트 ↔ 프레임 왕복 (int 시세·datetime·날짜 문자열 유지)
+    def test_roundtrip(self):
+        for rows in (self.c15, self.daily):
+            f = frame(rows)
+            self.assertEqual(len(f), len(rows))
+            self.assertEqual(f.rows(), rows)
+            self.assertEqual(f[3], rows[3])
+            self.assertEqual(f[-1], rows[-1])
+            self.assertIs(type(f[0]["close"]), int)
+            self.assertIs(frame(f), f)
+        self.assertIsInstance(frame(self.c15)[0]["time"], datetime.datetime)
+        plain = [{"open": 1.5, "high": 2.0, "low": 1.0, "close": 1.8, "volume": 3}]
+        self.assertEqual(frame(plain).rows(), plain)
+
+    # 슬라이스는 원본 배열 뷰 (복사 없음), 컬럼 추출도 뷰
+    def test_slice_is_view(self):
+        f = frame(self.c15)
+        part = f[10:30]
+        self.assertIsInstance(part, CandleFrame)
+        self.assertTrue(np.shares_memory(part.close, f.close))
+        self.assertTrue(np.shares_memory(col(part, "high"), f.high))
+        self.assertEqual(part.rows(), self.c15[10:30])
+
+    # 지표/SMC/백테스트가 프레임을 직접 받아 dict 입력과 같은 결과
+    def test_consumers_accept_frame(self):
+        f15, fd = frame(self.c15), frame(self.daily)
+        price = float(self.c15[-1]["close"])
+        self.assertEqual(indicators.summary(fd), indicators.summary(self.daily))
+        self.assertEqual(indicators.volatility(fd), indicators.volatility(self.daily))
+        for name in ("fvgz", "obz", "swing", "bos"):
+            self.assertEqual(getattr(smc, name)(f15), getattr(smc, name)(self.c15), name)
+        self.assertEqual(smc.scan(f15, price), smc.scan(self.c15, price))
+        self.assertEqual(smc.stop(f15, price), smc.stop(self.c15, price))
+        cfg = BacktestConfig(buy_threshold=-20)
+        self.assertEqual(bt("005930", f15, fd, cfg), bt("005930", self.c15, self.daily, cfg))
+
+
+if __name__ == "__main__":
+    unittest.main()
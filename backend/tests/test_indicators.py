@@ -0,0 +1,100 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.market import indicators
+
+
+# 기존 파이썬 루프 구현 (기준)
+def ema_loop(arr: np.ndarray, period: int) -> np.ndarray:
+    k = 2.0 / (period + 1)
+    out = np.empty(len(arr))
+    out[0] = arr[0]
+    for i in range(1, len(arr)):
+        out[i] = arr[i] * k + out[i - 1] * (1 - k)
+    return out
+
+
+def rsi_loop(closes: np.ndarray, period: int = 14) -> float:
+    delta = np.diff(closes)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    avg_g, avg_l = gains[:period].mean(), losses[:period].mean()
+    for i in range(period, len(delta)):
+        avg_g = (avg_g * (period - 1) + gains[i]) / period
+        avg_l = (avg_l * (period - 1) + losses[i]) / period
+    return 100.0 if avg_l == 0 else round(100 - 100 / (1 + avg_g / avg_l), 2)
+
+
+def candles(closes: np.ndarray) -> list[dict]:
+    return [{"open": c, "high": c + 3, "low": c - 2, "close": c, "volume": 100} for c in closes.tolist()]
+
+
+# 배치 지표 — 2차원 행렬 결과가 종목별 단일 계산과 동일
+class BatchIndicatorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(7)
+        cls.X = np.round(np.cumsum(rng.normal(0, 15, (40, 300)), axis=1) + 10_000)
+
+    # lfilter 재귀 EMA 가 루프 구현과 비트 단위 동일 (행렬 일괄 포함)
+    def test_ema_matches_loop(self):
+        for period in (2, 12, 26):
+            batch = indicators.emas(self.X, period)
+            for row, series in zip(batch, self.X):
+                self.assertTrue(np.array_equal(row, ema_loop(series, period)))
+
+    # RSI 마지막 값 == 루프 Wilder 평활 (반올림 포함)
+    def test_rsi_matches_loop(self):
+        series = indicators.rsis(self.X)
+        for row, closes in zip(series, self.X):
+            self.assertEqual(round(float(row[-1]), 2), rsi_loop(closes))
+            self.assertTrue(np.isnan(row[:14]).all())
+        self.assertEqual(indicators.rsis(np.full(30, 100.0))[-1], 100.0)
+
+    # 시계열 마지막 값 == 단일 함수 (MACD/볼린저/ATR)
+    def test_series_tail_matches_scalar(self):
+        line, sig, hist = indicators.macds(self.X)
+        upper, mid, lower = indicators.bands(self.X)
+        atr = indicators.atrs(self.X + 3, self.X - 2, self.X)
+        for j, closes in enumerate(self.X):
+            rows = candles(closes)
+            macd = indicators.macd(rows)
+            self.assertEqual(macd["macd"], round(float(line[j, -1]), 2))
+            self.assertEqual(macd["signal"], round(float(sig[j, -1]), 2))
+            bb = indicators.bollinger(rows)
+            self.assertAlmostEqual(bb["middle"], float(mid[j, -1]), places=2)
+            self.assertAlmostEqual(bb["upper"], float(upper[j, -1]), places=2)
+            self.assertEqual(indicators.atr(rows), round(float(atr[j, -1]), 2))
+        self.assertTrue(np.isnan(sig[:, :25]).all())
+
+    # 길이가 제각각인 종목 목록 summaries == summary 개별 호출
+    def test_summaries_match_summary(self):
+        series = [candles(closes[: 10 + 23 * j]) for j, closes in enumerate(self.X[:14])] + [[]]
+        self.assertEqual(indicators.summaries(series), [indicators.summary(s) for s in series])
+
+
+    # 차트용 전체 시계열 — 봉 축 길이 정렬, 미형성 구간 None, 마지막 값 == summary
+    def test_chart_series(self):
+        closes = self.X[0]
+        rows = [c | {"date": f"2025-{1 + i // 28:02d}-{1 + i % 28:02d}"} for i, c in enumerate(candles(closes))]
+        out = indicators.series(rows)
+        n = len(rows)
+        self.assertEqual(out["time"][:2], ["2025-01-01", "2025-01-02"])
+        for values in (out["close"], out["rsi"], out["atr"], *out["macd"].values(),
+                       *out["bollinger"].values(), *out["ema"].values()):
+            self.assertEqual(len(values), n)
+        self.assertEqual(out["rsi"][:14], [None] * 14)
+        self.assertEqual(out["ema"]["20"][:19], [None] * 19)
+        head = indicators.summary(rows)
+        self.assertEqual(out["rsi"][-1], head["rsi"])
+        self.assertEqual(out["macd"]["macd"][-1], head["macd"]["macd"])
+        self.assertAlmostEqual(out["bollinger"]["middle"][-1], head["bollinger"]["middle"], places=2)
+        self.assertEqual(out["atr"][-1], indicators.atr(rows))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.trading.backtest import BacktestConfig, Trade, stat
+from service.trading.montecarlo import mc, metrics
+
+
+def trade(pnl: float) -> Trade:
+    return Trade(0, "", 100.0, 1, "", 100.0, "tp", pnl)
+
+
+# 몬테카를로 — 경로 지표가 bt.stat 정의와 일치, 순서 섞기 불변량, 시드 재현
+class MonteCarloTest(unittest.TestCase):
+    # 행렬 계산 지표 == 경로별 stat (에퀴티 곱 → 누적/MDD/손익비)
+    def test_metrics_match_stat(self):
+        rng = np.random.default_rng(5)
+        pnl = np.round(rng.normal(0.1, 2.0, size=(20, 15)), 2)
+        pnl[3] = np.abs(pnl[3])
+        m = metrics(pnl / 100)
+        for p, row in enumerate(pnl):
+            trades = [trade(float(x)) for x in row]
+            equity = [1.0]
+            for x in row:
+                equity.append(equity[-1] * (1 + x / 100))
+            ref = stat("X", 100, trades, equity, [], BacktestConfig())
+            self.assertAlmostEqual(round(m["cum_return_pct"][p], 2), ref.cum_return_pct, places=6)
+            self.assertAlmostEqual(round(m["mdd_pct"][p], 2), ref.mdd_pct, places=6)
+            self.assertAlmostEqual(round(m["risk_reward"][p], 2), ref.risk_reward, places=6)
+
+    # 순서 섞기(비용 충격 없음) — 누적수익률/손익비는 모든 경로 동일, MDD 만 분포
+    def test_permute_invariants(self):
+        trades = [trade(x) for x in (3.0, -2.0, 1.5, -4.0, 2.5, -1.0, 0.5)]
+        out = mc(trades, paths=500, mode="permute", cost_shock_bps=0)
+        cum = out["cum_return_pct"]
+        self.assertEqual(cum["p5"], cum["p95"])
+        self.assertEqual(out["risk_reward"]["p5"], out["risk_reward"]["p95"])
+        self.assertLess(out["mdd_pct"]["p5"], out["mdd_pct"]["p95"])
+
+    # 분위수 단조, 시드 재현, 비용 충격은 수익 분포를 낮춤
+    def test_bands_and_shock(self):
+        trades = [trade(x) for x in np.round(np.random.default_rng(2).normal(0.3, 1.5, 80), 2)]
+        base = mc(trades, paths=800, cost_shock_bps=0)
+        self.assertEqual(base, mc(trades, paths=800, cost_shock_bps=0))
+        for key in ("cum_return_pct", "mdd_pct", "risk_reward"):
+            vals = list(base[key].values())
+            self.assertEqual(vals, sorted(vals), key)
+        shocked = mc(trades, paths=800, cost_shock_bps=20)
+        self.assertLess(shocked["cum_return_pct"]["p50"], base["cum_return_pct"]["p50"])
+        self.assertIsNone(mc([], paths=100))
+
+
+if __name__ == "__main__":
+    unittest.main()
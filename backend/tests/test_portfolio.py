@@ -0,0 +1,71 @@
+import datetime
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.trading.backtest import BacktestConfig, bt
+from service.trading.portfolio import pbt, prow, window
+from tests.test_stepscorer import bars, days
+
+_FREE = dict(fee_bps=0, sell_tax_bps=0, slippage_bps=0, spread_bps=0)
+
+
+# 다종목 포트폴리오 — 슬롯/자금배분/장중 규칙
+class PortfolioTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        start = datetime.date(2025, 11, 20)
+        cls.candles = {code: bars(6, start, seed=seed) for code, seed in (("A", 11), ("B", 12), ("C", 13))}
+        cls.daily = {code: days(60, seed=seed) for code, seed in (("A", 7), ("B", 8), ("C", 9))}
+
+    # 단일 종목·슬롯 1·전액·장중 규칙 해제 → bt 와 같은 거래
+    def test_single_symbol_matches_bt(self):
+        cfg = BacktestConfig(buy_threshold=-5, **_FREE)
+        ref = bt("A", self.candles["A"], self.daily["A"], cfg)
+        res = pbt(
+            {"A": self.candles["A"]}, {"A": self.daily["A"]}, cfg,
+            cash=1e12, buy_percent=1.0, target_buy_count=1, intraday=False,
+        )
+        self.assertGreater(ref.total_trades, 0)
+        self.assertEqual(
+            [(t.entry_bar, t.exit_bar, t.exit_reason, t.pnl_pct) for t in res.trades],
+            [(t.entry_bar, t.exit_bar, t.exit_reason, t.pnl_pct) for t in ref.trades],
+        )
+
+    # 동시 보유 종목 수는 target_buy_count 이하, 현금은 음수가 되지 않음
+    def test_slots_and_cash(self):
+        cfg = BacktestConfig(buy_threshold=-50, **_FREE)
+        res = pbt(self.candles, self.daily, cfg, cash=10_000_000, buy_percent=0.5, target_buy_count=2)
+        self.assertGreater(res.total_trades, 0)
+        self.assertEqual(res.max_positions, 2)
+        self.assertLessEqual({t.code for t in res.trades}, {"A", "B", "C"})
+        # 보유 구간이 겹치는 종목 수 확인 (진입 시각 ~ 청산 시각)
+        for t in res.trades:
+            overlap = [u for u in res.trades if u.entry_time <= t.entry_time < u.exit_time or u is t]
+            self.assertLessEqual(len(overlap), 2)
+        self.assertGreater(res.final_equity, 0)
+        self.assertEqual(prow(res)["trades"][0]["code"], res.trades[0].code)
+
+    # 장중 규칙 — 스캔 구간 밖 진입 없음, 모든 포지션 당일 청산
+    def test_intraday_rules(self):
+        cfg = BacktestConfig(buy_threshold=-50, max_hold_bars=100, take_profit_pct=50, fallback_stop_pct=50, **_FREE)
+        res = pbt(self.candles, self.daily, cfg, buy_percent=0.3, target_buy_count=3)
+        self.assertGreater(res.total_trades, 0)
+        for t in res.trades:
+            self.assertEqual(t.entry_time[:10], t.exit_time[:10])
+            self.assertIn(t.exit_reason, ("eod", "stop"))
+        self.assertFalse(window(datetime.datetime(2025, 11, 20, 8, 45)))
+        self.assertTrue(window(datetime.datetime(2025, 11, 20, 9, 0)))
+        self.assertFalse(window(datetime.datetime(2025, 11, 20, 15, 0)))
+
+    # 빈 입력은 거래 없음
+    def test_empty(self):
+        res = pbt({"A": []}, {}, BacktestConfig())
+        self.assertEqual(res.total_trades, 0)
+        self.assertEqual(res.cum_return_pct, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
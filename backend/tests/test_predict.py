@@ -132,10 +132,12 @@ class SettledTest(unittest.TestCase):
         )
         self.assertEqual(len(out), 2)
 
-    # raw()의 FDR 경로에 가드가 적용됨
+    # raw()는 일봉 저장소 경유 — FDR 경로에 가드 적용, 재호출은 원격 수집 없음
     def test_raw_strips_forming_bar(self):
+        import tempfile
         import types
         import pandas as pd
+        from service.market import daily_store as daily_module
 
         idx = pd.to_datetime(["2026-07-13", "2026-07-14"])
         frame = pd.DataFrame(
@@ -143,7 +145,13 @@ class SettledTest(unittest.TestCase):
              "Close": [1.0, 1.0], "Volume": [10, 10]},
             index=idx,
         )
-        fake_fdr = types.SimpleNamespace(DataReader=lambda *a, **k: frame)
+        calls: list[tuple] = []
+
+        def reader(*args, **kwargs):
+            calls.append(args)
+            return frame
+
+        fake_fdr = types.SimpleNamespace(DataReader=reader)
 
         class _Clock:
             @classmethod
@@ -151,12 +159,19 @@ class SettledTest(unittest.TestCase):
                 return datetime(2026, 7, 14, 10, 0)
 
         p = build()
-        with mock.patch.dict(sys.modules, {"FinanceDataReader": fake_fdr}), \
-             mock.patch.object(predict_module, "datetime", _Clock), \
-             mock.patch.object(predict_module, "mkt", lambda d=None: True):
-            out = p.raw("005930")
+        with tempfile.TemporaryDirectory() as tmp:
+            store = daily_module.DailyStore(Path(tmp))
+            with mock.patch.dict(sys.modules, {"FinanceDataReader": fake_fdr}), \
+                 mock.patch.object(predict_module, "daily_store", store), \
+                 mock.patch.object(daily_module, "settled", lambda now=None: datetime(2026, 7, 13).date()), \
+                 mock.patch.object(predict_module, "datetime", _Clock), \
+                 mock.patch.object(predict_module, "mkt", lambda d=None: True):
+                out = p.raw("005930")
+                again = p.raw("005930")
         self.assertEqual(len(out), 1)
         self.assertEqual(out.index[-1].date(), datetime(2026, 7, 13).date())
+        self.assertTrue(out.equals(again))
+        self.assertEqual(len(calls), 1)
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import datetime
 import sys
 import unittest
 from pathlib import Path
@@ -50,5 +51,61 @@ class CodeValidationTest(unittest.TestCase):
         self.assertEqual(resp.json()["code"], "005930")
 
 
+# 지표 시계열 라우트 — 마지막 봉 시각이 같으면 캐시, 새 봉이면 재계산
+class IndicatorSeriesTest(unittest.TestCase):
+    def test_cached_per_last_bar(self):
+        client = build()
+        rows = [
+            {"date": f"2025-03-{d:02d}", "open": 100 + d, "high": 103 + d, "low": 98 + d, "close": 101 + d, "volume": 10}
+            for d in range(1, 29)
+        ]
+        calls = []
+
+        async def daily(code, count=60):
+            return rows
+
+        def count(candles):
+            calls.append(len(candles))
+            return real(candles)
+
+        real = ai_module.series
+        ai_module._series_cache.clear()
+        with mock.patch.object(ai_module.kis, "daily", daily), mock.patch.object(ai_module, "series", count):
+            first = client.get("/api/ai/indicators/005930/series?count=28")
+            again = client.get("/api/ai/indicators/005930/series?count=28")
+            rows.append(rows[-1] | {"date": "2025-03-29"})
+            moved = client.get("/api/ai/indicators/005930/series?count=28")
+            bad = client.get("/api/ai/indicators/005930/series?interval=5")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), again.json())
+        self.assertEqual(len(first.json()["rsi"]), 28)
+        self.assertEqual(moved.json()["time"][-1], "2025-03-29")
+        self.assertEqual(calls, [28, 29])
+        self.assertEqual(bad.status_code, 422)
+
+    # 일봉은 확정 봉만 — 장중 형성 중인 당일봉은 계산/캐시 키에서 제외, 조회 행 수는 KIS 한도로 제한
+    def test_daily_drops_forming_bar(self):
+        client = build()
+        rows = [
+            {"date": f"2025-03-{d:02d}", "open": 100 + d, "high": 103 + d, "low": 98 + d, "close": 101 + d, "volume": 10}
+            for d in range(1, 29)
+        ]
+        asked = []
+
+        async def daily(code, count=60):
+            asked.append(count)
+            return rows
+
+        ai_module._series_cache.clear()
+        with mock.patch.object(ai_module.kis, "daily", daily), \
+                mock.patch.object(ai_module, "settled", return_value=datetime.date(2025, 3, 27)):
+            first = client.get("/api/ai/indicators/005930/series?count=500")
+            rows[-1] = rows[-1] | {"close": 999}
+            again = client.get("/api/ai/indicators/005930/series?count=500")
+        self.assertEqual(first.json()["time"][-1], "2025-03-27")
+        self.assertEqual(first.json(), again.json())
+        self.assertEqual(asked, [100, 100])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.infra.metrics import score_pool_seconds
+from service.trading import scorepool
+from service.trading import strategy as strat
+from tests.test_factors import _MultiBroker, _candles
+
+
+# 단계별 관측 수 (queue/compute)
+def counts() -> dict[str, float]:
+    out = {}
+    for metric in score_pool_seconds.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count"):
+                out[sample.labels["phase"]] = sample.value
+    return out
+
+
+# 스코어링 워커 풀 — 실행 방식과 무관하게 결과 동일, 대기/계산 시간 관측
+class ScorePoolTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        strat._cache.clear()
+
+    def tearDown(self):
+        strat._cache.clear()
+        scorepool.close()
+
+    async def evaluate(self, pool: str) -> tuple[dict, dict]:
+        books = {f"2000{i:02d}": (_candles(30 + 7 * i), _candles(12 + 2 * i)) for i in range(4)}
+        scorepool.close()
+        strat._cache.clear()
+        with mock.patch.object(scorepool.settings, "score_pool", pool):
+            s = strat.Scorer(_MultiBroker(books))
+            many = await s.evaluate_many(list(books))
+            strat._cache.clear()
+            single = await s.evaluate("200001")
+        return many, single
+
+    # inline / thread / process 결과 동일
+    async def test_modes_match(self):
+        base = await self.evaluate("inline")
+        for pool in ("thread", "process"):
+            self.assertEqual(await self.evaluate(pool), base, pool)
+        self.assertEqual(base[1], base[0]["200001"])
+
+    # 호출 1회당 queue/compute 관측 1건씩
+    async def test_metrics(self):
+        before = counts()
+        with mock.patch.object(scorepool.settings, "score_pool", "thread"):
+            self.assertEqual(await scorepool.run(sum, [1, 2, 3]), 6)
+        after = counts()
+        self.assertEqual(after["queue"] - before.get("queue", 0), 1)
+        self.assertEqual(after["compute"] - before.get("compute", 0), 1)
+
+    # 스레드 풀 실행 중에도 이벤트 루프는 다른 작업을 처리
+    async def test_loop_not_blocked(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        try:
+            with mock.patch.object(scorepool.settings, "score_pool", "thread"):
+                await scorepool.run(time.sleep, 0.1)
+        finally:
+            task.cancel()
+        self.assertGreater(ticks, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import datetime
 import sys
 import unittest
 from pathlib import Path
+from unittest import mock
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
@@ -37,6 +39,18 @@ class SmcMitigationTest(unittest.TestCase):
         smc.sweep(candles, [zone])
         self.assertFalse(zone["mitigated"])
 
+    # mitigation: 구간별 첫 진입 봉 인덱스 (형성 봉 index+2 부터, 없으면 -1)
+    def test_mitigation_index(self):
+        candles = _fvg_base() + [candle(128, 125, 126, 127), candle(126, 118, 125, 119), candle(119, 90, 118, 95)]
+        zones = [
+            {"kind": "bullish", "top": 120.0, "bottom": 100.0, "index": 1, "mitigated": False},
+            {"kind": "bullish", "top": 100.0, "bottom": 96.0, "index": 1, "mitigated": False},
+            {"kind": "bearish", "top": 140.0, "bottom": 130.0, "index": 0, "mitigated": False},
+            {"kind": "bearish", "top": 127.0, "bottom": 124.0, "index": 3, "mitigated": False},
+        ]
+        self.assertEqual(smc.mitigation(candles, zones).tolist(), [4, 5, -1, -1])
+        self.assertEqual(smc.mitigation(candles, []).tolist(), [])
+
     # stop(): 메워진 FVG는 구조적 손절가에서 제외
     def test_stop_excludes_mitigated(self):
         touched = _fvg_base() + [candle(116, 110, 115, 112)]
@@ -48,5 +62,63 @@ class SmcMitigationTest(unittest.TestCase):
         self.assertEqual(smc.stop(live, 130.0), 100.0)
 
 
+# 계단식 상승 — 봉 i 저가가 봉 i-2 고가보다 높아 연속 bullish FVG
+def _stairs(n: int, t0: datetime.datetime | None = None) -> list[dict]:
+    out = []
+    for i in range(n):
+        base = 100 + 10 * i
+        row = candle(base + 8, base, base + 1, base + 7)
+        if t0 is not None:
+            row["time"] = t0 + datetime.timedelta(minutes=15 * i)
+        out.append(row)
+    return out
+
+
+# FVG 탐지 — 배열 비교 결과가 기존 봉 루프 규칙과 동일
+class FvgDetectTest(unittest.TestCase):
+    # 연속 같은 방향 갭은 대표(첫) 인덱스 + 1 만 병합 → 앞에서부터 2개씩 묶임
+    def test_consecutive_pairs_merge(self):
+        zones = smc.fvgz(_stairs(6))
+        self.assertEqual([z["index"] for z in zones], [1, 3])
+        self.assertEqual((zones[0]["bottom"], zones[0]["top"]), (108.0, 130.0))
+        self.assertEqual([z["index"] for z in smc.fvgz(_stairs(6), join_consecutive=False)], [1, 2, 3, 4])
+
+    # 세 봉이 같은 거래일일 때만 유효 (오버나잇 갭 제외)
+    def test_session_boundary(self):
+        rows = _stairs(6, datetime.datetime(2026, 3, 2, 14, 45))
+        for i in range(3, 6):
+            rows[i]["time"] = datetime.datetime(2026, 3, 3, 9, 0) + datetime.timedelta(minutes=15 * (i - 3))
+        zones = smc.fvgz(rows, join_consecutive=False)
+        self.assertEqual([z["index"] for z in zones], [1, 4])
+        self.assertEqual(zones[0]["label"], "2026-03-02 15:00:00")
+        self.assertEqual(smc.fvgz(rows[:2]), [])
+
+
+# 시계열 공유 분석 — 한 평가에서 FVG/OB/스윙은 시계열당 1회만 계산
+class SmcAnalysisTest(unittest.TestCase):
+    def test_single_pass_per_series(self):
+        rows = _stairs(40, datetime.datetime(2026, 3, 2, 9, 0))
+        price = rows[-1]["close"]
+        calls = {"fvgz": 0, "obz": 0, "swing": 0}
+
+        def counted(name):
+            real = getattr(smc, name)
+
+            def fn(*args, **kwargs):
+                calls[name] += 1
+                return real(*args, **kwargs)
+            return fn
+
+        with mock.patch.multiple(smc, **{name: counted(name) for name in calls}):
+            first = (smc.fvgin(rows, price), smc.struct(rows), smc.stop(rows, price),
+                     smc.fvg(rows, price), smc.ob(rows, price), smc.scan(rows, price))
+            self.assertEqual(calls, {"fvgz": 1, "obz": 1, "swing": 1})
+            # 같은 리스트에 봉이 추가되면 새 분석
+            rows.append(rows[-1] | {"time": rows[-1]["time"] + datetime.timedelta(minutes=15)})
+            smc.stop(rows, price)
+            self.assertEqual(calls["fvgz"], 2)
+        self.assertEqual(first[-1], smc.scan(rows[:-1], price))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synth import dataset
+from service.market import smc
+from service.market.smctrack import SmcTracker
+
+
+# 증분 SMC 추적 — 매 봉 시점 상태/점수가 전체 재계산(fvgz/obz/swing + sweep)과 동일
+class SmcTrackerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.c15, cls.daily = dataset(600)
+
+    def test_matches_batch_every_bar(self):
+        for candles in (self.c15, self.daily):
+            tracker = SmcTracker()
+            for m, c in enumerate(candles):
+                tracker.push(c)
+                head = candles[: m + 1]
+                fvgs, obs = smc.fvgz(head), smc.obz(head)
+                smc.sweep(head, fvgs)
+                smc.sweep(head, obs)
+                self.assertEqual(tracker.fvgs, smc.livez(fvgs), m)
+                self.assertEqual(tracker.obs, smc.livez(obs), m)
+                self.assertEqual(tracker.swings, smc.swing(head), m)
+                if m % 25 == 0:
+                    price = float(c["close"])
+                    self.assertEqual(tracker.fvg(price), smc.fvg(head, price))
+                    self.assertEqual(tracker.ob(price), smc.ob(head, price))
+                    self.assertEqual(tracker.fvgin(price), smc.fvgin(head, price))
+                    self.assertEqual(tracker.struct(), smc.struct(head))
+                    self.assertEqual(tracker.stop(price), smc.stop(head, price))
+
+    # keep 지정 — 봉 목록/구간/스윙이 최근 창으로 제한, 남은 상태는 전체 재계산의 최근 부분과 동일
+    def test_keep_bounds_state(self):
+        keep = 80
+        tracker = SmcTracker(keep=keep)
+        for m, c in enumerate(self.c15):
+            tracker.push(c)
+            self.assertLess(len(tracker.candles), 2 * keep)
+            self.assertLess(len(tracker.swing_track.highs), 2 * keep)
+        base = tracker.fvg_track.base
+        self.assertGreater(base, 0)
+        self.assertEqual(tracker.candles, self.c15[base:])
+
+        fvgs, obs = smc.fvgz(self.c15), smc.obz(self.c15)
+        smc.sweep(self.c15, fvgs)
+        smc.sweep(self.c15, obs)
+        self.assertEqual(tracker.fvgs, [z for z in smc.livez(fvgs) if z["index"] >= base])
+        live = smc.livez(obs)
+        self.assertTrue(all(z in live for z in tracker.obs))
+        self.assertTrue(all(z["index"] > base for z in tracker.obs))
+        swings = smc.swing(self.c15)
+        self.assertEqual(tracker.swings, swings[-len(tracker.swings):])
+        self.assertGreaterEqual(len(tracker.swings), 4)
+        self.assertEqual(tracker.struct(), smc.struct(self.c15))
+
+
+if __name__ == "__main__":
+    unittest.main()
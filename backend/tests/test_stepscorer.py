@@ -0,0 +1,162 @@
+import datetime
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.trading.backtest import BacktestConfig, BacktestScorer, Prefix, bt, cut, dayidx
+from service.trading.stepscorer import DayBook, DayInd, StepScorer
+from service.market import indicators
+
+
+# 갭/급등락이 섞인 랜덤워크 일봉
+def days(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    start = datetime.date(2025, 10, 1)
+    price = 10_000
+    rows = []
+    for i in range(count):
+        o = price + rng.randint(-150, 150)
+        c = o + rng.randint(-300, 300)
+        h = max(o, c) + rng.randint(0, 120)
+        l = min(o, c) - rng.randint(0, 120)
+        rows.append({
+            "date": (start + datetime.timedelta(days=i)).isoformat(),
+            "open": o, "high": h, "low": l, "close": c,
+            "volume": 100_000 + rng.randint(0, 50_000),
+        })
+        price = c
+    return rows
+
+
+# 일 26봉 15분봉 — 세션 경계/연속 갭이 생기도록 가끔 점프
+def bars(sessions: int, start: datetime.date, seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    price = 10_000
+    rows = []
+    for d in range(sessions):
+        base = datetime.datetime.combine(start + datetime.timedelta(days=d), datetime.time(9, 0))
+        for k in range(26):
+            jump = rng.choice([0, 0, 0, 0, 80, -80, 160, -160])
+            o = price + jump
+            c = o + rng.randint(-60, 60)
+            h = max(o, c) + rng.randint(0, 30)
+            l = min(o, c) - rng.randint(0, 30)
+            rows.append({
+                "time": base + datetime.timedelta(minutes=15 * k),
+                "open": o, "high": h, "low": l, "close": c, "volume": 1_000,
+            })
+            price = c
+    return rows
+
+
+# 증분 스코어러 — 봉마다 전체 재계산(val)과 점수/손절가 동일성
+class StepScorerParityTest(unittest.TestCase):
+    def test_matches_val_every_bar(self):
+        daily = days(60)
+        c15 = bars(12, datetime.date(2025, 11, 20))
+        ref = BacktestScorer()
+        step = StepScorer()
+
+        checked = 0
+        for i in range(1, len(c15)):
+            step.push(c15[i - 1])
+            bar_date = c15[i]["time"].date().isoformat()
+            daily_slice = [c for c in daily if c["date"] < bar_date]
+            step.sync(daily_slice)
+            price = c15[i]["close"]
+            self.assertEqual(step.val(price), ref.val(daily_slice, c15[:i], price), i)
+            checked += 1
+        self.assertEqual(checked, len(c15) - 1)
+
+    # 15분봉 없으면 일봉으로 15m 팩터 계산 (val 의 폴백과 동일)
+    def test_daily_fallback(self):
+        daily = days(50)
+        step = StepScorer()
+        step.sync(daily)
+        price = daily[-1]["close"]
+        self.assertEqual(step.val(price), BacktestScorer().val(daily, [], price))
+
+    # 일봉 지표 상태 — indicators.summary 와 매 봉 동일
+    def test_day_indicators_match_summary(self):
+        daily = days(70, seed=3)
+        state = DayInd()
+        for k, c in enumerate(daily, start=1):
+            state.push(c)
+            self.assertEqual(state.summary(), indicators.summary(daily[:k]), k)
+
+    # 과거 구간으로 되돌아간 sync 는 상태 재구성
+    def test_sync_rebuilds_on_rewind(self):
+        daily = days(60)
+        step = StepScorer()
+        step.sync(daily)
+        step.sync(daily[:40])
+        fresh = StepScorer()
+        fresh.sync(daily[:40])
+        price = daily[39]["close"]
+        self.assertEqual(step.val(price), fresh.val(price))
+
+    # 공유 일봉 저장소(DayBook) 경유도 자체 상태와 동일 점수
+    def test_daybook_matches_own_state(self):
+        daily = days(60)
+        c15 = bars(8, datetime.date(2025, 11, 20))
+        book = DayBook(daily)
+        shared, own = StepScorer(book), StepScorer()
+        for i in range(1, len(c15)):
+            shared.push(c15[i - 1])
+            own.push(c15[i - 1])
+            bar_date = c15[i]["time"].date().isoformat()
+            daily_slice = [c for c in daily if c["date"] < bar_date]
+            shared.sync(daily_slice)
+            own.sync(daily_slice)
+            self.assertEqual(shared.val(c15[i]["close"]), own.val(c15[i]["close"]), i)
+
+    # bt 는 증분 스코어러로도 진입/청산 결과가 결정적
+    def test_bt_deterministic(self):
+        daily = days(60)
+        c15 = bars(10, datetime.date(2025, 11, 20))
+        cfg = BacktestConfig(buy_threshold=-5)
+        a = bt("005930", c15, daily, cfg)
+        b = bt("005930", c15, daily, cfg)
+        self.assertGreater(a.total_trades, 0)
+        self.assertEqual(a.trades, b.trades)
+
+
+# 일봉 서수 인덱스 — 봉 시각 이전 일봉 경계가 문자열 필터와 동일
+class DailyIndexTest(unittest.TestCase):
+    def test_cut_matches_filter(self):
+        daily = days(60)
+        _, ords = dayidx(daily)
+        for bar in bars(6, datetime.date(2025, 11, 20)):
+            bar_date = bar["time"].date().isoformat()
+            expected = [c for c in daily if c["date"] < bar_date]
+            k = cut(ords, bar["time"])
+            self.assertEqual(list(Prefix(daily, k)), expected)
+        # 당일 일봉은 제외 (미래 참조 금지)
+        self.assertEqual(cut(ords, datetime.datetime(2025, 10, 3, 15, 15)), 2)
+
+    # 날짜순이 아닌 일봉은 정렬 사본으로 인덱싱
+    def test_unsorted_daily_sorted_copy(self):
+        daily = days(40)
+        shuffled = daily[20:] + daily[:20]
+        rows, ords = dayidx(shuffled)
+        self.assertEqual(rows, daily)
+        self.assertEqual(ords, sorted(ords))
+        self.assertIs(dayidx(daily)[0], daily)
+
+    # 뷰는 길이 밖 접근 차단 + 음수 인덱스/슬라이스 지원
+    def test_prefix_view(self):
+        daily = days(10)
+        view = Prefix(daily, 4)
+        self.assertEqual(len(view), 4)
+        self.assertIs(view[-1], daily[3])
+        self.assertEqual(view[1:], daily[1:4])
+        with self.assertRaises(IndexError):
+            view[4]
+        self.assertTrue(DayBook(daily).owns(view))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.infra.event_bus import EventBus
+from service.market import candle_store as candle_module
+from service.market import indicators
+from service.market.candle_store import CandleStore
+from service.market.stream import Atr, Boll, Ema, Live, Macd, Rsi, Vwap
+
+
+def candles(n: int, seed: int = 3) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    closes = np.round(np.cumsum(rng.normal(0, 20, n)) + 10_000)
+    start = datetime.datetime(2026, 3, 2, 9, 0)
+    return [
+        {
+            "time": start + datetime.timedelta(minutes=15 * i),
+            "open": int(c), "high": int(c + rng.integers(0, 30)), "low": int(c - rng.integers(0, 30)),
+            "close": int(c), "volume": int(rng.integers(100, 1000)),
+        }
+        for i, c in enumerate(closes)
+    ]
+
+
+# 스트리밍 지표 — 매 봉 값이 전체 히스토리 계산과 동일
+class StreamIndicatorTest(unittest.TestCase):
+    def test_matches_batch_every_bar(self):
+        rows = candles(120)
+        closes = np.array([c["close"] for c in rows], dtype=np.float64)
+        ema, macd, rsi, boll, atr = Ema(20), Macd(), Rsi(), Boll(), Atr()
+        ref_ema = indicators.emas(closes, 20)
+        for i, c in enumerate(rows):
+            ema.push(float(c["close"]))
+            macd.push(float(c["close"]))
+            rsi.push(c["close"])
+            boll.push(c["close"])
+            atr.push(c["high"], c["low"], c["close"])
+            part = rows[: i + 1]
+            self.assertEqual(ema.value, ref_ema[i])
+            self.assertEqual(rsi.value, indicators.rsi(part), i)
+            self.assertEqual(macd.view(), indicators.macd(part), i)
+            self.assertEqual(atr.value, indicators.atr(part), i)
+            ref = indicators.bollinger(part)
+            got = boll.view()
+            if ref is None:
+                self.assertIsNone(got)
+            else:
+                for key in ("upper", "middle", "lower"):
+                    self.assertAlmostEqual(got[key], ref[key], delta=0.011)
+
+    # 볼린저 — 긴 시계열 + 큰 가격 수준 이동 후에도 전체 계산과 동일 (누적 오차 없음)
+    def test_boll_long_level_shift(self):
+        rng = np.random.default_rng(11)
+        closes = np.concatenate([
+            np.round(rng.normal(1_000, 3, 20_000), 2),
+            np.round(rng.normal(2_500_000, 3, 20_000), 2),
+            np.round(rng.normal(50, 0.5, 20_000), 2),
+        ])
+        boll = Boll()
+        for i, x in enumerate(closes):
+            boll.push(x)
+            if i >= 19 and i % 97 == 0 or i == len(closes) - 1:
+                window = closes[i - 19: i + 1]
+                mid, sd = window.mean(), window.std()
+                got = boll.view()
+                self.assertAlmostEqual(got["middle"], mid, delta=0.011, msg=i)
+                self.assertAlmostEqual(got["upper"] - got["lower"], 4 * sd, delta=0.021, msg=i)
+
+    # peek(형성 중 봉) == 그 봉을 push 한 뒤의 값, 상태는 불변
+    def test_peek_is_pure(self):
+        rows = candles(60)
+        live = Live()
+        for c in rows[:-1]:
+            live.push(c)
+        before = live.view()
+        forming = live.view(rows[-1])
+        self.assertEqual(live.view(), before)
+        live.push(rows[-1])
+        after = live.view()
+        for key in ("ema20", "rsi", "macd", "bollinger", "atr"):
+            self.assertEqual(forming[key], after[key], key)
+        self.assertTrue(forming["provisional"])
+
+    # VWAP — 세션 누적, 날짜 변경 시 초기화
+    def test_vwap_resets_by_day(self):
+        vwap = Vwap()
+        day = datetime.datetime(2026, 3, 2, 9, 1)
+        vwap.push(100, 10, day)
+        vwap.push(110, 30, day)
+        self.assertEqual(vwap.value, 107.5)
+        vwap.push(200, 5, day + datetime.timedelta(days=1))
+        self.assertEqual(vwap.value, 200.0)
+
+
+# CandleStore — 새 봉이 열릴 때 직전 봉 확정 반영, 형성 중 봉은 잠정 값
+class StoreLiveTest(unittest.TestCase):
+    def test_ingest_feeds_live(self):
+        bus = EventBus()
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(candle_module, "bus", bus):
+            store = CandleStore(Path(tmp))
+            t0 = datetime.datetime(2026, 3, 2, 9, 0)
+
+            async def main():
+                for i, price in enumerate([100, 102, 101, 105, 104, 108]):
+                    await store.ingest("005930", price, 10, t0 + datetime.timedelta(minutes=5 * i))
+
+            asyncio.run(main())
+            # 09:00 15분봉 확정 → "bar" 이벤트 1건
+            self.assertEqual(bus._local_queue.get_nowait(),
+                             {"event": "bar", "data": {"code": "005930", "interval": 15, "time": t0}})
+            self.assertTrue(bus._local_queue.empty())
+            # 15분봉 2개 (09:00 확정, 09:15 형성 중)
+            closed = store.live("005930", forming=False)
+            self.assertEqual(closed["bars"], 1)
+            self.assertEqual(closed["ema20"], 101.0)
+            view = store.live("005930")
+            self.assertEqual(view["bars"], 2)
+            self.assertEqual(view["time"], "2026-03-02T09:15:00")
+            self.assertAlmostEqual(view["vwap"], (100 + 102 + 101 + 105 + 104 + 108) / 6, places=2)
+            self.assertIsNone(store.live("000660"))
+            # 당일 확정 봉만 (형성 중 09:15 제외)
+            self.assertEqual([c["close"] for c in store.closed("005930")], [101])
+            self.assertEqual(store.history("005930"), store.closed("005930"))
+
+            # 과거 봉 초기화 후 이어서 갱신
+            self.assertEqual(store.warm("000660", 15, candles(40)), 40)
+            self.assertEqual(store.live("000660", forming=False)["bars"], 40)
+
+
+if __name__ == "__main__":
+    unittest.main()